@@ -1,14 +1,22 @@
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi import FastAPI
 from pydantic import BaseModel
-import sys
-import io
+from typing import List
+import asyncio
+import json
+import os
+import threading
+import uuid
 
-from compiler.lexer.lexer import Lexer
-from compiler.parser.parser import Parser
-from compiler.semantic.analyzer import SemanticAnalyzer
-from compiler.interpreter.interpreter import Interpreter
+from compiler.bytecode.codegen import BytecodeCompiler
+from compiler.bytecode.disassembler import disassemble
 from compiler.errors import CompilerError
+from compiler.interpreter.output import StreamOutput
+from backend.runner import STREAM_INTERVAL, CodeInput, cancelled, profile_program, program_cache, run_program
+from backend.worker_pool import WorkerPool
+from backend.scheduler import MAX_BATCH, QueueFull, Scheduler
+from backend.result_cache import ResultCache, result_key
 
 app = FastAPI()
 app.add_middleware(
@@ -20,58 +28,270 @@ allow_headers=["*"],
 )
 
 
-class CodeInput(BaseModel):
-    code: str
+# Worker processes that run /run requests. COGNICODE_WORKERS sets how
+# many (default: one per core); 0 runs programs in the web process.
+# The pool starts with the app; without it (e.g. a TestClient used
+# outside a `with` block) requests also run in-process.
+pool = None
+
+# Responses of programs run before (see result_cache.py).
+# COGNICODE_RESULT_CACHE sets how many; 0 turns it off.
+result_cache = ResultCache(max_entries=int(os.environ.get("COGNICODE_RESULT_CACHE", 1024)))
+
+
+def run_and_cache(data):
+    if pool is not None:
+        result = pool.run(data.model_dump())
+    else:
+        result = run_program(data)
+    result_cache.put(data, result)
+    return result
+
+
+def run_request(data):
+    result = result_cache.get(data)
+    if result is None:
+        result = run_and_cache(data)
+    return result
+
+
+# Bounded queue for /run/async and /run/batch (see scheduler.py),
+# rebuilt at startup to match the pool. Cached responses are answered
+# before queueing.
+scheduler = Scheduler(run_and_cache)
+
+
+@app.on_event("startup")
+def start_pool():
+    global pool, scheduler
+    workers = int(os.environ.get("COGNICODE_WORKERS", os.cpu_count() or 1))
+    if workers > 0:
+        pool = WorkerPool(workers)
+        scheduler.close()
+        scheduler = Scheduler(run_and_cache, workers)
+
+
+@app.on_event("shutdown")
+def stop_pool():
+    global pool
+    scheduler.close()
+    if pool is not None:
+        pool.close()
+        pool = None
+
+
+def busy(message):
+    return JSONResponse({"error": message}, status_code=503, headers={"Retry-After": "1"})
 
 
 @app.post("/run")
 def run_code(data: CodeInput):
-    old_stdout = sys.stdout
-    sys.stdout = io.StringIO()
+    return run_request(data)
 
-    source_lines = data.code.splitlines()
 
+# Same as /run, but queued: answers 503 when the queue is full
+# instead of waiting for a free thread
+@app.post("/run/async")
+async def run_code_async(data: CodeInput):
+    result = result_cache.get(data)
+    if result is not None:
+        return result
     try:
-        lexer = Lexer(data.code)
-        parser = Parser(lexer)
-        ast = parser.parse()
+        [future] = scheduler.submit([data])
+    except QueueFull as e:
+        return busy(str(e))
+    return await future
 
-        semantic = SemanticAnalyzer()
-        semantic.analyze(ast)
 
-        interpreter = Interpreter()
-        interpreter.interpret(ast)
+class BatchInput(BaseModel):
+    programs: List[CodeInput]
 
-        output = sys.stdout.getvalue()
-        return {"output": output}
 
-    except CompilerError as e:
-        if e.line and 1 <= e.line <= len(source_lines):
-            line_text = source_lines[e.line - 1]
-
-            # Try to point caret at the variable/token
-            caret_pos = 0
-            if "'" in e.message:
-                name = e.message.split("'")[1]
-                idx = line_text.find(name)
-                if idx != -1:
-                    caret_pos = idx
-
-            caret = " " * caret_pos + "^"
-
-            return {
-                "error": (
-                    f"Error at line {e.line}:\n"
-                    f"    {line_text}\n"
-                    f"    {caret}\n"
-                    f"{e.message}"
-                )
-            }
+# =========================
+# Batch runs
+# =========================
+# Identical programs (same normalized source and options) run once. Results
+# stream back as NDJSON, one line per program as soon as it finishes:
+# {"index": <position in programs>, ...the /run response}. A batch is
+# queued whole or not at all (503); more than MAX_BATCH programs is 429.
+# When the client goes away, programs not started yet are dropped.
+
+@app.post("/run/batch")
+async def run_batch(batch: BatchInput):
+    if len(batch.programs) > MAX_BATCH:
+        return JSONResponse(
+            {"error": f"Too many programs in one batch ({len(batch.programs)}, limit {MAX_BATCH})"},
+            status_code=429,
+        )
+
+    # identical programs (up to normalized_source) run once
+    groups = {}     # key -> (CodeInput, indices in the batch)
+    for index, data in enumerate(batch.programs):
+        key = (result_key(data), data.cache)
+        groups.setdefault(key, (data, []))[1].append(index)
+
+    # answers from the result cache go out first and are never queued
+    cached = []
+    to_run = []
+    for data, batch_indices in groups.values():
+        result = result_cache.get(data)
+        if result is None:
+            to_run.append((data, batch_indices))
+        else:
+            cached.append((batch_indices, result))
+
+    try:
+        futures = scheduler.submit([data for data, _ in to_run])
+    except QueueFull as e:
+        return busy(str(e))
+
+    waiting = {future: batch_indices for future, (_, batch_indices) in zip(futures, to_run)}
+
+    async def results():
+        for batch_indices, result in cached:
+            for index in batch_indices:
+                yield json.dumps({"index": index, **result}) + "\n"
+        try:
+            while waiting:
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    for index in waiting.pop(future):
+                        yield json.dumps({"index": index, **result}) + "\n"
+        finally:
+            for future in waiting:
+                future.cancel()
+
+    return StreamingResponse(
+        results(),
+        media_type="application/x-ndjson",
+        headers={
+            "X-Batch-Size": str(len(batch.programs)),
+            "X-Batch-Unique": str(len(groups)),
+            "X-Batch-Cached": str(len(cached)),
+        },
+    )
+
+
+def stream_request(data, output, cancel):
+    if cancel.is_set():
+        return cancelled()
+    if pool is not None:
+        return pool.run(data.model_dump(), output.write, cancel)
+    return run_program(data, output, cancel)
 
-        return {"error": e.message}
 
+def sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+# Cancel events of the streamed runs in progress, by run id
+streams = {}
+
+
+class CancellingResponse(StreamingResponse):
+    # Sets `cancel` when the response ends, however it ends: also when
+    # the client goes away before the body generator ever runs
+    def __init__(self, content, cancel, **kwargs):
+        super().__init__(content, **kwargs)
+        self.cancel = cancel
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.cancel.set()
+
+
+# =========================
+# Streamed runs
+# =========================
+# /run/stream answers with Server-Sent Events while the program runs:
+# "start" ({"id": run id}), then "output" ({"text": ...}) every
+# STREAM_INTERVAL seconds in which it printed, and "done" with the
+# rest of the /run response. POST /run/cancel/<id>, or closing the
+# connection (even before the first event), stops the run; "done"
+# then says "cancelled": true.
+# Output is passed on, not collected, so streamed runs are not added
+# to the result cache (but are answered from it).
+
+@app.post("/run/stream")
+async def run_stream(data: CodeInput):
+    result = result_cache.get(data)
+    if result is not None:
+        async def replay():
+            done = dict(result)
+            yield sse("start", {"id": None})
+            text = done.pop("output", "")
+            if text:
+                yield sse("output", {"text": text})
+            yield sse("done", done)
+
+        return StreamingResponse(replay(), media_type="text/event-stream")
+
+    output = StreamOutput()
+    cancel = threading.Event()
+    try:
+        [future] = scheduler.submit([data], lambda data: stream_request(data, output, cancel))
+    except QueueFull as e:
+        return busy(str(e))
+    run_id = uuid.uuid4().hex
+    streams[run_id] = cancel
+    future.add_done_callback(lambda _: streams.pop(run_id, None))
+
+    async def events():
+        yield sse("start", {"id": run_id})
+        while True:
+            done, _ = await asyncio.wait([future], timeout=STREAM_INTERVAL)
+            text = output.take()
+            if text:
+                yield sse("output", {"text": text})
+            if done:
+                break
+        yield sse("done", future.result())
+
+    return CancellingResponse(events(), cancel, media_type="text/event-stream",
+                              headers={"Cache-Control": "no-cache"})
+
+
+@app.post("/run/cancel/{run_id}")
+def cancel_run(run_id: str):
+    cancel = streams.get(run_id)
+    if cancel is None:
+        return JSONResponse({"error": "No such run"}, status_code=404)
+    cancel.set()
+    return {"cancelled": run_id}
+
+
+# Runs the program on the profiling tree walker (whatever "engine"
+# says) and adds "profile" to the /run response: "listing", the source
+# with hits and total / self milliseconds per line; "lines",
+# "functions" (calls, inclusive and exclusive time) and the slowest
+# "nodes" as data; "collapsed" stacks for flame graph tools. Never
+# cached: the timings are the point.
+@app.post("/profile")
+def profile_code(data: CodeInput):
+    if pool is not None:
+        return pool.run({**data.model_dump(), "mode": "profile"})
+    return profile_program(data)
+
+
+@app.get("/run/stats")
+def run_stats():
+    stats = {"queue": scheduler.stats(), "results": result_cache.stats()}
+    if pool is not None:
+        stats["workers"] = pool.stats()
+    return stats
+
+
+@app.post("/disassemble")
+def disassemble_code(data: CodeInput):
+    try:
+        ast = program_cache.load(data.code)
+        compiler = BytecodeCompiler()
+        main_code = compiler.compile_main(ast.statements)
+        return {"bytecode": disassemble(main_code, compiler.program)}
+    except CompilerError as e:
+        return {"error": e.message}
     except Exception as e:
         return {"error": str(e)}
-
-    finally:
-        sys.stdout = old_stdout
@@ -0,0 +1,142 @@
+# backend/result_cache.py
+#
+# /run responses of programs seen before. A program reads no input and
+# has no randomness, so its response depends only on the source and
+# the request's options.
+
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+
+
+LINE_END_BLANKS = re.compile(r"[ \t]+(?=\n)")
+QUOTE = re.compile("[\"']")
+
+
+def normalized_source(code):
+    # Drops spaces and tabs at the end of lines: the lexer skips them
+    # and error messages do not show them (see runner.source_line).
+    # String and char literals are copied unchanged.
+    parts = []
+    start = 0
+    while True:
+        quote = QUOTE.search(code, start)
+        if quote is None:
+            break
+        pos = quote.start()
+        if code[pos] == '"':
+            end = code.find('"', pos + 1)
+            end = len(code) if end == -1 else end + 1
+        else:
+            end = min(pos + 3, len(code))
+        parts.append(LINE_END_BLANKS.sub("", code[start:pos]))
+        parts.append(code[pos:end])
+        start = end
+    parts.append(LINE_END_BLANKS.sub("", code[start:]).rstrip(" \t"))
+    return "".join(parts)
+
+
+def result_key(data):
+    options = data.model_dump(exclude={"code", "cache"})
+    text = normalized_source(data.code) + "\0" + json.dumps(options, sort_keys=True)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def cacheable(result):
+    # A run stopped by the clock or cancelled, or a worker that died,
+    # may well succeed next time
+    limit = result.get("limit_exceeded")
+    if limit is not None and limit["limit"] == "time":
+        return False
+    return not result.get("crashed") and not result.get("cancelled")
+
+
+def result_size(result):
+    return len(result.get("output", "")) + len(result.get("error", "")) + 64
+
+
+# =========================
+# Result Cache
+# =========================
+# Responses keyed by result_key(), least recently used first. Entries
+# expire after `ttl` seconds; beyond `max_entries` entries or
+# `max_bytes` of output and error text the oldest are dropped. A
+# request with "cache": false neither reads nor fills the cache.
+
+class ResultCache:
+    def __init__(self, max_entries=1024, max_bytes=64_000_000, ttl=600.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.entries = OrderedDict()    # key -> (expires, size, result)
+        self.size = 0
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def get(self, data):
+        if not data.cache or self.max_entries <= 0:
+            with self.lock:
+                self.bypassed += 1
+            return None
+
+        key = result_key(data)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self.drop(key)
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        return {**entry[2], "cached": True}
+
+    def put(self, data, result):
+        if not data.cache or self.max_entries <= 0 or not cacheable(result):
+            return
+        size = result_size(result)
+        if size > self.max_bytes:
+            return
+
+        key = result_key(data)
+        with self.lock:
+            if key in self.entries:
+                self.drop(key)
+            self.entries[key] = (time.monotonic() + self.ttl, size, result)
+            self.size += size
+            while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+                self.drop(next(iter(self.entries)))
+                self.evicted += 1
+
+    def drop(self, key):
+        _, size, _ = self.entries.pop(key)
+        self.size -= size
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "bytes": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "bypassed": self.bypassed,
+                "expired": self.expired,
+                "evicted": self.evicted,
+            }
@@ -0,0 +1,177 @@
+# backend/runner.py
+#
+# Executes one /run request: everything that happens between the
+# request body and the response, without FastAPI. Runs in the web
+# process or in a pool worker (see worker_pool.py).
+
+from pydantic import BaseModel
+from typing import Optional
+import os
+
+from compiler.cache import ProgramCache, source_hash
+from compiler.pipeline import create_interpreter, execute
+from compiler.limits import MAX_CALL_DEPTH, MAX_OUTPUT_BYTES, MAX_STEPS, MAX_SECONDS
+from compiler.interpreter.output import OutputBuffer
+from compiler.interpreter.budget import new_budget
+from compiler.interpreter.profiler import Profile, ProfilingInterpreter
+from compiler.optimizer.optimizer import optimize_program, default_passes
+from compiler.optimizer.inliner import INLINE_SIZE
+from compiler.transpiler.python_engine import CodeCache
+from compiler.errors import CompilerError, LimitExceeded, RunCancelled
+
+
+# Parsed + analysed programs, keyed by source hash.
+# Set COGNICODE_CACHE_DIR to keep them on disk across restarts.
+program_cache = ProgramCache(directory=os.environ.get("COGNICODE_CACHE_DIR"))
+
+# Python code objects for the python engine, keyed the same way
+python_code_cache = CodeCache()
+
+# Seconds between two output chunks of a streamed run
+STREAM_INTERVAL = 0.05
+
+
+class CodeInput(BaseModel):
+    code: str
+    engine: str = "tree"      # see compiler.pipeline.ENGINES
+    optimize: bool = False    # run compiler.optimizer before executing
+    inline_size: int = INLINE_SIZE
+    max_depth: int = MAX_CALL_DEPTH   # deepest chain of function calls
+    memoize: bool = False     # cache results of pure functions (not on vm)
+    # budgets; a request can lower the server's limits but not raise them
+    max_steps: Optional[int] = None       # loop iterations + calls
+    timeout: Optional[float] = None       # seconds
+    max_output: Optional[int] = None      # bytes
+    cache: bool = True        # False: bypass the result cache (benchmarks)
+
+
+def capped(requested, limit):
+    return limit if requested is None else min(requested, limit)
+
+
+def source_line(code, line):
+    # Text of a 1-based line, found without splitting the whole program
+    start = 0
+    for _ in range(line - 1):
+        start = code.find("\n", start) + 1
+        if start == 0:
+            return None
+    if start >= len(code):
+        return None
+    end = code.find("\n", start)
+    text = code[start:] if end == -1 else code[start:end]
+    return text.rstrip("\r \t")
+
+
+def run_program(data, output=None, cancel=None, profile=None):
+    # Runs one CodeInput and returns the /run response. Output goes to a
+    # buffer owned by this run (no sys.stdout swapping), so concurrent
+    # requests cannot mix their output. With `output` (a StreamOutput
+    # someone else drains) the printed text is left out of the response;
+    # setting the `cancel` Event stops the run. With `profile` (a
+    # Profile) the program runs on the ProfilingInterpreter, which
+    # records into it.
+    streamed = output is not None
+    if output is None:
+        output = OutputBuffer()
+    output.max_bytes = capped(data.max_output, MAX_OUTPUT_BYTES)
+
+    try:
+        ast = program_cache.load(data.code)
+
+        optimizations = None
+        if data.optimize:
+            # builds a new tree; the cached one is left untouched
+            ast, optimizations = optimize_program(ast, default_passes(data.inline_size))
+
+        options = {
+            "max_depth": capped(data.max_depth, MAX_CALL_DEPTH),
+            "memoize": data.memoize,
+            "output": output,
+            "budget": new_budget(capped(data.max_steps, MAX_STEPS),
+                                 capped(data.timeout, MAX_SECONDS), cancel),
+        }
+        if profile is not None:
+            # always the tree walker, whatever the engine
+            interpreter = ProfilingInterpreter(profile=profile, **options)
+        else:
+            if data.engine == "python":
+                key = source_hash(data.code)
+                if data.optimize:
+                    key += f":O{data.inline_size}"
+                options["compiled"] = python_code_cache.load(key, ast, budgeted=True)
+            interpreter = create_interpreter(data.engine, **options)
+        execute(interpreter, ast)
+
+        result = {} if streamed else {"output": output.getvalue()}
+        if optimizations is not None:
+            result["optimizations"] = optimizations
+        if getattr(interpreter, "fallback_reason", None):
+            result["fallback"] = interpreter.fallback_reason
+        if data.memoize:
+            result["memo"] = interpreter.memo.stats()
+        return result
+
+    except LimitExceeded as e:
+        # the run was stopped: report which budget, and what it printed
+        result = {
+            "error": e.message,
+            "limit_exceeded": {"limit": e.limit, "maximum": e.maximum, "line": e.line},
+        }
+        if not streamed:
+            result["output"] = output.getvalue()
+        return result
+
+    except RunCancelled:
+        return cancelled()
+
+    except MemoryError:
+        # a worker's memory cap (see worker_pool.WORKER_MEMORY)
+        result = {
+            "error": "Out of memory",
+            "limit_exceeded": {"limit": "memory", "maximum": None, "line": None},
+        }
+        if not streamed:
+            result["output"] = output.getvalue()
+        return result
+
+    except CompilerError as e:
+        line_text = source_line(data.code, e.line) if e.line and e.line >= 1 else None
+        if line_text is not None:
+            # Try to point caret at the variable/token
+            caret_pos = 0
+            if "'" in e.message:
+                name = e.message.split("'")[1]
+                idx = line_text.find(name)
+                if idx != -1:
+                    caret_pos = idx
+
+            caret = " " * caret_pos + "^"
+
+            return {
+                "error": (
+                    f"Error at line {e.line}:\n"
+                    f"    {line_text}\n"
+                    f"    {caret}\n"
+                    f"{e.message}"
+                )
+            }
+
+        return {"error": e.message}
+
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def profile_program(data):
+    # The /profile response: the /run response plus "profile" (see
+    # Profile.report), also when the run stopped with an error
+    profile = Profile()
+    result = run_program(data, profile=profile)
+    if profile.nodes:
+        result["profile"] = profile.report(data.code)
+    return result
+
+
+def cancelled():
+    return {"error": "Run cancelled", "cancelled": True}
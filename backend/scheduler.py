@@ -0,0 +1,83 @@
+# backend/scheduler.py
+#
+# Bounded queue in front of the program runner, for /run/async and
+# /run/batch: a fixed number of runs at a time, a fixed number waiting,
+# and a clear "busy" answer beyond that instead of growing latency.
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Runs waiting or running at once, over all requests
+MAX_QUEUE = int(os.environ.get("COGNICODE_MAX_QUEUE", 1000))
+
+# Programs in one /run/batch request
+MAX_BATCH = 1000
+
+
+class QueueFull(Exception):
+    pass
+
+
+# =========================
+# Scheduler
+# =========================
+# `run` is called on an executor thread with one CodeInput and returns
+# its response dict; `workers` threads call it at once (with a worker
+# pool, one per worker process: pool.run blocks while it waits anyway).
+# submit() admits all of its programs or none of them, so a batch is
+# never half queued.
+
+class Scheduler:
+    def __init__(self, run, workers=None, max_queue=MAX_QUEUE):
+        self.run = run
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix="cognicode-run")
+        self.lock = threading.Lock()
+        self.pending = 0
+
+        self.completed = 0
+        self.rejected = 0
+        self.cancelled = 0
+
+    def submit(self, programs, run=None):
+        # Queues every CodeInput in `programs` (to be run by `run`, by
+        # default self.run); returns asyncio futures in the same order,
+        # or raises QueueFull with nothing queued
+        with self.lock:
+            if self.pending + len(programs) > self.max_queue:
+                self.rejected += len(programs)
+                raise QueueFull(f"Server busy: {self.pending} runs queued (limit {self.max_queue})")
+            self.pending += len(programs)
+
+        futures = []
+        for data in programs:
+            future = self.executor.submit(run or self.run, data)
+            future.add_done_callback(self.finished)
+            futures.append(asyncio.wrap_future(future))
+        return futures
+
+    def finished(self, future):
+        with self.lock:
+            self.pending -= 1
+            if future.cancelled():
+                self.cancelled += 1
+            else:
+                self.completed += 1
+
+    def stats(self):
+        with self.lock:
+            return {
+                "workers": self.workers,
+                "pending": self.pending,
+                "max_queue": self.max_queue,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "cancelled": self.cancelled,
+            }
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
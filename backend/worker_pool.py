@@ -0,0 +1,226 @@
+# backend/worker_pool.py
+#
+# Pre-started worker processes that run /run requests, so programs use
+# every core, cannot block the web process, and can be killed.
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+from compiler.limits import MAX_SECONDS
+from compiler.interpreter.output import StreamOutput
+from backend.runner import STREAM_INTERVAL, CodeInput, cancelled, profile_program, run_program
+
+
+# Extra seconds a worker gets past the run's own time budget before it
+# is killed (the budget is checked cooperatively; this is the backstop
+# for work between two checks, e.g. a huge string being built)
+KILL_GRACE = 2.0
+
+# Address space of one worker process, in bytes. A run that needs more
+# fails with MemoryError inside its worker instead of starving the host.
+WORKER_MEMORY = int(os.environ.get("COGNICODE_WORKER_MEMORY", 1 << 30))
+
+
+def limit_memory(max_bytes):
+    try:
+        import resource
+    except ImportError:
+        return      # Windows: no rlimits
+    resource.setrlimit(resource.RLIMIT_AS, (max_bytes, max_bytes))
+
+
+def worker_main(conn, memory):
+    # Loop of a worker process: a request dict in, with "mode" run,
+    # stream or profile; ("output", text) messages while a streamed run
+    # prints, then ("done", response).
+    # The compiler modules are already imported by the forkserver.
+    if memory:
+        limit_memory(memory)
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        mode = request.pop("mode")
+        if mode == "stream":
+            result = stream_program(conn, CodeInput(**request))
+        elif mode == "profile":
+            result = profile_program(CodeInput(**request))
+        else:
+            result = run_program(CodeInput(**request))
+        conn.send(("done", result))
+
+
+def stream_program(conn, data):
+    # Runs the program while a thread sends on what it printed every
+    # STREAM_INTERVAL seconds
+    output = StreamOutput()
+    stop = threading.Event()
+
+    def flush():
+        while not stop.wait(STREAM_INTERVAL):
+            text = output.take()
+            if text:
+                conn.send(("output", text))
+
+    flusher = threading.Thread(target=flush, daemon=True)
+    flusher.start()
+    try:
+        return run_program(data, output)
+    finally:
+        stop.set()
+        flusher.join()
+        text = output.take()
+        if text:
+            conn.send(("output", text))
+
+
+def pool_context():
+    # forkserver: one warm process with everything imported forks the
+    # workers, also the replacements of killed ones. Windows only spawns.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["backend.runner"])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+class Worker:
+    def __init__(self, context, memory):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=worker_main, args=(child, memory), daemon=True)
+        self.process.start()
+        child.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+# =========================
+# Worker Pool
+# =========================
+# `size` processes, started once. run() hands a request to an idle
+# worker over its pipe and waits for the answer. A worker that misses
+# the deadline (time budget + KILL_GRACE) is killed and replaced, as
+# is one that died or whose run was cancelled; the request gets an
+# error response instead. Every worker's memory is capped (see
+# WORKER_MEMORY).
+
+class WorkerPool:
+    def __init__(self, size=None, grace=KILL_GRACE, memory=WORKER_MEMORY):
+        self.size = size or os.cpu_count() or 1
+        self.grace = grace
+        self.memory = memory        # per worker, see WORKER_MEMORY; None: no cap
+        self.context = pool_context()
+        self.idle = queue.Queue()
+        self.lock = threading.Lock()
+        self.closed = False
+
+        self.runs = 0
+        self.killed = 0
+        self.crashed = 0
+        self.cancelled = 0
+
+        for _ in range(self.size):
+            self.idle.put(Worker(self.context, self.memory))
+
+    def run(self, request, write=None, cancel=None):
+        # request: CodeInput fields as a dict (plus "mode": "profile" for
+        # a /profile run); returns the response dict.
+        # With `write`, the output is passed to it while the program
+        # runs and left out of the response; setting the `cancel` Event
+        # kills the run.
+        timeout = request.get("timeout")
+        limit = MAX_SECONDS if timeout is None else min(timeout, MAX_SECONDS)
+
+        worker = self.idle.get()
+        # the clock starts once a worker has the request, not while
+        # the request waits for one
+        deadline = time.monotonic() + limit + self.grace
+        try:
+            worker.conn.send({"mode": "stream" if write is not None else "run", **request})
+            while True:
+                wait = deadline - time.monotonic()
+                if cancel is not None:
+                    wait = min(wait, STREAM_INTERVAL)
+                if worker.conn.poll(max(wait, 0)):
+                    kind, value = worker.conn.recv()
+                    if kind == "output":
+                        write(value)
+                        continue
+                    with self.lock:
+                        self.runs += 1
+                    return value
+
+                if cancel is not None and cancel.is_set():
+                    worker = self.replace(worker)
+                    with self.lock:
+                        self.cancelled += 1
+                    return cancelled()
+
+                if time.monotonic() >= deadline:
+                    worker = self.replace(worker)
+                    with self.lock:
+                        self.killed += 1
+                    result = {
+                        "error": f"Time limit exceeded ({limit:g} s); the run was killed",
+                        "limit_exceeded": {"limit": "time", "maximum": limit, "line": None},
+                    }
+                    if write is None:
+                        result["output"] = ""
+                    return result
+
+        except (EOFError, OSError):
+            # the worker died (e.g. out of memory)
+            worker = self.replace(worker)
+            with self.lock:
+                self.crashed += 1
+            return {"error": "The program crashed its worker process", "crashed": True}
+
+        finally:
+            if self.closed:
+                worker.stop()
+            else:
+                self.idle.put(worker)
+
+    def replace(self, worker):
+        worker.kill()
+        return Worker(self.context, self.memory)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "workers": self.size,
+                "idle": self.idle.qsize(),
+                "runs": self.runs,
+                "killed": self.killed,
+                "crashed": self.crashed,
+                "cancelled": self.cancelled,
+            }
+
+    def close(self):
+        self.closed = True
+        while True:
+            try:
+                worker = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.stop()
@@ -0,0 +1,66 @@
+# benchmarks/bench_ast_memory.py
+#
+# Memory held by the AST of a large generated program: the old
+# dict-per-node layout and the __slots__ nodes. For comparison, the
+# size of the same tree as a NodeStore file (the ProgramCache's disk
+# format; the engines never run on it). Run from the repository root:
+#     python -m benchmarks.bench_ast_memory
+
+import gc
+import tracemalloc
+
+from compiler.lexer.fast_lexer import FastLexer
+from compiler.parser.parser import Parser
+from compiler.parser.ast_nodes import ASTNode
+from compiler.parser.compact_ast import NodeStore, node_fields
+from benchmarks.programs import generated_program
+
+
+class DictNode:
+    # Same attributes as an AST node, stored in a per-instance __dict__
+    pass
+
+
+def as_dict_nodes(node):
+    if isinstance(node, list):
+        return [as_dict_nodes(item) for item in node]
+    if not isinstance(node, ASTNode):
+        return node
+    copy = DictNode()
+    copy.line = node.line
+    for name in node_fields(type(node)):
+        setattr(copy, name, as_dict_nodes(getattr(node, name)))
+    return copy
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, result
+
+
+def main():
+    source = generated_program(2000)
+    print(f"Source: {source.count(chr(10))} lines, {len(source)} chars")
+
+    slots_ast = Parser(FastLexer(source)).parse()
+
+    dict_size, _ = measure(lambda: as_dict_nodes(slots_ast))
+    slots_size, _ = measure(lambda: Parser(FastLexer(source)).parse())
+    store = NodeStore.from_ast(slots_ast)
+    file_size = len(store.to_bytes())
+
+    print(f"Nodes: {len(store)}")
+    for title, size in (("dict nodes", dict_size),
+                        ("__slots__ nodes", slots_size),
+                        ("NodeStore file", file_size)):
+        print(f"{title:16}: {size / 1e6:8.2f} MB  "
+              f"({size / len(source):5.1f} bytes per source char)")
+
+
+if __name__ == "__main__":
+    main()
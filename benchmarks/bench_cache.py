@@ -0,0 +1,45 @@
+# benchmarks/bench_cache.py
+#
+# Front-end cost of a /run request with and without the program cache:
+# full lex/parse/analyse, loading the binary AST file, and a memory hit.
+# Run from the repository root:  python -m benchmarks.bench_cache
+
+import tempfile
+import time
+
+from compiler.cache import ProgramCache, source_hash
+from benchmarks.programs import generated_program
+
+
+def best_of(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    source = generated_program(1000)
+    key = source_hash(source)
+    print(f"Source: {source.count(chr(10))} lines, {len(source)} chars")
+
+    with tempfile.TemporaryDirectory() as directory:
+        ProgramCache(directory=directory).load(source)
+
+        cold = best_of(lambda: ProgramCache().load(source))
+        disk = best_of(lambda: ProgramCache(directory=directory).get(key))
+
+        warm_cache = ProgramCache()
+        warm_cache.load(source)
+        warm = best_of(lambda: warm_cache.load(source))
+
+    print(f"lex + parse + analyse : {cold * 1000:9.2f} ms")
+    print(f"binary AST from disk  : {disk * 1000:9.2f} ms ({cold / disk:.1f}x)")
+    print(f"in-memory hit         : {warm * 1000:9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
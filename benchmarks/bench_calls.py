@@ -0,0 +1,64 @@
+# benchmarks/bench_calls.py
+#
+# Cost of resolving function calls: every call looks its function up
+# through the environment chain, versus calls the semantic analyzer
+# resolved to their FunctionDecl. Run from the repository root:
+#     python -m benchmarks.bench_calls [engine ...]
+
+import contextlib
+import io
+import sys
+import time
+
+from compiler.lexer.fast_lexer import FastLexer
+from compiler.parser.parser import Parser
+from compiler.parser.ast_nodes import FunctionCall
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.optimizer.transformer import walk_statements, walk_expression, statement_expressions
+from compiler.pipeline import create_interpreter
+from benchmarks.programs import nested_calls
+
+
+PROGRAMS = {
+    "calls 6 blocks deep and in recursion": nested_calls(),
+}
+
+
+def call_sites(ast):
+    for stmt in walk_statements(ast.statements):
+        for expr in statement_expressions(stmt):
+            for sub in walk_expression(expr):
+                if type(sub) is FunctionCall:
+                    yield sub
+
+
+def run_once(engine, ast):
+    out = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        create_interpreter(engine).interpret(ast)
+    return time.perf_counter() - start, out.getvalue()
+
+
+def main(engines):
+    for title, source in PROGRAMS.items():
+        ast = Parser(FastLexer(source)).parse()
+        SemanticAnalyzer().analyze(ast)
+        sites = list(call_sites(ast))
+        targets = [site.target for site in sites]
+
+        print(title)
+        for engine in engines:
+            for site in sites:
+                site.target = None
+            before, expected = min(run_once(engine, ast) for _ in range(5))
+            for site, target in zip(sites, targets):
+                site.target = target
+            after, output = min(run_once(engine, ast) for _ in range(5))
+            status = "" if output == expected else "  OUTPUT DIFFERS"
+            print(f"  {engine:10}: {before * 1000:8.1f} -> {after * 1000:8.1f} ms "
+                  f"({before / after:4.2f}x){status}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or ["tree", "closure"])
@@ -0,0 +1,141 @@
+# benchmarks/bench_control_flow.py
+#
+# Compares the Interpreter's completion codes with the exception-based
+# break / continue / return it used before, on a recursive function
+# and on a loop that runs `continue` every iteration. Run from the
+# repository root:
+#     python -m benchmarks.bench_control_flow [fib_n]
+
+import contextlib
+import io
+import sys
+import time
+
+from compiler.lexer.fast_lexer import FastLexer
+from compiler.parser.parser import Parser
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.interpreter.interpreter import Interpreter
+from compiler.interpreter.environment import Environment
+from benchmarks.programs import recursive_fib
+
+
+def continue_loop(n=20000):
+    return f"""
+int i = 0;
+int odd = 0;
+while (i < {n}) {{
+    i = i + 1;
+    if (i % 2 == 0) {{
+        continue;
+    }}
+    odd = odd + 1;
+}}
+print(odd);
+"""
+
+
+# -------- The previous, exception-based control flow --------
+
+class BreakSignal(Exception):
+    pass
+
+
+class ContinueSignal(Exception):
+    pass
+
+
+class ReturnSignal(Exception):
+    def __init__(self, value):
+        self.value = value
+
+
+# visit_Block restores the scope in a `finally`; the original version
+# leaked one scope per break / continue, which overflows the Python
+# stack on long loops.
+
+class SignalInterpreter(Interpreter):
+    def visit_Program(self, node):
+        for stmt in node.statements:
+            self.interpret(stmt)
+
+    def visit_Block(self, node):
+        previous_env = self.env
+        self.env = Environment(parent=previous_env)
+        try:
+            for stmt in node.statements:
+                self.interpret(stmt)
+        finally:
+            self.env = previous_env
+
+    def visit_If(self, node):
+        if self.interpret(node.condition):
+            self.interpret(node.then_block)
+        elif node.else_block:
+            self.interpret(node.else_block)
+
+    def visit_While(self, node):
+        while self.interpret(node.condition):
+            try:
+                self.interpret(node.body)
+            except ContinueSignal:
+                continue
+            except BreakSignal:
+                break
+
+    def visit_Break(self, node):
+        raise BreakSignal()
+
+    def visit_Continue(self, node):
+        raise ContinueSignal()
+
+    def visit_FunctionCall(self, node):
+        func = self.env.get_function(node.name)
+        args = [self.interpret(arg) for arg in node.args]
+
+        previous_env = self.env
+        self.env = Environment(parent=previous_env)
+        for (_, param_name), value in zip(func.params, args):
+            self.env.define(param_name, value)
+
+        try:
+            self.interpret(func.body)
+        except ReturnSignal as r:
+            self.env = previous_env
+            return r.value
+
+        self.env = previous_env
+        return None
+
+    def visit_Return(self, node):
+        value = self.interpret(node.expr) if node.expr else None
+        raise ReturnSignal(value)
+
+
+def run_once(make_interpreter, source):
+    ast = Parser(FastLexer(source)).parse()
+    SemanticAnalyzer().analyze(ast)
+
+    out = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        make_interpreter().interpret(ast)
+    return time.perf_counter() - start, out.getvalue()
+
+
+def main(fib_n):
+    programs = {
+        f"recursive fib({fib_n})": recursive_fib(fib_n),
+        "continue every other iteration": continue_loop(),
+    }
+    for title, source in programs.items():
+        before, expected = min(run_once(SignalInterpreter, source) for _ in range(5))
+        after, output = min(run_once(Interpreter, source) for _ in range(5))
+        status = "" if output == expected else "  OUTPUT DIFFERS"
+        print(title)
+        print(f"  exceptions      : {before * 1000:9.1f} ms")
+        print(f"  completion codes: {after * 1000:9.1f} ms "
+              f"({before / after:4.2f}x){status}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,51 @@
+# benchmarks/bench_engines.py
+#
+# Runs loop- and call-heavy programs on every execution engine in
+# compiler.pipeline.ENGINES and reports time relative to the
+# tree-walking Interpreter. Run from the repository root:
+#     python -m benchmarks.bench_engines [engine ...]
+
+import contextlib
+import io
+import sys
+import time
+
+from compiler.lexer.fast_lexer import FastLexer
+from compiler.parser.parser import Parser
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.pipeline import ENGINES, create_interpreter
+from benchmarks.programs import counting_loop, recursive_fib, nested_loops, deep_scopes
+
+
+PROGRAMS = {
+    "counting loop": counting_loop(20000),
+    "recursive fib(18)": recursive_fib(18),
+    "nested loops 150x150": nested_loops(150),
+    "loop 6 blocks deep": deep_scopes(20000, 6),
+}
+
+
+def run_once(engine, source):
+    ast = Parser(FastLexer(source)).parse()
+    SemanticAnalyzer().analyze(ast)
+
+    out = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        create_interpreter(engine).interpret(ast)
+    return time.perf_counter() - start, out.getvalue()
+
+
+def main(engines):
+    for title, source in PROGRAMS.items():
+        print(title)
+        baseline, expected = min(run_once("tree", source) for _ in range(3))
+        for engine in engines:
+            elapsed, output = min(run_once(engine, source) for _ in range(3))
+            status = "" if output == expected else "  OUTPUT DIFFERS"
+            print(f"  {engine:10}: {elapsed * 1000:9.1f} ms "
+                  f"({baseline / elapsed:5.1f}x){status}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or list(ENGINES))
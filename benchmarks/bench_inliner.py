@@ -0,0 +1,54 @@
+# benchmarks/bench_inliner.py
+#
+# Effect of inlining small functions: run time after the other
+# optimizer passes alone and with the Inliner in front, on every
+# execution engine. Run from the repository root:
+#     python -m benchmarks.bench_inliner [engine ...]
+
+import contextlib
+import io
+import sys
+import time
+
+from compiler.lexer.fast_lexer import FastLexer
+from compiler.parser.parser import Parser
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.optimizer.optimizer import Optimizer, optimize_program
+from compiler.optimizer.licm import LoopInvariantMotion
+from compiler.optimizer.inliner import Inliner
+from compiler.pipeline import ENGINES, create_interpreter
+from benchmarks.programs import helper_calls
+
+
+PROGRAMS = {
+    "helpers in a loop": helper_calls(20000),
+}
+
+
+def run_once(engine, ast):
+    out = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        create_interpreter(engine).interpret(ast)
+    return time.perf_counter() - start, out.getvalue()
+
+
+def main(engines):
+    for title, source in PROGRAMS.items():
+        ast = Parser(FastLexer(source)).parse()
+        SemanticAnalyzer().analyze(ast)
+        plain, _ = optimize_program(ast, [Optimizer, LoopInvariantMotion])
+        inliner = Inliner()
+        inlined, _ = optimize_program(ast, [lambda: inliner, Optimizer, LoopInvariantMotion])
+
+        print(f"{title} ({len(inliner.inlined)} call sites inlined)")
+        for engine in engines:
+            before, expected = min(run_once(engine, plain) for _ in range(5))
+            after, output = min(run_once(engine, inlined) for _ in range(5))
+            status = "" if output == expected else "  OUTPUT DIFFERS"
+            print(f"  {engine:10}: {before * 1000:8.1f} -> {after * 1000:8.1f} ms "
+                  f"({before / after:4.2f}x){status}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or list(ENGINES))
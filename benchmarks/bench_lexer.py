@@ -0,0 +1,61 @@
+# benchmarks/bench_lexer.py
+#
+# Compares the per-character Lexer with the regex-based FastLexer.
+# Run from the repository root:  python -m benchmarks.bench_lexer
+
+import time
+
+from compiler.lexer.lexer import Lexer
+from compiler.lexer.fast_lexer import FastLexer
+from compiler.lexer.tokens import EOF
+from benchmarks.programs import generated_program, long_literals
+
+
+def lex_all(lexer_cls, source):
+    lexer = lexer_cls(source)
+    tokens = []
+    while True:
+        tok = lexer.get_next_token()
+        tokens.append(tok)
+        if tok.type == EOF:
+            return tokens
+
+
+def best_of(fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def compare(title, source):
+    lines = source.count("\n")
+    print(f"{title}: {lines} lines, {len(source)} chars")
+
+    slow_time, slow_tokens = best_of(lambda: lex_all(Lexer, source))
+    fast_time, fast_tokens = best_of(lambda: lex_all(FastLexer, source))
+    bulk_time, bulk_tokens = best_of(lambda: FastLexer(source).tokenize())
+
+    expected = [(t.type, t.value, t.line) for t in slow_tokens]
+    same = expected == [(t.type, t.value, t.line) for t in fast_tokens] == \
+           [(t.type, t.value, t.line) for t in bulk_tokens]
+
+    print(f"Tokens: {len(slow_tokens)} (identical streams: {same})")
+    print(f"Lexer.get_next_token     : {slow_time * 1000:8.1f} ms")
+    print(f"FastLexer.get_next_token : {fast_time * 1000:8.1f} ms "
+          f"({slow_time / fast_time:.1f}x)")
+    print(f"FastLexer.tokenize       : {bulk_time * 1000:8.1f} ms "
+          f"({slow_time / bulk_time:.1f}x)")
+    print()
+
+
+def main():
+    compare("Generated program", generated_program(2000))
+    compare("Long literals", long_literals())
+
+
+if __name__ == "__main__":
+    main()
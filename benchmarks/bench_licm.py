@@ -0,0 +1,53 @@
+# benchmarks/bench_licm.py
+#
+# Effect of loop-invariant code motion: run time after the basic
+# optimizer alone and after the optimizer plus LoopInvariantMotion,
+# on every execution engine. Run from the repository root:
+#     python -m benchmarks.bench_licm [engine ...]
+
+import contextlib
+import io
+import sys
+import time
+
+from compiler.lexer.fast_lexer import FastLexer
+from compiler.parser.parser import Parser
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.optimizer.optimizer import Optimizer, optimize_program
+from compiler.optimizer.licm import LoopInvariantMotion
+from compiler.pipeline import ENGINES, create_interpreter
+from benchmarks.programs import invariant_loop, invariant_nested_loops
+
+
+PROGRAMS = {
+    "counting loop": invariant_loop(20000),
+    "nested loops 150x150": invariant_nested_loops(150),
+}
+
+
+def run_once(engine, ast):
+    out = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        create_interpreter(engine).interpret(ast)
+    return time.perf_counter() - start, out.getvalue()
+
+
+def main(engines):
+    for title, source in PROGRAMS.items():
+        ast = Parser(FastLexer(source)).parse()
+        SemanticAnalyzer().analyze(ast)
+        plain, _ = optimize_program(ast, [Optimizer])
+        hoisted, changes = optimize_program(ast, [Optimizer, LoopInvariantMotion])
+
+        print(f"{title} ({len(changes)} expressions hoisted)")
+        for engine in engines:
+            before, expected = min(run_once(engine, plain) for _ in range(5))
+            after, output = min(run_once(engine, hoisted) for _ in range(5))
+            status = "" if output == expected else "  OUTPUT DIFFERS"
+            print(f"  {engine:10}: {before * 1000:8.1f} -> {after * 1000:8.1f} ms "
+                  f"({before / after:4.2f}x){status}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or list(ENGINES))
@@ -0,0 +1,51 @@
+# benchmarks/bench_optimizer.py
+#
+# Run time of programs before and after compiler.optimizer, on every
+# execution engine. Run from the repository root:
+#     python -m benchmarks.bench_optimizer [engine ...]
+
+import contextlib
+import io
+import sys
+import time
+
+from compiler.lexer.fast_lexer import FastLexer
+from compiler.parser.parser import Parser
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.optimizer.optimizer import optimize_program
+from compiler.pipeline import ENGINES, create_interpreter
+from benchmarks.programs import constant_loop, counting_loop, nested_loops
+
+
+PROGRAMS = {
+    "constant-heavy loop": constant_loop(20000),
+    "counting loop": counting_loop(20000),
+    "nested loops 150x150": nested_loops(150),
+}
+
+
+def run_once(engine, ast):
+    out = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        create_interpreter(engine).interpret(ast)
+    return time.perf_counter() - start, out.getvalue()
+
+
+def main(engines):
+    for title, source in PROGRAMS.items():
+        ast = Parser(FastLexer(source)).parse()
+        SemanticAnalyzer().analyze(ast)
+        optimized, changes = optimize_program(ast)
+
+        print(f"{title} ({len(changes)} changes)")
+        for engine in engines:
+            before, expected = min(run_once(engine, ast) for _ in range(5))
+            after, output = min(run_once(engine, optimized) for _ in range(5))
+            status = "" if output == expected else "  OUTPUT DIFFERS"
+            print(f"  {engine:10}: {before * 1000:8.1f} -> {after * 1000:8.1f} ms "
+                  f"({before / after:4.2f}x){status}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or list(ENGINES))
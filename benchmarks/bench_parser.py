@@ -0,0 +1,63 @@
+# benchmarks/bench_parser.py
+#
+# Recursive-descent vs table-driven (Pratt) expression parsing.
+# Tokens are lexed once up front so only parsing is timed.
+# Run from the repository root:  python -m benchmarks.bench_parser
+
+import time
+
+from compiler.lexer.fast_lexer import FastLexer
+from compiler.parser.parser import Parser
+from benchmarks.programs import generated_program, expression_heavy
+
+
+class ReplayLexer:
+    # Hands out a pre-lexed token list
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def scan(self, limit):
+        chunk = self.tokens[self.pos:self.pos + limit]
+        self.pos += limit
+        return chunk
+
+
+def best_of(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def compare(title, source):
+    tokens = FastLexer(source).tokenize()
+    print(f"{title}: {len(tokens)} tokens")
+
+    descent = best_of(lambda: Parser(ReplayLexer(tokens), pratt=False).parse())
+    pratt = best_of(lambda: Parser(ReplayLexer(tokens), pratt=True).parse())
+
+    print(f"  recursive descent : {descent * 1000:8.1f} ms")
+    print(f"  pratt             : {pratt * 1000:8.1f} ms ({descent / pratt:.2f}x)")
+
+
+def main():
+    compare("Generated program", generated_program(1000))
+    compare("Expression heavy", expression_heavy())
+
+    depth = 3000
+    nested = "print(" + "(" * depth + "1" + ")" * depth + ");"
+    for pratt in (False, True):
+        try:
+            Parser(FastLexer(nested), pratt=pratt).parse()
+            result = "ok"
+        except RecursionError:
+            result = "RecursionError"
+        print(f"{depth} nested parentheses, pratt={pratt}: {result}")
+
+
+if __name__ == "__main__":
+    main()
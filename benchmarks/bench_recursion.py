@@ -0,0 +1,59 @@
+# benchmarks/bench_recursion.py
+#
+# Deep user recursion on the VM: a tail-recursive loop (TAIL_CALL, one
+# frame) and a plain recursive descent (one frame per level), at
+# increasing depths. Run from the repository root:
+#     python -m benchmarks.bench_recursion
+
+import contextlib
+import io
+import time
+
+from compiler.lexer.fast_lexer import FastLexer
+from compiler.parser.parser import Parser
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.bytecode.vm import VirtualMachine
+
+
+TAIL = """
+int count_down(int n, int acc) {
+    if (n == 0) {
+        return acc;
+    }
+    return count_down(n - 1, acc + 1);
+}
+print(count_down(%d, 0));
+"""
+
+PLAIN = """
+int depth(int n) {
+    if (n == 0) {
+        return 0;
+    }
+    return 1 + depth(n - 1);
+}
+print(depth(%d));
+"""
+
+
+def run_once(source):
+    ast = Parser(FastLexer(source)).parse()
+    SemanticAnalyzer().analyze(ast)
+    out = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        VirtualMachine().interpret(ast)
+    return time.perf_counter() - start
+
+
+def main():
+    for title, template in (("tail calls", TAIL), ("plain recursion", PLAIN)):
+        print(title)
+        for depth in (1000, 10000, 90000):
+            elapsed = min(run_once(template % depth) for _ in range(3))
+            print(f"  depth {depth:6}: {elapsed * 1000:8.1f} ms "
+                  f"({elapsed / depth * 1e6:5.2f} us per call)")
+
+
+if __name__ == "__main__":
+    main()
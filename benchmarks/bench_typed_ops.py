@@ -0,0 +1,65 @@
+# benchmarks/bench_typed_ops.py
+#
+# Effect of the closure engine's TYPED_BINARY handlers: the same
+# analysed program with and without the operators' static types (the
+# engine then calls through BINARY_OPERATORS). Everything else the
+# analyzer annotates stays, so the difference is the typed handlers
+# alone. Run from the repository root:
+#     python -m benchmarks.bench_typed_ops
+
+import time
+
+from compiler.lexer.fast_lexer import FastLexer
+from compiler.parser.parser import Parser
+from compiler.parser.ast_nodes import ASTNode, BinOp, UnaryOp
+from compiler.parser.compact_ast import node_fields
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.interpreter.closure_compiler import ClosureCompiler
+from compiler.interpreter.output import OutputBuffer
+from benchmarks.programs import counting_loop, recursive_fib, nested_loops
+
+
+PROGRAMS = {
+    "counting loop": counting_loop(100000),
+    "recursive fib(20)": recursive_fib(20),
+    "nested loops 300x300": nested_loops(300),
+}
+
+
+def untyped(node, seen):
+    # Forget the static types of operators, in place
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, ASTNode) and id(node) not in seen:
+            seen.add(id(node))
+            if isinstance(node, (BinOp, UnaryOp)):
+                node.static_type = None
+            stack.extend(getattr(node, name, None) for name in node_fields(type(node)))
+
+
+def run_once(source, typed):
+    ast = Parser(FastLexer(source)).parse()
+    SemanticAnalyzer().analyze(ast)
+    if not typed:
+        untyped(ast, set())
+
+    output = OutputBuffer()
+    start = time.perf_counter()
+    ClosureCompiler(output=output).interpret(ast)
+    return time.perf_counter() - start, output.getvalue()
+
+
+def main():
+    for title, source in PROGRAMS.items():
+        generic, expected = min(run_once(source, False) for _ in range(7))
+        typed, output = min(run_once(source, True) for _ in range(7))
+        status = "" if output == expected else "  OUTPUT DIFFERS"
+        print(f"{title:22}: {generic * 1000:8.1f} -> {typed * 1000:8.1f} ms "
+              f"({generic / typed:4.2f}x){status}")
+
+
+if __name__ == "__main__":
+    main()
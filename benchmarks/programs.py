@@ -0,0 +1,211 @@
+# benchmarks/programs.py
+#
+# Generators for large CogniCode programs used by the benchmark scripts.
+
+
+def generated_program(blocks=1000):
+    # Roughly 12 lines per block; covers every token class
+    parts = []
+    for i in range(blocks):
+        parts.append(f"""
+int counter_{i} = {i};
+float ratio_{i} = {i}.25 * 2.0;
+string label_{i} = "block number {i} of the generated program";
+char tag_{i} = 'x';
+bool flag_{i} = (counter_{i} >= 10) && !(ratio_{i} != 0.5) || false;
+
+while (counter_{i} < {i} + 3) {{
+    if (counter_{i} % 2 == 0) {{
+        print(label_{i});
+    }} else {{
+        counter_{i} = counter_{i} - -1;
+    }}
+    counter_{i} = counter_{i} + 1;
+}}
+""")
+    return "".join(parts)
+
+
+def long_literals(count=20, length=20000):
+    # Long string literals and identifiers stress per-character concatenation
+    parts = []
+    for i in range(count):
+        text = "lorem ipsum " * (length // 12)
+        name = "v" * (length // 10) + str(i)
+        parts.append(f'string {name} = "{text}";\nprint({name});\n')
+    return "".join(parts)
+
+
+def expression_heavy(lines=5000):
+    # Mostly primaries and short operator chains, the common case
+    parts = []
+    for i in range(lines):
+        parts.append(f"int e{i} = a + b * {i} - (c / 2) % d;\n"
+                     f"print(e{i});\n"
+                     f"bool p{i} = e{i} > {i} && !q || r == s;\n")
+    return "".join(parts)
+
+
+def counting_loop(n=20000):
+    return f"""
+int i = 0;
+int total = 0;
+while (i < {n}) {{
+    total = total + i % 7;
+    i = i + 1;
+}}
+print(total);
+"""
+
+
+def recursive_fib(n=18):
+    return f"""
+int fib(int n) {{
+    if (n < 2) {{
+        return n;
+    }}
+    return fib(n - 1) + fib(n - 2);
+}}
+print(fib({n}));
+"""
+
+
+def nested_loops(n=150):
+    return f"""
+int i = 0;
+int hits = 0;
+while (i < {n}) {{
+    int j = 0;
+    while (j < {n}) {{
+        if ((i + j) % 3 == 0) {{
+            hits = hits + 1;
+        }}
+        j = j + 1;
+    }}
+    i = i + 1;
+}}
+print(hits);
+"""
+
+
+def deep_scopes(n=20000, depth=6):
+    # Hot loop nested `depth` blocks below the globals it reads
+    opening = "".join(f"if (true) {{\nint v{d} = {d};\n" for d in range(depth))
+    closing = "}\n" * depth
+    return f"""
+int i = 0;
+int total = 0;
+int step = 3;
+{opening}while (i < {n}) {{
+    total = total + step * v0;
+    i = i + 1;
+}}
+{closing}print(total);
+"""
+
+
+def constant_loop(n=20000):
+    # Loop full of constant subexpressions and a dead branch
+    return f"""
+int i = 0;
+int total = 0;
+while (i < {n} * 1) {{
+    total = total + (60 * 60 * 24) % 7 + i * 1;
+    if (2 > 3) {{
+        print(total);
+    }}
+    i = i + (3 - 2);
+}}
+print(total);
+"""
+
+
+def invariant_loop(n=20000):
+    # Counting loop whose condition and body recompute invariant values
+    return f"""
+int i = 0;
+int total = 0;
+int n = {n // 2};
+int limit = 40;
+int offset = 2;
+while (i < n * 2) {{
+    total = total + (limit - offset) * 3 + i;
+    i = i + 1;
+}}
+print(total);
+"""
+
+
+def invariant_nested_loops(n=150):
+    # Nested loops; the inner bound and the step never change in either loop
+    return f"""
+int i = 0;
+int hits = 0;
+int n = {n};
+int step = 1;
+while (i < n) {{
+    int j = 0;
+    while (j < n * step) {{
+        if ((i + j) % 3 == 0) {{
+            hits = hits + step * 2;
+        }}
+        j = j + step;
+    }}
+    i = i + step;
+}}
+print(hits);
+"""
+
+
+def helper_calls(n=20000):
+    # Tiny helper functions called in a hot loop
+    return f"""
+int sq(int x) {{
+    return x * x;
+}}
+
+int clamp_add(int a, int b) {{
+    return a + b % 1000;
+}}
+
+int i = 0;
+int total = 0;
+while (i < {n}) {{
+    total = clamp_add(total, sq(i));
+    i = i + 1;
+}}
+print(total);
+"""
+
+
+def nested_calls(n=20000, depth=6, recursion=60):
+    # Calls from a loop nested `depth` blocks deep, plus a recursion
+    # whose frames pile up below the call sites
+    opening = "".join(f"if (true) {{\nint v{d} = {d};\n" for d in range(depth))
+    closing = "}\n" * depth
+    return f"""
+int inc(int x) {{
+    return x + 1;
+}}
+
+int down(int n) {{
+    if (n == 0) {{
+        return 0;
+    }}
+    return inc(down(n - 1));
+}}
+
+int i = 0;
+int total = 0;
+{opening}while (i < {n}) {{
+    total = inc(total);
+    i = i + 1;
+}}
+{closing}print(total);
+int k = 0;
+while (k < {n // recursion}) {{
+    total = total + down({recursion});
+    k = k + 1;
+}}
+print(total);
+"""
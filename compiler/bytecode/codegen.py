@@ -0,0 +1,335 @@
+# compiler/bytecode/codegen.py
+
+from array import array
+
+from compiler.lexer.tokens import STRING
+from compiler.parser.ast_nodes import *
+from compiler.bytecode.opcodes import *
+from compiler.errors import CompilerError
+
+
+EXPRESSIONS = (BinOp, UnaryOp, Literal, Var, FunctionCall)
+
+
+class Unsupported(CompilerError):
+    # Valid CogniCode the bytecode cannot express; the VM leaves such
+    # programs to the tree-walker
+    pass
+
+
+# =========================
+# Code objects
+# =========================
+
+class CodeObject:
+    __slots__ = ("name", "code", "lines", "consts", "names", "nparams", "nlocals")
+
+    def __init__(self, name, nparams=0):
+        self.name = name
+        self.code = array("i")      # opcode, arg, opcode, arg, ...
+        self.lines = array("i")     # source line per instruction
+        self.consts = []            # constant pool
+        self.names = []             # local slot -> variable name
+        self.nparams = nparams
+        self.nlocals = 0
+
+
+class BytecodeProgram:
+    def __init__(self):
+        self.functions = []         # function index -> CodeObject
+        self.function_index = {}    # name -> function index
+        self.global_names = []      # global slot -> variable name
+
+
+# =========================
+# Bytecode Compiler
+# =========================
+# Lowers the AST to flat bytecode. Variables are resolved at compile
+# time: everything declared outside functions lives in a global slot,
+# parameters and function locals in slots of the call frame. Each
+# declaration gets its own slot, so block scoping costs nothing at run
+# time. Names are resolved lexically (where the function is declared).
+
+class BytecodeCompiler:
+    def __init__(self):
+        self.program = BytecodeProgram()
+        self.global_scopes = [{}]   # name -> global slot
+        self.code = None            # CodeObject being emitted
+        self.local_scopes = None    # name -> local slot, inside functions
+        self.loops = []             # (continue target, [break jump positions])
+        self.function_decls = {}    # name -> (FunctionDecl, visible globals), not yet compiled
+        self.arity = {}             # function name -> parameter count
+        self.const_slots = {}       # (id(code), type, repr) -> const index
+
+    # -------- Entry point --------
+    def compile_main(self, statements, name="<main>"):
+        # A top-level statement list; may be called again (streaming)
+        self.collect_functions(statements)
+
+        code = CodeObject(name)
+        self.code = code
+        self.emit_statements(statements)
+        self.emit(LOAD_CONST, self.const(None), 0)
+        self.emit(RETURN, 0, 0)
+
+        self.compile_pending_functions()
+        return code
+
+    # -------- Functions --------
+    def collect_functions(self, statements):
+        # Register every function up front so calls can be bound to an index.
+        # The table is global: programs that call a function outside the
+        # block declaring it run on the tree-walker (Program.dynamic_scoping)
+        stack = list(statements)
+        while stack:
+            node = stack.pop()
+            if isinstance(node, FunctionDecl):
+                if node.name in self.program.function_index:
+                    raise CompilerError(
+                        f"Function '{node.name}' already defined",
+                        node.line
+                    )
+                self.program.function_index[node.name] = len(self.program.functions)
+                self.arity[node.name] = len(node.params)
+                self.program.functions.append(None)
+                self.function_decls[node.name] = (node, [dict(s) for s in self.global_scopes])
+                stack.extend(node.body.statements)
+            elif isinstance(node, Block):
+                stack.extend(node.statements)
+            elif isinstance(node, If):
+                stack.append(node.then_block)
+                if node.else_block:
+                    stack.append(node.else_block)
+            elif isinstance(node, While):
+                stack.append(node.body)
+
+    def compile_pending_functions(self):
+        while self.function_decls:
+            name = next(iter(self.function_decls))
+            node, visible_globals = self.function_decls.pop(name)
+            self.compile_function(node, visible_globals)
+
+    def compile_function(self, node, visible_globals):
+        saved = (self.code, self.global_scopes, self.local_scopes, self.loops)
+
+        code = CodeObject(node.name, nparams=len(node.params))
+        self.code = code
+        self.global_scopes = visible_globals
+        self.local_scopes = [{}]
+        self.loops = []
+
+        for _, pname in node.params:
+            self.declare(pname)
+        self.emit_Block(node.body)
+        self.emit(LOAD_CONST, self.const(None), node.line)
+        self.emit(RETURN, 0, node.line)
+
+        self.program.functions[self.program.function_index[node.name]] = code
+        self.code, self.global_scopes, self.local_scopes, self.loops = saved
+
+    # -------- Helpers --------
+    def emit(self, op, arg, line):
+        self.code.code.append(op)
+        self.code.code.append(arg)
+        self.code.lines.append(line)
+        return len(self.code.code) - 2
+
+    def patch(self, position, target):
+        self.code.code[position + 1] = target
+
+    def here(self):
+        return len(self.code.code)
+
+    def const(self, value):
+        key = (id(self.code), type(value), repr(value))
+        index = self.const_slots.get(key)
+        if index is None:
+            index = self.const_slots[key] = len(self.code.consts)
+            self.code.consts.append(value)
+        return index
+
+    def declare(self, name):
+        if self.local_scopes is not None:
+            slot = self.code.nlocals
+            self.code.nlocals += 1
+            self.code.names.append(name)
+            self.local_scopes[-1][name] = slot
+            return STORE_LOCAL, slot
+
+        slot = len(self.program.global_names)
+        self.program.global_names.append(name)
+        self.global_scopes[-1][name] = slot
+        return STORE_GLOBAL, slot
+
+    def resolve(self, name, line, store=False):
+        if self.local_scopes is not None:
+            for scope in reversed(self.local_scopes):
+                if name in scope:
+                    return (STORE_LOCAL if store else LOAD_LOCAL), scope[name]
+
+        for scope in reversed(self.global_scopes):
+            if name in scope:
+                return (STORE_GLOBAL if store else LOAD_GLOBAL), scope[name]
+
+        raise CompilerError(f"Variable '{name}' not declared", line)
+
+    def push_scope(self):
+        scopes = self.local_scopes if self.local_scopes is not None else self.global_scopes
+        scopes.append({})
+
+    def pop_scope(self):
+        scopes = self.local_scopes if self.local_scopes is not None else self.global_scopes
+        scopes.pop()
+
+    # -------- Statements --------
+    def emit_statements(self, statements):
+        for stmt in statements:
+            self.emit_statement(stmt)
+
+    def emit_statement(self, node):
+        if isinstance(node, EXPRESSIONS):
+            self.emit_expr(node)
+            self.emit(POP, 0, node.line)
+            return
+        method = getattr(self, f"emit_{type(node).__name__}", None)
+        if not method:
+            raise CompilerError(
+                f"Bytecode compiler does not support {type(node).__name__}",
+                getattr(node, "line", None)
+            )
+        method(node)
+
+    def emit_Program(self, node):
+        self.emit_statements(node.statements)
+
+    def emit_Block(self, node):
+        self.push_scope()
+        self.emit_statements(node.statements)
+        self.pop_scope()
+
+    def emit_VarDecl(self, node):
+        self.emit_expr(node.expr)
+        op, slot = self.declare(node.name)
+        self.emit(op, slot, node.line)
+
+    def emit_Assign(self, node):
+        self.emit_expr(node.expr)
+        op, slot = self.resolve(node.name, node.line, store=True)
+        self.emit(op, slot, node.line)
+
+    def emit_Print(self, node):
+        self.emit_expr(node.expr)
+        self.emit(PRINT, 0, node.line)
+
+    def emit_If(self, node):
+        self.emit_expr(node.condition)
+        to_else = self.emit(POP_JUMP_IF_FALSE, 0, node.line)
+        self.emit_Block(node.then_block)
+
+        if node.else_block:
+            to_end = self.emit(JUMP, 0, node.line)
+            self.patch(to_else, self.here())
+            self.emit_Block(node.else_block)
+            self.patch(to_end, self.here())
+        else:
+            self.patch(to_else, self.here())
+
+    def emit_While(self, node):
+        start = self.here()
+        self.emit_expr(node.condition)
+        to_end = self.emit(POP_JUMP_IF_FALSE, 0, node.line)
+
+        self.loops.append((start, []))
+        self.emit_Block(node.body)
+        _, breaks = self.loops.pop()
+
+        self.emit(JUMP, start, node.line)
+        end = self.here()
+        self.patch(to_end, end)
+        for position in breaks:
+            self.patch(position, end)
+
+    def emit_Break(self, node):
+        if not self.loops:
+            raise CompilerError("'break' outside loop", node.line)
+        self.loops[-1][1].append(self.emit(JUMP, 0, node.line))
+
+    def emit_Continue(self, node):
+        if not self.loops:
+            raise CompilerError("'continue' outside loop", node.line)
+        self.emit(JUMP, self.loops[-1][0], node.line)
+
+    def emit_FunctionDecl(self, node):
+        if self.local_scopes is not None:
+            raise Unsupported(
+                f"function '{node.name}' is declared inside another function",
+                node.line
+            )
+        # compiled separately; refresh the globals it can see
+        if node.name in self.function_decls:
+            decl, _ = self.function_decls[node.name]
+            self.function_decls[node.name] = (decl, [dict(s) for s in self.global_scopes])
+
+    def emit_Return(self, node):
+        if self.local_scopes is None:
+            raise CompilerError("Return outside function", node.line)
+        if type(node.expr) is FunctionCall:
+            # tail position: the callee takes over this frame
+            self.emit_call(node.expr, TAIL_CALL)
+        elif node.expr:
+            self.emit_expr(node.expr)
+        else:
+            self.emit(LOAD_CONST, self.const(None), node.line)
+        self.emit(RETURN, 0, node.line)
+
+    # -------- Expressions --------
+    def emit_expr(self, node):
+        kind = type(node)
+
+        if kind is Literal:
+            self.emit(LOAD_CONST, self.const(node.value), node.line)
+
+        elif kind is Var:
+            op, slot = self.resolve(node.name, node.line)
+            self.emit(op, slot, node.line)
+
+        elif kind is BinOp:
+            if node.op not in BINARY_INDEX:
+                raise CompilerError(f"Unknown operator {node.op}", node.line)
+            op = node.op
+            if op in TEXT_OPERATORS and node.static_type in (STRING, None):
+                op = TEXT_OPERATORS[op]
+            self.emit_expr(node.left)
+            self.emit_expr(node.right)
+            self.emit(BINARY_OP, BINARY_INDEX[op], node.line)
+
+        elif kind is UnaryOp:
+            if node.op not in UNARY_INDEX:
+                raise CompilerError("Unknown unary operator", node.line)
+            self.emit_expr(node.expr)
+            self.emit(UNARY_OP, UNARY_INDEX[node.op], node.line)
+
+        elif kind is FunctionCall:
+            self.emit_call(node, CALL)
+
+        else:
+            raise CompilerError(
+                f"Bytecode compiler does not support {kind.__name__}",
+                getattr(node, "line", None)
+            )
+
+    def emit_call(self, node, op):
+        index = self.program.function_index.get(node.name)
+        if index is None:
+            raise CompilerError(f"Function '{node.name}' not defined", node.line)
+
+        expected = self.arity[node.name]
+        if expected != len(node.args):
+            raise CompilerError(
+                f"Function '{node.name}' expects {expected} arguments, "
+                f"got {len(node.args)}",
+                line=node.line
+            )
+        for arg in node.args:
+            self.emit_expr(arg)
+        self.emit(op, index, node.line)
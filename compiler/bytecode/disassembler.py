@@ -0,0 +1,47 @@
+# compiler/bytecode/disassembler.py
+
+from compiler.bytecode.opcodes import *
+
+
+def disassemble_code(code, program):
+    lines = [f"== {code.name} ({code.nparams} params, {code.nlocals} locals) =="]
+    jump_targets = {
+        code.code[i + 1] for i in range(0, len(code.code), 2)
+        if code.code[i] in (JUMP, POP_JUMP_IF_FALSE)
+    }
+
+    for i in range(0, len(code.code), 2):
+        op, arg = code.code[i], code.code[i + 1]
+        line = code.lines[i // 2]
+        marker = ">>" if i in jump_targets else "  "
+
+        if op == LOAD_CONST:
+            detail = repr(code.consts[arg])
+        elif op in (LOAD_LOCAL, STORE_LOCAL):
+            detail = code.names[arg]
+        elif op in (LOAD_GLOBAL, STORE_GLOBAL):
+            detail = program.global_names[arg]
+        elif op == BINARY_OP:
+            detail = BINARY_OPERATORS[arg][0]
+        elif op == UNARY_OP:
+            detail = UNARY_OPERATORS[arg][0]
+        elif op in (CALL, TAIL_CALL):
+            detail = program.functions[arg].name
+        else:
+            detail = ""
+
+        text = f"{line:5} {marker} {i:5} {OPNAMES[op]:<18}"
+        if op not in (RETURN, PRINT, POP):
+            text += f" {arg:>4}"
+        if detail:
+            text += f" ({detail})"
+        lines.append(text)
+    return "\n".join(lines)
+
+
+def disassemble(main, program):
+    # Main code first, then every function in index order
+    parts = [disassemble_code(main, program)]
+    for func in program.functions:
+        parts.append(disassemble_code(func, program))
+    return "\n\n".join(parts)
@@ -0,0 +1,72 @@
+# compiler/bytecode/opcodes.py
+
+import operator
+
+from compiler.interpreter.budget import checked_add, checked_mul
+
+
+# =========================
+# Instruction set
+# =========================
+# Every instruction is two ints in CodeObject.code: opcode, argument.
+# Opcodes that take no argument carry 0.
+
+LOAD_CONST        = 1     # push consts[arg]
+LOAD_LOCAL        = 2     # push locals[arg]
+STORE_LOCAL       = 3     # locals[arg] = pop()
+LOAD_GLOBAL       = 4     # push globals[arg]
+STORE_GLOBAL      = 5     # globals[arg] = pop()
+BINARY_OP         = 6     # right = pop(); left = pop(); push(BINARY_FUNCS[arg](left, right))
+UNARY_OP          = 7     # push(UNARY_FUNCS[arg](pop()))
+JUMP              = 8     # pc = arg
+POP_JUMP_IF_FALSE = 9     # if not pop(): pc = arg
+CALL              = 10    # call functions[arg]; its arguments are on the stack
+RETURN            = 11    # return pop() to the caller
+PRINT             = 12    # print(pop())
+POP               = 13    # drop the top of the stack
+TAIL_CALL         = 14    # like CALL, but replaces the current frame
+
+OPNAMES = {
+    value: name for name, value in list(globals().items())
+    if name.isupper() and isinstance(value, int)
+}
+
+
+# =========================
+# Operators
+# =========================
+# BINARY_OP / UNARY_OP argument -> (token type, function)
+
+BINARY_OPERATORS = [
+    ("PLUS", operator.add),
+    ("MINUS", operator.sub),
+    ("MUL", operator.mul),
+    ("DIV", operator.truediv),
+    ("MOD", operator.mod),
+    ("LT", operator.lt),
+    ("GT", operator.gt),
+    ("LE", operator.le),
+    ("GE", operator.ge),
+    ("EQ", operator.eq),
+    ("NEQ", operator.ne),
+    # both sides are always evaluated, as in the Interpreter
+    ("AND", lambda left, right: bool(left) and bool(right)),
+    ("OR", lambda left, right: bool(left) or bool(right)),
+    # + and * that may build text, with the size check
+    ("CONCAT", checked_add),
+    ("REPEAT", checked_mul),
+]
+
+# BinOp operator -> the checked one used when an operand may be text
+TEXT_OPERATORS = {"PLUS": "CONCAT", "MUL": "REPEAT"}
+
+UNARY_OPERATORS = [
+    ("NOT", operator.not_),
+    ("MINUS", operator.neg),
+]
+
+BINARY_INDEX = {name: i for i, (name, _) in enumerate(BINARY_OPERATORS)}
+UNARY_INDEX = {name: i for i, (name, _) in enumerate(UNARY_OPERATORS)}
+
+BINARY_FUNCS = [func for _, func in BINARY_OPERATORS]
+UNARY_FUNCS = [func for _, func in UNARY_OPERATORS]
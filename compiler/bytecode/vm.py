@@ -0,0 +1,173 @@
+# compiler/bytecode/vm.py
+
+from compiler.parser.ast_nodes import Program
+from compiler.bytecode.opcodes import *
+from compiler.bytecode.codegen import BytecodeCompiler, Unsupported
+from compiler.interpreter.interpreter import Interpreter
+from compiler.interpreter.output import new_output
+from compiler.errors import LimitExceeded, recursion_limit_error
+from compiler.limits import MAX_CALL_DEPTH
+
+
+# =========================
+# Virtual Machine
+# =========================
+# Stack machine for BytecodeCompiler output. One dispatch loop runs
+# every frame: a call pushes the caller's state onto an explicit frame
+# list instead of recursing in Python, so the depth of user recursion
+# is bounded by max_depth only. A TAIL_CALL (`return f(...)`) reuses the
+# current frame and does not add to the depth.
+#
+# Names are resolved lexically, and functions through one table for the
+# whole program. Programs where that differs from the language's
+# scoping (Program.dynamic_scoping, set by the analyzer) or that the bytecode cannot express (functions declared in
+# functions) run on the tree-walking Interpreter; `fallback_reason`
+# says why.
+
+class VirtualMachine:
+    def __init__(self, max_depth=MAX_CALL_DEPTH, memoize=False, output=None, budget=None):
+        if memoize:
+            raise Exception("The vm engine does not memoize calls; "
+                            "use the tree, slots or closure engine")
+        self.compiler = BytecodeCompiler()
+        self.globals = []
+        self.max_depth = max_depth
+        self.output = new_output(output)
+        self.budget = budget
+        self.fallback_reason = None
+        self.fallback = None
+
+    def interpret(self, node):
+        # Same interface as Interpreter: compile, then run
+        if not isinstance(node, Program):
+            return self.run(self.compiler.compile_main([node]))
+
+        reason = node.dynamic_scoping
+        if reason is None:
+            try:
+                main = self.compiler.compile_main(node.statements)
+            except Unsupported as e:
+                reason = f"line {e.line}: {e.message}"
+            else:
+                return self.run(main)
+        self.fallback_reason = reason
+        self.fallback = Interpreter(max_depth=self.max_depth, output=self.output, budget=self.budget)
+        return self.fallback.interpret(node)
+
+    def run(self, main):
+        program = self.compiler.program
+        functions = program.functions
+        binary = BINARY_FUNCS
+        unary = UNARY_FUNCS
+        write = self.output.write
+        budget = self.budget
+
+        globals_ = self.globals
+        globals_.extend([None] * (len(program.global_names) - len(globals_)))
+
+        # plain lists index faster than the compact arrays
+        function_code = [list(func.code) for func in functions]
+
+        max_depth = self.max_depth
+        frames = []                 # saved (code, consts, pc, locals) of callers
+        stack = []
+        push = stack.append
+        pop = stack.pop
+
+        code = list(main.code)
+        consts = main.consts
+        locals_ = []
+        pc = 0
+
+        while True:
+            op = code[pc]
+            arg = code[pc + 1]
+            pc += 2
+
+            if op == LOAD_LOCAL:
+                push(locals_[arg])
+            elif op == LOAD_GLOBAL:
+                push(globals_[arg])
+            elif op == LOAD_CONST:
+                push(consts[arg])
+            elif op == BINARY_OP:
+                right = pop()
+                try:
+                    stack[-1] = binary[arg](stack[-1], right)
+                except LimitExceeded as e:          # text grown too long
+                    e.line = self.line_at(main, code, pc, function_code)
+                    raise
+            elif op == POP_JUMP_IF_FALSE:
+                if not pop():
+                    pc = arg
+            elif op == STORE_LOCAL:
+                locals_[arg] = pop()
+            elif op == STORE_GLOBAL:
+                globals_[arg] = pop()
+            elif op == JUMP:
+                if budget is not None and arg < pc:       # loop back-edge
+                    budget.remaining -= 1
+                    if budget.remaining <= 0:
+                        budget.charge(self.line_at(main, code, pc, function_code))
+                pc = arg
+            elif op == CALL:
+                if len(frames) >= max_depth:
+                    raise self.depth_error(main, code, pc, arg, function_code)
+                if budget is not None:
+                    budget.remaining -= 1
+                    if budget.remaining <= 0:
+                        budget.charge(self.line_at(main, code, pc, function_code))
+                func = functions[arg]
+                nparams = func.nparams
+                frames.append((code, consts, pc, locals_))
+                if nparams:
+                    locals_ = stack[-nparams:]
+                    del stack[-nparams:]
+                else:
+                    locals_ = []
+                locals_.extend([None] * (func.nlocals - nparams))
+                code = function_code[arg]
+                consts = func.consts
+                pc = 0
+            elif op == RETURN:
+                if not frames:
+                    return pop()
+                code, consts, pc, locals_ = frames.pop()
+            elif op == UNARY_OP:
+                stack[-1] = unary[arg](stack[-1])
+            elif op == PRINT:
+                write(f"{pop()}\n")
+            elif op == POP:
+                pop()
+            elif op == TAIL_CALL:
+                if budget is not None:
+                    budget.remaining -= 1
+                    if budget.remaining <= 0:
+                        budget.charge(self.line_at(main, code, pc, function_code))
+                func = functions[arg]
+                nparams = func.nparams
+                if nparams:
+                    locals_ = stack[-nparams:]
+                    del stack[-nparams:]
+                else:
+                    locals_ = []
+                locals_.extend([None] * (func.nlocals - nparams))
+                code = function_code[arg]
+                consts = func.consts
+                pc = 0
+            else:
+                raise Exception(f"Unknown opcode {op}")
+
+    def line_at(self, main, code, pc, function_code):
+        # Source line of the instruction just before pc
+        running = main
+        for i, listed in enumerate(function_code):
+            if listed is code:
+                running = self.compiler.program.functions[i]
+        return running.lines[pc // 2 - 1]
+
+    def depth_error(self, main, code, pc, index, function_code):
+        # Error for the CALL just before pc, with its source line
+        name = self.compiler.program.functions[index].name
+        line = self.line_at(main, code, pc, function_code)
+        return recursion_limit_error(self.max_depth, name, line)
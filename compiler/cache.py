@@ -0,0 +1,120 @@
+# compiler/cache.py
+
+import hashlib
+import os
+import struct
+import threading
+from collections import OrderedDict
+
+from compiler.lexer.fast_lexer import FastLexer
+from compiler.parser.parser import Parser
+from compiler.parser.compact_ast import NodeStore
+from compiler.semantic.analyzer import SemanticAnalyzer
+
+
+def source_hash(source):
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+# =========================
+# Program Cache
+# =========================
+# Parsed and semantically checked Programs keyed by the SHA-256 of the
+# source. Hot entries live in memory (LRU); with a directory every
+# entry is also written as a binary NodeStore file, which loads much
+# faster than lexing, parsing and analysing again.
+#
+# Cached Programs are shared between runs: later stages must treat
+# them as read-only.
+
+class ProgramCache:
+    def __init__(self, max_entries=256, directory=None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    # -------- Lookup --------
+    def load(self, source):
+        key = source_hash(source)
+
+        program = self.get(key)
+        if program is not None:
+            return program
+
+        program = Parser(FastLexer(source)).parse()
+        SemanticAnalyzer().analyze(program)
+
+        with self.lock:
+            self.misses += 1
+        self.put(key, program)
+        return program
+
+    def get(self, key):
+        with self.lock:
+            program = self.entries.get(key)
+            if program is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return program
+
+        program = self.read_file(key)
+        if program is not None:
+            with self.lock:
+                self.disk_hits += 1
+            self.remember(key, program)
+        return program
+
+    def put(self, key, program):
+        self.remember(key, program)
+        self.write_file(key, program)
+
+    def remember(self, key, program):
+        with self.lock:
+            self.entries[key] = program
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
+
+    # -------- Disk --------
+    def path(self, key):
+        return os.path.join(self.directory, key + ".cgast")
+
+    def read_file(self, key):
+        if not self.directory:
+            return None
+        try:
+            with open(self.path(key), "rb") as f:
+                return NodeStore.from_bytes(f.read()).to_ast()
+        except (OSError, ValueError, EOFError, IndexError, struct.error):
+            # missing, truncated or written by another format version
+            return None
+
+    def write_file(self, key, program):
+        if not self.directory:
+            return
+        path = self.path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(NodeStore.from_ast(program).to_bytes())
+            os.replace(tmp, path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
@@ -0,0 +1,90 @@
+# compiler/cli.py
+#
+# Command-line runner:
+#     python -m compiler.cli program.cc [--engine NAME] [--optimize] [--dis] [--stream]
+
+import argparse
+import sys
+
+from compiler.lexer.fast_lexer import FastLexer
+from compiler.parser.parser import Parser
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.bytecode.codegen import BytecodeCompiler
+from compiler.bytecode.disassembler import disassemble
+from compiler.optimizer.optimizer import optimize_program, default_passes
+from compiler.optimizer.inliner import INLINE_SIZE
+from compiler.limits import MAX_CALL_DEPTH
+from compiler.interpreter.budget import new_budget
+from compiler.pipeline import ENGINES, create_interpreter, execute, run_stream
+from compiler.errors import CompilerError
+
+
+def read_source(path):
+    if path == "-":
+        return sys.stdin.read()
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="cognicode", description="Run a CogniCode program.")
+    parser.add_argument("file", help="source file, or - for stdin")
+    parser.add_argument("--engine", default="tree", choices=list(ENGINES),
+                        help="execution engine (default: tree)")
+    parser.add_argument("--max-depth", type=int, default=MAX_CALL_DEPTH, metavar="N",
+                        help=f"deepest chain of function calls (default: {MAX_CALL_DEPTH})")
+    parser.add_argument("--max-steps", type=int, default=None, metavar="N",
+                        help="stop after N loop iterations and calls (default: no limit)")
+    parser.add_argument("--timeout", type=float, default=None, metavar="SECONDS",
+                        help="stop after this much wall-clock time (default: no limit)")
+    parser.add_argument("--memoize", action="store_true",
+                        help="cache results of pure functions (not on the vm engine)")
+    parser.add_argument("-O", "--optimize", action="store_true",
+                        help="optimize the program first; changes are listed on stderr")
+    parser.add_argument("--inline-size", type=int, default=INLINE_SIZE, metavar="N",
+                        help=f"inline functions returning at most N nodes (default: {INLINE_SIZE})")
+    parser.add_argument("--dis", action="store_true",
+                        help="print the bytecode instead of running the program")
+    parser.add_argument("--stream", action="store_true",
+                        help="execute statements while the file is still being read")
+    args = parser.parse_args(argv)
+    options = {
+        "max_depth": args.max_depth,
+        "memoize": args.memoize,
+        "budget": new_budget(args.max_steps, args.timeout),
+    }
+
+    try:
+        if args.stream:
+            stream = sys.stdin.buffer if args.file == "-" else open(args.file, "rb")
+            with stream:
+                run_stream(stream, create_interpreter(args.engine, **options))
+            return 0
+
+        ast = Parser(FastLexer(read_source(args.file))).parse()
+        SemanticAnalyzer().analyze(ast)
+
+        if args.optimize:
+            ast, changes = optimize_program(ast, default_passes(args.inline_size))
+            for change in changes:
+                print(f"optimized {change}", file=sys.stderr)
+
+        if args.dis:
+            compiler = BytecodeCompiler()
+            main_code = compiler.compile_main(ast.statements)
+            print(disassemble(main_code, compiler.program))
+            return 0
+
+        execute(create_interpreter(args.engine, **options), ast)
+        return 0
+
+    except CompilerError as e:
+        where = f" at line {e.line}" if e.line else ""
+        print(f"Error{where}: {e.message}", file=sys.stderr)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,3 +3,40 @@ class CompilerError(Exception):
         self.message = message
         self.line = line
         super().__init__(message)
+
+
+class LimitExceeded(CompilerError):
+    # A run used up one of its budgets: limit is "steps", "time",
+    # "depth", "output" or "memory", maximum the configured value (if known)
+    def __init__(self, message, limit, maximum=None, line=None):
+        super().__init__(message, line)
+        self.limit = limit
+        self.maximum = maximum
+
+
+class RunCancelled(CompilerError):
+    # The run was stopped from outside (see Budget's cancel event)
+    pass
+
+
+class RecursionLimitError(LimitExceeded):
+    def __init__(self, message, maximum=None, line=None):
+        super().__init__(message, "depth", maximum, line)
+
+
+def recursion_limit_error(max_depth, name, line=None):
+    return RecursionLimitError(
+        f"Maximum recursion depth exceeded ({max_depth} nested calls) "
+        f"in function '{name}'",
+        max_depth,
+        line
+    )
+
+
+def string_limit_error(max_length, line=None):
+    return LimitExceeded(
+        f"String too long (more than {max_length} characters)",
+        "memory",
+        max_length,
+        line
+    )
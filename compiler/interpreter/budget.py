@@ -0,0 +1,99 @@
+# compiler/interpreter/budget.py
+
+import time
+
+from compiler.errors import LimitExceeded, RunCancelled, string_limit_error
+from compiler.limits import BUDGET_CHECK_INTERVAL, MAX_STRING_LENGTH
+
+
+# =========================
+# Execution budget
+# =========================
+# Steps (loop iterations plus function calls) and wall-clock time one
+# run may use. Engines given a Budget count down `remaining` at every
+# loop back-edge and call:
+#
+#     budget.remaining -= 1
+#     if budget.remaining <= 0:
+#         budget.charge(line)
+#
+# so the step total and the clock are only looked at once per
+# `interval` steps. Engines without a Budget run no checks at all.
+#
+# `cancel`, a threading.Event, lets another thread stop the run: it is
+# checked at the same points and raises RunCancelled once set.
+
+class Budget:
+    def __init__(self, max_steps=None, max_seconds=None, interval=BUDGET_CHECK_INTERVAL, cancel=None):
+        self.max_steps = max_steps
+        self.max_seconds = max_seconds
+        self.interval = interval
+        self.cancel = cancel
+        self.deadline = None if max_seconds is None else time.monotonic() + max_seconds
+        self.steps = 0              # steps before the current chunk
+        self.chunk = 0
+        self.remaining = 0
+        self.next_chunk()
+
+    def next_chunk(self):
+        # The step that ends a chunk calls charge(); with a step limit
+        # that is at the latest step max_steps + 1, the first one too many
+        chunk = self.interval
+        if self.max_steps is not None:
+            chunk = min(chunk, self.max_steps + 1 - self.steps)
+        self.chunk = self.remaining = chunk
+
+    def charge(self, line=None):
+        self.steps += self.chunk
+        if self.cancel is not None and self.cancel.is_set():
+            raise RunCancelled("Run cancelled", line)
+        if self.max_steps is not None and self.steps > self.max_steps:
+            self.steps = self.max_steps
+            raise LimitExceeded(
+                f"Step limit exceeded ({self.max_steps} loop iterations and calls)",
+                "steps", self.max_steps, line
+            )
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise LimitExceeded(
+                f"Time limit exceeded ({self.max_seconds:g} s)",
+                "time", self.max_seconds, line
+            )
+        self.next_chunk()
+
+    def used(self):
+        return self.steps + self.chunk - self.remaining
+
+
+def new_budget(max_steps=None, max_seconds=None, cancel=None):
+    # A Budget, or None when nothing is limited
+    if max_steps is None and max_seconds is None and cancel is None:
+        return None
+    return Budget(max_steps, max_seconds, cancel=cancel)
+
+
+# =========================
+# Value size
+# =========================
+# + and * are the only operators that build bigger values out of text.
+# These versions refuse to build a string longer than MAX_STRING_LENGTH,
+# so a doubling loop stops with a "memory" LimitExceeded before it eats
+# the host's memory. Engines use them where an operand may be text and
+# the plain operators everywhere else.
+
+def checked_add(left, right, line=None):
+    if type(left) is str and type(right) is str and len(left) + len(right) > MAX_STRING_LENGTH:
+        raise string_limit_error(MAX_STRING_LENGTH, line)
+    return left + right
+
+
+def checked_mul(left, right, line=None):
+    # "ab" * 3 and 3 * "ab" repeat the text
+    if type(left) is str:
+        text, count = left, right
+    elif type(right) is str:
+        text, count = right, left
+    else:
+        return left * right
+    if len(text) * count > MAX_STRING_LENGTH:
+        raise string_limit_error(MAX_STRING_LENGTH, line)
+    return left * right
@@ -0,0 +1,342 @@
+# compiler/interpreter/closure_compiler.py
+
+import operator
+
+from compiler.lexer.tokens import STRING
+from compiler.parser.ast_nodes import *
+from compiler.interpreter.environment import Environment
+from compiler.interpreter.memo import CallMemo, MISSING, new_memo
+from compiler.interpreter.output import new_output
+from compiler.interpreter.budget import checked_add, checked_mul
+from compiler.errors import CompilerError, recursion_limit_error
+from compiler.limits import MAX_CALL_DEPTH, PYTHON_CALL_DEPTH
+
+
+# =====================
+# Completion codes
+# =====================
+# Compiled statements return None to fall through, or one of these.
+# A RETURN leaves its value in ClosureCompiler.return_value.
+
+BREAK = 1
+CONTINUE = 2
+RETURN = 3
+
+
+BINARY_OPERATORS = {
+    "PLUS": checked_add,
+    "MINUS": operator.sub,
+    "MUL": checked_mul,
+    "DIV": operator.truediv,
+    "MOD": operator.mod,
+    "LT": operator.lt,
+    "GT": operator.gt,
+    "LE": operator.le,
+    "GE": operator.ge,
+    "EQ": operator.eq,
+    "NEQ": operator.ne,
+    # both sides are always evaluated, as in the Interpreter
+    "AND": lambda left, right: bool(left) and bool(right),
+    "OR": lambda left, right: bool(left) or bool(right),
+}
+
+UNARY_OPERATORS = {
+    "NOT": operator.not_,
+    "MINUS": operator.neg,
+}
+
+# Typed operations: the SemanticAnalyzer has checked the operand types
+# (node.static_type is set), so the closure applies Python's operator
+# directly instead of calling through BINARY_OPERATORS. There is one
+# handler per operator, not per type (int, float and text share the
+# Python operator); what it saves is the extra call, 5-14% on
+# benchmarks.bench_typed_ops. Each entry builds the closure from the
+# compiled operands; the second form takes the value of a literal
+# right operand. && and || keep the generic
+# handler: a function without a return statement yields no value, so
+# a bool-typed operand is not guaranteed to be a bool.
+TYPED_BINARY = {
+    "PLUS": (lambda l, r: lambda env: l(env) + r(env), lambda l, v: lambda env: l(env) + v),
+    "MINUS": (lambda l, r: lambda env: l(env) - r(env), lambda l, v: lambda env: l(env) - v),
+    "MUL": (lambda l, r: lambda env: l(env) * r(env), lambda l, v: lambda env: l(env) * v),
+    "DIV": (lambda l, r: lambda env: l(env) / r(env), lambda l, v: lambda env: l(env) / v),
+    "MOD": (lambda l, r: lambda env: l(env) % r(env), lambda l, v: lambda env: l(env) % v),
+    "LT": (lambda l, r: lambda env: l(env) < r(env), lambda l, v: lambda env: l(env) < v),
+    "GT": (lambda l, r: lambda env: l(env) > r(env), lambda l, v: lambda env: l(env) > v),
+    "LE": (lambda l, r: lambda env: l(env) <= r(env), lambda l, v: lambda env: l(env) <= v),
+    "GE": (lambda l, r: lambda env: l(env) >= r(env), lambda l, v: lambda env: l(env) >= v),
+    "EQ": (lambda l, r: lambda env: l(env) == r(env), lambda l, v: lambda env: l(env) == v),
+    "NEQ": (lambda l, r: lambda env: l(env) != r(env), lambda l, v: lambda env: l(env) != v),
+}
+
+# + and * that may build text, with the source line for the error
+CHECKED_BINARY = {
+    "PLUS": checked_add,
+    "MUL": checked_mul,
+}
+
+EXPRESSIONS = (BinOp, UnaryOp, Literal, Var, FunctionCall)
+
+
+class CompiledFunction:
+    __slots__ = ("name", "params", "body", "pure")
+
+    def __init__(self, name, params, body, pure):
+        self.name = name
+        self.params = params
+        self.body = body
+        self.pure = pure
+
+
+# =====================
+# Closure Compiler
+# =====================
+# Compiles the AST once into nested Python closures taking the current
+# Environment. Operators and children are bound at compile time, so
+# running a node costs one call: no per-visit method lookup and no
+# operator string compares. Scoping and call semantics follow the
+# tree-walking Interpreter. Operations on type-checked operands use the
+# TYPED_* handlers; unanalysed trees get the generic ones.
+
+class ClosureCompiler:
+    def __init__(self, max_depth=MAX_CALL_DEPTH, memoize=False, output=None, budget=None):
+        self.env = Environment()
+        self.output = new_output(output)
+        self.budget = budget
+        self.compiled = {}          # FunctionDecl -> CompiledFunction
+        self.return_value = None
+        self.max_depth = min(max_depth, PYTHON_CALL_DEPTH)     # recurses in Python
+        self.depth = 0              # user function calls in progress
+        self.call = None            # innermost of them (FunctionCall)
+        self.memo = new_memo(memoize)
+
+    # -------- Entry points --------
+    def interpret(self, node):
+        # Same interface as Interpreter: compile, then run in the global env
+        return self.compile_statement(node)(self.env)
+
+    def compile(self, node):
+        method = getattr(self, f"compile_{type(node).__name__}", None)
+        if not method:
+            raise Exception(f"No compile method for {type(node).__name__}")
+        return method(node)
+
+    def compile_statement(self, node):
+        if isinstance(node, EXPRESSIONS):
+            # expression statement: run it, drop the value
+            expr = self.compile(node)
+
+            def run(env):
+                expr(env)
+            return run
+        return self.compile(node)
+
+    def compile_body(self, statements):
+        compiled = tuple(self.compile_statement(stmt) for stmt in statements)
+
+        def run(env):
+            for stmt in compiled:
+                code = stmt(env)
+                if code:
+                    return code
+        return run
+
+    # -------- Program --------
+    def compile_Program(self, node):
+        return self.compile_body(node.statements)
+
+    def compile_Block(self, node):
+        body = self.compile_body(node.statements)
+
+        def run(env):
+            return body(Environment(parent=env))
+        return run
+
+    # -------- Statements --------
+    def compile_VarDecl(self, node):
+        name = node.name
+        expr = self.compile(node.expr)
+
+        def run(env):
+            env.define(name, expr(env))
+        return run
+
+    def compile_Assign(self, node):
+        name = node.name
+        expr = self.compile(node.expr)
+
+        def run(env):
+            env.assign(name, expr(env))
+        return run
+
+    def compile_Print(self, node):
+        expr = self.compile(node.expr)
+        write = self.output.write
+
+        def run(env):
+            write(f"{expr(env)}\n")
+        return run
+
+    def compile_If(self, node):
+        condition = self.compile(node.condition)
+        then_block = self.compile(node.then_block)
+        else_block = self.compile(node.else_block) if node.else_block else None
+
+        def run(env):
+            if condition(env):
+                return then_block(env)
+            if else_block:
+                return else_block(env)
+        return run
+
+    def compile_While(self, node):
+        condition = self.compile(node.condition)
+        body = self.compile(node.body)
+        budget = self.budget
+        line = node.line
+
+        if budget is not None:
+            def run(env):
+                while condition(env):
+                    budget.remaining -= 1
+                    if budget.remaining <= 0:
+                        budget.charge(line)
+                    code = body(env)
+                    if code:
+                        if code == BREAK:
+                            break
+                        if code == RETURN:
+                            return code
+            return run
+
+        def run(env):
+            while condition(env):
+                code = body(env)
+                if code:
+                    if code == BREAK:
+                        break
+                    if code == RETURN:
+                        return code
+        return run
+
+    def compile_Break(self, node):
+        return lambda env: BREAK
+
+    def compile_Continue(self, node):
+        return lambda env: CONTINUE
+
+    # -------- Functions --------
+    def compile_FunctionDecl(self, node):
+        # registered before the body, so recursive calls resolve to it
+        func = self.compiled[node] = CompiledFunction(node.name, node.params, None, node.pure)
+        func.body = self.compile(node.body)
+
+        def run(env):
+            env.define_function(func.name, func)
+        return run
+
+    def compile_FunctionCall(self, node):
+        name = node.name
+        line = node.line
+        args = tuple(self.compile(arg) for arg in node.args)
+        engine = self
+        target = self.compiled.get(node.target)
+        budget = self.budget
+
+        def call(env):
+            func = target or env.get_function(name)
+
+            if len(args) != len(func.params):
+                raise CompilerError(
+                    f"Function '{name}' expects {len(func.params)} arguments, "
+                    f"got {len(args)}",
+                    line=line
+                )
+
+            values = [arg(env) for arg in args]
+
+            key = None
+            if engine.memo is not None and func.pure:
+                key = CallMemo.key(name, values)
+                value = engine.memo.get(key)
+                if value is not MISSING:
+                    return value
+
+            frame = Environment(parent=env)
+            for (_, param_name), value in zip(func.params, values):
+                frame.define(param_name, value)
+
+            if engine.depth >= engine.max_depth:
+                raise recursion_limit_error(engine.max_depth, name, line)
+            engine.depth += 1
+            caller = engine.call
+            engine.call = node
+            if budget is not None:
+                budget.remaining -= 1
+                if budget.remaining <= 0:
+                    budget.charge(line)
+
+            value = None
+            if func.body(frame) == RETURN:
+                value = engine.return_value
+                engine.return_value = None
+            engine.call = caller
+            engine.depth -= 1
+            if key is not None:
+                engine.memo.put(key, value)
+            return value
+        return call
+
+    def compile_Return(self, node):
+        expr = self.compile(node.expr) if node.expr else None
+        engine = self
+
+        def run(env):
+            engine.return_value = expr(env) if expr else None
+            return RETURN
+        return run
+
+    # -------- Expressions --------
+    def compile_BinOp(self, node):
+        op = BINARY_OPERATORS.get(node.op)
+        if op is None:
+            raise Exception(f"Unknown operator {node.op}")
+
+        left = self.compile(node.left)
+        checked = CHECKED_BINARY.get(node.op)
+        if checked is not None and node.static_type in (STRING, None):
+            line = node.line
+            right = self.compile(node.right)
+            return lambda env: checked(left(env), right(env), line)
+        typed = TYPED_BINARY.get(node.op) if node.static_type is not None else None
+
+        if isinstance(node.right, Literal):
+            value = node.right.value
+            if typed:
+                return typed[1](left, value)
+            return lambda env: op(left(env), value)
+
+        right = self.compile(node.right)
+        if typed:
+            return typed[0](left, right)
+        return lambda env: op(left(env), right(env))
+
+    def compile_UnaryOp(self, node):
+        op = UNARY_OPERATORS.get(node.op)
+        if op is None:
+            raise Exception("Unknown unary operator")
+
+        expr = self.compile(node.expr)
+        if node.static_type is not None:
+            if node.op == "NOT":
+                return lambda env: not expr(env)
+            return lambda env: -expr(env)
+        return lambda env: op(expr(env))
+
+    def compile_Literal(self, node):
+        value = node.value
+        return lambda env: value
+
+    def compile_Var(self, node):
+        name = node.name
+        return lambda env: env.get(name)
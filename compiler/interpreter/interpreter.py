@@ -1,23 +1,32 @@
 from compiler.parser.ast_nodes import *
 from compiler.interpreter.environment import Environment
-from compiler.errors import CompilerError
+from compiler.interpreter.memo import CallMemo, MISSING, new_memo
+from compiler.interpreter.output import new_output
+from compiler.interpreter.budget import checked_add, checked_mul
+from compiler.errors import CompilerError, recursion_limit_error
+from compiler.limits import MAX_CALL_DEPTH, PYTHON_CALL_DEPTH
 
 
 # =====================
-# Control Flow Signals
+# Completion codes
 # =====================
+# Statements return None to fall through, or one of these singletons.
+# They are plain return values, so break / continue / return cost no
+# exception raising. A RETURN leaves its value in Interpreter.return_value.
 
-class BreakSignal(Exception):
-    pass
+class Completion:
+    __slots__ = ("kind",)
 
+    def __init__(self, kind):
+        self.kind = kind
 
-class ContinueSignal(Exception):
-    pass
+    def __repr__(self):
+        return f"<{self.kind}>"
 
 
-class ReturnSignal(Exception):
-    def __init__(self, value):
-        self.value = value
+BREAK = Completion("break")
+CONTINUE = Completion("continue")
+RETURN = Completion("return")
 
 
 # =====================
@@ -25,8 +34,15 @@ class ReturnSignal(Exception):
 # =====================
 
 class Interpreter:
-    def __init__(self):
+    def __init__(self, max_depth=MAX_CALL_DEPTH, memoize=False, output=None, budget=None):
         self.env = Environment()
+        self.return_value = None
+        self.max_depth = min(max_depth, PYTHON_CALL_DEPTH)     # recurses in Python
+        self.depth = 0              # user function calls in progress
+        self.call = None            # innermost of them (FunctionCall)
+        self.memo = new_memo(memoize)   # results of pure calls, or None
+        self.output = new_output(output)    # where print writes
+        self.budget = budget        # steps / time (see budget.py), or None
 
     # -------- Dispatcher --------
     def interpret(self, node):
@@ -36,16 +52,22 @@ class Interpreter:
         return method(node)
 
     # -------- Program --------
+    # Expression statements return their value, hence the type check
     def visit_Program(self, node):
         for stmt in node.statements:
-            self.interpret(stmt)
+            code = self.interpret(stmt)
+            if code is not None and type(code) is Completion:
+                return code
 
     def visit_Block(self, node):
         previous_env = self.env
         self.env = Environment(parent=previous_env)
 
         for stmt in node.statements:
-            self.interpret(stmt)
+            code = self.interpret(stmt)
+            if code is not None and type(code) is Completion:
+                self.env = previous_env
+                return code
 
         self.env = previous_env
 
@@ -59,35 +81,40 @@ class Interpreter:
         self.env.assign(node.name, value)
 
     def visit_Print(self, node):
-        print(self.interpret(node.expr))
+        self.output.write(f"{self.interpret(node.expr)}\n")
 
     def visit_If(self, node):
         if self.interpret(node.condition):
-            self.interpret(node.then_block)
+            return self.interpret(node.then_block)
         elif node.else_block:
-            self.interpret(node.else_block)
+            return self.interpret(node.else_block)
 
     def visit_While(self, node):
+        budget = self.budget
         while self.interpret(node.condition):
-            try:
-                self.interpret(node.body)
-            except ContinueSignal:
-                continue
-            except BreakSignal:
+            if budget is not None:
+                budget.remaining -= 1
+                if budget.remaining <= 0:
+                    budget.charge(node.line)
+            code = self.interpret(node.body)
+            if code is BREAK:
                 break
+            if code is RETURN:
+                return code
 
     def visit_Break(self, node):
-        raise BreakSignal()
+        return BREAK
 
     def visit_Continue(self, node):
-        raise ContinueSignal()
+        return CONTINUE
 
     # -------- Functions --------
     def visit_FunctionDecl(self, node):
         self.env.define_function(node.name, node)
 
     def visit_FunctionCall(self, node):
-        func = self.env.get_function(node.name)
+        # statically resolved calls skip the walk up the environments
+        func = node.target or self.env.get_function(node.name)
 
         if len(node.args) != len(func.params):
             raise CompilerError(
@@ -96,37 +123,65 @@ class Interpreter:
                 line=node.line
             )
 
+        # arguments are evaluated in the caller's scope
+        args = [self.interpret(arg) for arg in node.args]
+
+        key = None
+        if self.memo is not None and func.pure:
+            key = CallMemo.key(node.name, args)
+            value = self.memo.get(key)
+            if value is not MISSING:
+                return value
+
+        if self.depth >= self.max_depth:
+            raise recursion_limit_error(self.max_depth, node.name, node.line)
+        self.depth += 1
+        caller = self.call
+        self.call = node
+        budget = self.budget
+        if budget is not None:
+            budget.remaining -= 1
+            if budget.remaining <= 0:
+                budget.charge(node.line)
+
         previous_env = self.env
         self.env = Environment(parent=previous_env)
 
         # params = [(type, name), ...]
-        for (_, param_name), arg in zip(func.params, node.args):
-            self.env.define(param_name, self.interpret(arg))
+        for (_, param_name), value in zip(func.params, args):
+            self.env.define(param_name, value)
 
-        try:
-            self.interpret(func.body)
-        except ReturnSignal as r:
-            self.env = previous_env
-            return r.value
+        value = None
+        if self.interpret(func.body) is RETURN:
+            value = self.return_value
+            self.return_value = None
 
         self.env = previous_env
-        return None
+        self.call = caller
+        self.depth -= 1
+        if key is not None:
+            self.memo.put(key, value)
+        return value
 
     def visit_Return(self, node):
-        value = self.interpret(node.expr) if node.expr else None
-        raise ReturnSignal(value)
+        self.return_value = self.interpret(node.expr) if node.expr else None
+        return RETURN
 
     # -------- Expressions --------
     def visit_BinOp(self, node):
         left = self.interpret(node.left)
         right = self.interpret(node.right)
 
-        # Arithmetic
+        # Arithmetic; text goes through the size checks
         if node.op == "PLUS":
+            if type(left) is str:
+                return checked_add(left, right, node.line)
             return left + right
         if node.op == "MINUS":
             return left - right
         if node.op == "MUL":
+            if type(left) is str or type(right) is str:
+                return checked_mul(left, right, node.line)
             return left * right
         if node.op == "DIV":
             return left / right
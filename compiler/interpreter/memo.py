@@ -0,0 +1,63 @@
+# compiler/interpreter/memo.py
+
+from collections import OrderedDict
+
+from compiler.limits import MEMO_ENTRIES
+
+
+# =====================
+# Call memo
+# =====================
+# Results of pure function calls (FunctionDecl.pure, worked out by the
+# SemanticAnalyzer), keyed by function name and arguments. Arguments
+# are keyed with their type so 1, 1.0 and true stay apart. Least
+# recently used entries go first once max_entries is reached, which
+# caps the memory of a single run.
+
+class CallMemo:
+    __slots__ = ("entries", "max_entries", "hits", "misses")
+
+    def __init__(self, max_entries=MEMO_ENTRIES):
+        self.entries = OrderedDict()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(name, args):
+        return (name, tuple((type(value), value) for value in args))
+
+    def get(self, key):
+        # Cached result, or MISSING
+        entries = self.entries
+        if key in entries:
+            entries.move_to_end(key)
+            self.hits += 1
+            return entries[key]
+        self.misses += 1
+        return MISSING
+
+    def put(self, key, value):
+        entries = self.entries
+        entries[key] = value
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+MISSING = object()
+
+
+def new_memo(memoize):
+    # Engine option: False (off), True, or the number of results to keep
+    if not memoize:
+        return None
+    if memoize is True:
+        return CallMemo()
+    return CallMemo(max_entries=memoize)
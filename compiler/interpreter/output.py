@@ -0,0 +1,72 @@
+# compiler/interpreter/output.py
+
+import sys
+import threading
+
+from compiler.errors import LimitExceeded
+
+
+class OutputLimitError(LimitExceeded):
+    pass
+
+
+# =========================
+# Output sinks
+# =========================
+# Where a run's print statements go. Every engine takes an `output`
+# option and calls output.write(text) once per print; nothing touches
+# sys.stdout unless the sink itself does, so runs on different threads
+# never see each other's output.
+
+class StdoutOutput:
+    # Default: the current sys.stdout, looked up on every write so that
+    # contextlib.redirect_stdout keeps working
+    def write(self, text):
+        sys.stdout.write(text)
+
+
+class OutputBuffer:
+    # Collects the output of one run in memory. With max_bytes, the
+    # write that would pass the cap stores what still fits and raises
+    # OutputLimitError (sizes are counted in UTF-8 bytes).
+    def __init__(self, max_bytes=None):
+        self.parts = []
+        self.size = 0
+        self.max_bytes = max_bytes
+
+    def write(self, text):
+        if self.max_bytes is not None:
+            size = len(text.encode("utf-8")) if not text.isascii() else len(text)
+            if self.size + size > self.max_bytes:
+                room = self.max_bytes - self.size
+                self.parts.append(text.encode("utf-8")[:room].decode("utf-8", "ignore"))
+                self.size = self.max_bytes
+                raise OutputLimitError(f"Output limit exceeded ({self.max_bytes} bytes)",
+                                       "output", self.max_bytes)
+            self.size += size
+        self.parts.append(text)
+
+    def getvalue(self):
+        return "".join(self.parts)
+
+
+class StreamOutput(OutputBuffer):
+    # An OutputBuffer that another thread drains while the program runs:
+    # take() returns what was printed since the last take() and forgets
+    # it. The size still counts everything, for max_bytes.
+    def __init__(self, max_bytes=None):
+        super().__init__(max_bytes)
+        self.lock = threading.Lock()
+
+    def write(self, text):
+        with self.lock:
+            super().write(text)
+
+    def take(self):
+        with self.lock:
+            parts, self.parts = self.parts, []
+        return "".join(parts)
+
+
+def new_output(output):
+    return output if output is not None else StdoutOutput()
@@ -0,0 +1,182 @@
+# compiler/interpreter/profiler.py
+
+from time import perf_counter
+
+from compiler.interpreter.interpreter import Interpreter
+from compiler.parser.ast_nodes import Program
+
+
+# =========================
+# Profile
+# =========================
+# What a ProfilingInterpreter measured. Times are seconds:
+#   inclusive  time from entering to leaving, nested work included
+#   exclusive  the same minus the time of the nodes (for lines and
+#              functions: other lines / called functions) inside it
+# Recursion is counted once: the inclusive time of a line or function
+# only grows while it is not already running further up the stack.
+
+class Profile:
+    def __init__(self):
+        self.total = 0.0
+        self.nodes = {}         # node -> [hits, inclusive, exclusive, running now]
+        self.lines = {}         # line -> [hits, inclusive, exclusive]
+        self.functions = {}     # FunctionDecl -> [calls, inclusive, exclusive]
+        self.stacks = {}        # ("<main>", name, ...) -> exclusive
+
+    def report(self, source="", top=20):
+        ms = lambda seconds: round(seconds * 1000, 3)
+        lines = []
+        for number, text in enumerate(source.split("\n"), start=1):
+            hits, inclusive, exclusive = self.lines.get(number, (0, 0.0, 0.0))
+            lines.append({"line": number, "source": text.rstrip("\r"), "hits": hits,
+                          "inclusive_ms": ms(inclusive), "exclusive_ms": ms(exclusive)})
+
+        functions = [
+            {"name": decl.name, "line": decl.line, "calls": calls,
+             "inclusive_ms": ms(inclusive), "exclusive_ms": ms(exclusive)}
+            for decl, (calls, inclusive, exclusive) in self.functions.items()
+        ]
+        functions.sort(key=lambda f: -f["inclusive_ms"])
+
+        nodes = sorted(self.nodes.items(), key=lambda item: -item[1][2])[:top]
+        nodes = [
+            {"node": type(node).__name__, "line": node.line, "hits": hits,
+             "inclusive_ms": ms(inclusive), "exclusive_ms": ms(exclusive)}
+            for node, (hits, inclusive, exclusive, _) in nodes
+        ]
+
+        return {
+            "total_ms": ms(self.total),
+            "listing": self.listing(lines),
+            "lines": lines,
+            "functions": functions,
+            "nodes": nodes,
+            "collapsed": self.collapsed(),
+        }
+
+    def listing(self, lines):
+        # The source with hits and times in front of every line
+        rows = [f"{'hits':>9} {'total ms':>10} {'self ms':>10}  line"]
+        for line in lines:
+            if line["hits"]:
+                rows.append(f"{line['hits']:>9} {line['inclusive_ms']:>10.3f} "
+                            f"{line['exclusive_ms']:>10.3f}  {line['line']:>4}  {line['source']}")
+            else:
+                rows.append(f"{'':>9} {'':>10} {'':>10}  {line['line']:>4}  {line['source']}")
+        return "\n".join(rows)
+
+    def collapsed(self):
+        # "frame;frame;frame microseconds" lines, the input format of
+        # flamegraph.pl, speedscope and most flame graph tools
+        return [
+            f"{';'.join(stack)} {round(seconds * 1_000_000)}"
+            for stack, seconds in sorted(self.stacks.items())
+            if round(seconds * 1_000_000) > 0
+        ]
+
+
+# =========================
+# Profiling Interpreter
+# =========================
+# The tree-walking Interpreter with a timer around every node. All of
+# the bookkeeping lives in this subclass: a plain Interpreter does not
+# pay for it. The timers slow the run down, so absolute times are
+# inflated; where the time goes relative to the rest stays meaningful.
+
+class ProfilingInterpreter(Interpreter):
+    def __init__(self, *args, profile=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.profile = profile if profile is not None else Profile()
+        self.bodies = {}            # function body Block -> FunctionDecl
+        self.children = [0.0]       # time of the finished children, per running node
+        self.lines_running = {}     # line -> nodes on it running right now
+        self.calls_running = {}     # FunctionDecl -> its calls running right now
+        # one frame per running function:
+        # [decl, time in called functions, line it last moved to]
+        self.frames = [[None, 0.0, None]]
+        self.path = ["<main>"]
+
+    def visit_FunctionDecl(self, node):
+        self.bodies[node.body] = node
+        return super().visit_FunctionDecl(node)
+
+    def interpret(self, node):
+        method = getattr(self, f"visit_{type(node).__name__}", None)
+        if not method:
+            raise Exception(f"No execute method for {type(node).__name__}")
+        if type(node) is Program:
+            return self.run_program(method, node)
+
+        node_stats = self.profile.nodes.get(node)
+        if node_stats is None:
+            node_stats = self.profile.nodes[node] = [0, 0.0, 0.0, 0]
+        node_stats[3] += 1
+
+        decl = self.bodies.get(node)
+        if decl is not None:
+            self.frames.append([decl, 0.0, None])
+            self.path.append(decl.name)
+            self.calls_running[decl] = self.calls_running.get(decl, 0) + 1
+
+        # a line is hit when its function moves on to it from another line
+        line = node.line
+        frame = self.frames[-1]
+        entered = line != frame[2]
+        frame[2] = line
+        outermost = not self.lines_running.get(line)
+        self.lines_running[line] = self.lines_running.get(line, 0) + 1
+
+        self.children.append(0.0)
+        start = perf_counter()
+        try:
+            return method(node)
+        finally:
+            elapsed = perf_counter() - start
+            exclusive = elapsed - self.children.pop()
+            self.children[-1] += elapsed
+            self.lines_running[line] -= 1
+
+            node_stats[0] += 1
+            node_stats[3] -= 1
+            if not node_stats[3]:
+                node_stats[1] += elapsed
+            node_stats[2] += exclusive
+
+            stats = self.profile.lines.get(line)
+            if stats is None:
+                stats = self.profile.lines[line] = [0, 0.0, 0.0]
+            if entered:
+                stats[0] += 1
+            if outermost:
+                stats[1] += elapsed
+            stats[2] += exclusive
+
+            if decl is not None:
+                self.leave_function(decl, elapsed)
+
+    def leave_function(self, decl, elapsed):
+        _, callees, _ = self.frames.pop()
+        self.frames[-1][1] += elapsed
+
+        stats = self.profile.functions.get(decl)
+        if stats is None:
+            stats = self.profile.functions[decl] = [0, 0.0, 0.0]
+        stats[0] += 1
+        self.calls_running[decl] -= 1
+        if not self.calls_running[decl]:
+            stats[1] += elapsed
+        stats[2] += elapsed - callees
+
+        stack = tuple(self.path)
+        self.profile.stacks[stack] = self.profile.stacks.get(stack, 0.0) + elapsed - callees
+        self.path.pop()
+
+    def run_program(self, method, node):
+        start = perf_counter()
+        try:
+            return method(node)
+        finally:
+            self.profile.total = perf_counter() - start
+            main = self.profile.total - self.frames[0][1]
+            self.profile.stacks[("<main>",)] = main
@@ -0,0 +1,152 @@
+# compiler/interpreter/slot_interpreter.py
+
+from compiler.interpreter.interpreter import Interpreter, Completion, RETURN
+from compiler.interpreter.memo import CallMemo, MISSING
+from compiler.errors import CompilerError, recursion_limit_error
+
+
+# =====================
+# Frames
+# =====================
+# A scope at run time: a fixed-size list of values, indexed by the
+# slots the SemanticAnalyzer assigned, and the enclosing frame.
+
+class Frame:
+    __slots__ = ("values", "parent")
+
+    def __init__(self, size, parent=None):
+        self.values = [None] * size
+        self.parent = parent
+
+
+class SlotFunction:
+    __slots__ = ("decl", "frame")
+
+    def __init__(self, decl, frame):
+        self.decl = decl
+        self.frame = frame           # frame the function was declared in
+
+
+# =====================
+# Slot Interpreter
+# =====================
+# Tree-walking Interpreter that reads variables by (depth, slot)
+# instead of by name: walk `depth` parents, then index a list. Needs a
+# Program annotated by the SemanticAnalyzer.
+#
+# Function bodies run in a frame on top of the frame where the function
+# was declared (lexical scoping, like the VM), since that is what the
+# static depths describe. Programs where that finds another variable
+# than the language's dynamic scoping (Program.dynamic_scoping, set by
+# the analyzer) run on a plain Interpreter; `fallback_reason` says why.
+
+class SlotInterpreter(Interpreter):
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.frame = Frame(0)        # globals; grows with each declaration
+        self.functions = {}
+        self.fallback_reason = None
+        self.fallback = None
+
+    # -------- Program --------
+    def visit_Program(self, node):
+        if node.dynamic_scoping:
+            self.fallback_reason = node.dynamic_scoping
+            self.fallback = Interpreter(max_depth=self.max_depth, output=self.output,
+                                        budget=self.budget)
+            self.fallback.memo = self.memo
+            return self.fallback.interpret(node)
+        return super().visit_Program(node)
+
+    def visit_Block(self, node):
+        previous = self.frame
+        self.frame = Frame(node.nslots, previous)
+
+        for stmt in node.statements:
+            code = self.interpret(stmt)
+            if code is not None and type(code) is Completion:
+                self.frame = previous
+                return code
+
+        self.frame = previous
+
+    # -------- Statements --------
+    def visit_VarDecl(self, node):
+        value = self.interpret(node.expr)
+        values = self.frame.values
+        if node.slot < len(values):
+            values[node.slot] = value
+        else:
+            values.append(value)
+
+    def visit_Assign(self, node):
+        value = self.interpret(node.expr)
+        frame = self.frame
+        for _ in range(node.depth):
+            frame = frame.parent
+        frame.values[node.slot] = value
+
+    # -------- Functions --------
+    def visit_FunctionDecl(self, node):
+        self.functions[node.name] = SlotFunction(node, self.frame)
+
+    def visit_FunctionCall(self, node):
+        func = self.functions.get(node.name)
+        if func is None:
+            raise Exception(f"Undefined function '{node.name}'")
+
+        params = func.decl.params
+        if len(node.args) != len(params):
+            raise CompilerError(
+                f"Function '{node.name}' expects {len(params)} arguments, "
+                f"got {len(node.args)}",
+                line=node.line
+            )
+
+        # parameters take slots 0..n-1 of the function frame
+        frame = Frame(0, func.frame)
+        frame.values = [self.interpret(arg) for arg in node.args]
+
+        key = None
+        if self.memo is not None and func.decl.pure:
+            key = CallMemo.key(node.name, frame.values)
+            value = self.memo.get(key)
+            if value is not MISSING:
+                return value
+
+        if self.depth >= self.max_depth:
+            raise recursion_limit_error(self.max_depth, node.name, node.line)
+        self.depth += 1
+        caller = self.call
+        self.call = node
+        budget = self.budget
+        if budget is not None:
+            budget.remaining -= 1
+            if budget.remaining <= 0:
+                budget.charge(node.line)
+
+        previous = self.frame
+        self.frame = frame
+
+        value = None
+        if self.interpret(func.decl.body) is RETURN:
+            value = self.return_value
+            self.return_value = None
+
+        self.frame = previous
+        self.call = caller
+        self.depth -= 1
+        if key is not None:
+            self.memo.put(key, value)
+        return value
+
+    # -------- Expressions --------
+    def visit_Var(self, node):
+        depth = node.depth
+        if depth == 0:
+            return self.frame.values[node.slot]
+        frame = self.frame.parent
+        while depth > 1:
+            frame = frame.parent
+            depth -= 1
+        return frame.values[node.slot]
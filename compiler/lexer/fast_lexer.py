@@ -0,0 +1,134 @@
+# compiler/lexer/fast_lexer.py
+
+import re
+
+from compiler.lexer.tokens import *
+from compiler.lexer.lexer import Lexer, Token
+
+
+# =========================
+# Master regex
+# =========================
+# Leading blanks are folded into every match; each alternative is one
+# token class. Everything here is plain ASCII: input the regex does not
+# recognise (non-ASCII identifiers, illegal characters, unterminated
+# literals) is handed to the per-character Lexer, so tokens and error
+# messages stay exactly the same.
+
+TOKEN_RE = re.compile(r"""
+    [\ \t]*
+    (?:
+        (?P<nl>\n[\ \t\n]*)
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+      | (?P<op>==|!=|<=|>=|&&|\|\||[-+*/%=<>!;,(){}])
+      | (?P<num>[0-9]+(?:\.[0-9]*)?)
+      | "(?P<str>[^"]*)"
+      | '(?P<chr>.)'
+    )
+""", re.VERBOSE | re.DOTALL)
+
+BLANKS_RE = re.compile(r"[ \t]*")
+
+OPERATOR_TOKENS = {**DOUBLE_CHAR_TOKENS, **SINGLE_CHAR_TOKENS}
+
+
+# =========================
+# Fast Lexer
+# =========================
+# Drop-in replacement for Lexer: same Token stream and line numbers,
+# but one regex match per token instead of one advance() per character.
+
+class FastLexer(Lexer):
+
+    def get_next_token(self):
+        tokens = []
+        self.read_tokens(tokens, 1)
+        return tokens[0]
+
+    def tokenize(self):
+        # Whole remaining input, EOF token included
+        tokens = []
+        self.read_tokens(tokens, None)
+        return tokens
+
+    def read_tokens(self, tokens, limit):
+        source = self.source
+        length = len(source)
+        match = TOKEN_RE.match
+        operators = OPERATOR_TOKENS
+        keywords = KEYWORDS
+
+        append = tokens.append
+        pos = self.pos
+        line = self.line
+
+        while limit is None or len(tokens) < limit:
+            m = match(source, pos)
+
+            if m is None:
+                self.pos, self.line = pos, line
+                # end of buffered input or a literal that may continue (a
+                # string up to its closing quote, a char literal for at
+                # most the two characters after its quote)
+                start = BLANKS_RE.match(source, pos).end()
+                if (start >= length or source[start] == '"'
+                        or (source[start] == "'" and length - start < 3)) and self.refill():
+                    source = self.source
+                    length = len(source)
+                    pos = self.pos
+                    continue
+                if pos >= length:
+                    self.current_char = None
+                    append(Token(EOF, None, line))
+                    break
+                append(self.slow_token())
+                pos, line = self.pos, self.line
+                if tokens[-1].type == EOF:
+                    break
+                continue
+
+            kind = m.lastgroup
+            end = m.end()
+
+            if kind == "nl":
+                line += source.count("\n", m.start(kind), end)
+                pos = end
+                continue
+
+            if kind == "op":
+                text = m.group(kind)
+                append(Token(operators[text], text, line))
+
+            elif kind == "name" or kind == "num":
+                # identifiers/numbers may continue with non-ASCII characters
+                if end < length and source[end] >= "\x80":
+                    self.pos, self.line = m.start(kind), line
+                    append(self.slow_token())
+                    pos = self.pos
+                    continue
+                text = m.group(kind)
+                if kind == "name":
+                    append(Token(keywords.get(text, IDENTIFIER), text, line))
+                elif "." in text:
+                    append(Token(FLOAT_LIT, float(text), line))
+                else:
+                    append(Token(INT_LIT, int(text), line))
+
+            elif kind == "str":
+                append(Token(STRING_LIT, m.group(kind), line))
+
+            else:
+                append(Token(CHAR_LIT, m.group(kind), line))
+
+            pos = end
+
+        self.pos, self.line = pos, line
+
+    def refill(self):
+        # Whole source is in memory; StreamLexer reads more here
+        return False
+
+    def slow_token(self):
+        # Fall back to the per-character scanner for a single token
+        self.current_char = self.source[self.pos] if self.pos < len(self.source) else None
+        return Lexer.get_next_token(self)
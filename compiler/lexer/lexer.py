@@ -1,6 +1,8 @@
 from compiler.lexer.tokens import *
 
 class Token:
+    __slots__ = ("type", "value", "line")
+
     def __init__(self, type_, value=None, line=1):
         self.type = type_
         self.value = value
@@ -16,6 +18,7 @@ class Lexer:
         self.pos = 0
         self.line = 1
         self.current_char = source[self.pos] if source else None
+        self.pending_error = None
 
     # ------------------
     # Utilities
@@ -139,17 +142,31 @@ class Lexer:
             char = self.current_char
             self.advance()
 
-            single_char_tokens = {
-                "+": PLUS, "-": MINUS, "*": MUL, "/": DIV, "%": MOD,
-                "=": ASSIGN, "<": LT, ">": GT, "!": NOT,
-                ";": SEMICOLON, ",": COMMA,
-                "(": LPAREN, ")": RPAREN,
-                "{": LBRACE, "}": RBRACE
-            }
-
-            if char in single_char_tokens:
-                return Token(single_char_tokens[char], char, self.line)
+            if char in SINGLE_CHAR_TOKENS:
+                return Token(SINGLE_CHAR_TOKENS[char], char, self.line)
 
             raise Exception(f"Illegal character '{char}' at line {self.line}")
 
         return Token(EOF, None, self.line)
+
+    def scan(self, limit):
+        # Up to `limit` tokens; a chunk ending in EOF is the last one.
+        # A lexing error is held back until the tokens before it are used.
+        if self.pending_error:
+            raise self.pending_error
+
+        tokens = []
+        try:
+            self.read_tokens(tokens, limit)
+        except Exception as e:
+            if not tokens:
+                raise
+            self.pending_error = e
+        return tokens
+
+    def read_tokens(self, tokens, limit):
+        while len(tokens) < limit:
+            tok = self.get_next_token()
+            tokens.append(tok)
+            if tok.type == EOF:
+                break
@@ -0,0 +1,62 @@
+# compiler/lexer/stream_lexer.py
+
+import codecs
+
+from compiler.lexer.fast_lexer import FastLexer
+
+
+# Characters requested from the underlying stream per read
+STREAM_CHUNK = 64 * 1024
+
+
+# =========================
+# Stream Lexer
+# =========================
+# FastLexer over a file object or an iterator of str/bytes chunks.
+# Only a window of whole lines is kept in memory: consumed text is
+# dropped on every refill, and the window always ends on a newline
+# (or the end of the stream) so no token is cut in half except
+# literals, which make FastLexer ask for more input. Strings may span
+# lines, so an unterminated one reads up to the end of the stream; a
+# char literal ('\n' included) ends by the next line, so an invalid or
+# unterminated one fails there.
+
+class StreamLexer(FastLexer):
+    def __init__(self, stream, chunk_size=STREAM_CHUNK):
+        super().__init__("")
+        if hasattr(stream, "read"):
+            self.chunks = iter(lambda: stream.read(chunk_size), stream.read(0))
+        else:
+            self.chunks = iter(stream)
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.pending = ""         # text read past the last newline
+        self.exhausted = False
+        self.refill()
+
+    def read_chunk(self):
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.exhausted = True
+            return self.decoder.decode(b"", final=True)
+        if isinstance(chunk, bytes):
+            return self.decoder.decode(chunk)
+        return chunk
+
+    def refill(self):
+        if self.exhausted:
+            return False
+
+        text = self.pending
+        while not self.exhausted:
+            text += self.read_chunk()
+            cut = text.rfind("\n") + 1
+            if cut:
+                text, self.pending = text[:cut], text[cut:]
+                break
+        else:
+            self.pending = ""
+
+        self.source = self.source[self.pos:] + text
+        self.pos = 0
+        self.current_char = self.source[0] if self.source else None
+        return True
@@ -105,6 +105,29 @@ RPAREN = "RPAREN"         # )
 LBRACE = "LBRACE"         # {
 RBRACE = "RBRACE"         # }
 
+# =========================
+# OPERATOR LOOKUP TABLES
+# =========================
+
+DOUBLE_CHAR_TOKENS = {
+    "==": EQ, "!=": NEQ, "<=": LE, ">=": GE,
+    "&&": AND, "||": OR,
+}
+
+SINGLE_CHAR_TOKENS = {
+    "+": PLUS, "-": MINUS, "*": MUL, "/": DIV, "%": MOD,
+    "=": ASSIGN, "<": LT, ">": GT, "!": NOT,
+    ";": SEMICOLON, ",": COMMA,
+    "(": LPAREN, ")": RPAREN,
+    "{": LBRACE, "}": RBRACE
+}
+
+# Token type -> source text, for messages (analyzer errors, optimizer reports)
+OPERATOR_TEXT = {
+    token: text
+    for text, token in {**SINGLE_CHAR_TOKENS, **DOUBLE_CHAR_TOKENS}.items()
+}
+
 # =========================
 # SPECIAL
 # =========================
@@ -0,0 +1,35 @@
+# compiler/limits.py
+
+# =========================
+# Execution limits
+# =========================
+
+# Deepest chain of user function calls an engine allows. Tail calls in
+# the VM reuse their frame and do not count.
+MAX_CALL_DEPTH = 100000
+
+# The tree, slots and closure engines recurse in Python, 8 to 20 Python
+# frames per user call, and stop at this depth instead; execute() raises
+# Python's recursion limit to PYTHON_RECURSION_LIMIT so they get there.
+# The python engine uses one Python frame per call, so that limit puts
+# it close to MAX_CALL_DEPTH.
+PYTHON_CALL_DEPTH = 5000
+PYTHON_RECURSION_LIMIT = MAX_CALL_DEPTH + 1000
+
+# Results kept per run when pure function calls are memoized
+MEMO_ENTRIES = 10000
+
+# Most output a /run request may produce, in bytes
+MAX_OUTPUT_BYTES = 1_000_000
+
+# Longest string one value may hold, in characters; + and * on text
+# stop with a "memory" limit past it
+MAX_STRING_LENGTH = 10_000_000
+
+# Default budgets of a /run request; a request may ask for less.
+# Steps are loop iterations plus function calls.
+MAX_STEPS = 10_000_000
+MAX_SECONDS = 5.0
+
+# Steps between two real budget checks (step total and clock)
+BUDGET_CHECK_INTERVAL = 1000
@@ -0,0 +1,141 @@
+# compiler/optimizer/inliner.py
+
+from compiler.parser.ast_nodes import *
+from compiler.optimizer.transformer import (
+    Transformer, walk_statements, walk_expression, statement_expressions,
+)
+from compiler.optimizer.source import expression_source
+
+
+# Largest return expression (in AST nodes) that gets inlined
+INLINE_SIZE = 12
+
+
+# =========================
+# Inliner
+# =========================
+# Replaces calls to small functions by their body:
+#
+#     int sq(int x) { return x * x; }     print(sq(i));  ->  print(i * i);
+#
+# A function is inlined when
+#   - it is declared at the top level (so it exists wherever it can be called)
+#   - its body is a single `return <expr>` of at most max_size nodes
+#   - the expression reads nothing but its parameters
+#   - it only calls functions that are inlined too
+#   - it cannot reach itself through calls
+# and, at each call site, every argument is a literal or a variable, or
+# is used exactly once and cannot raise (so dropping, duplicating or
+# moving it is invisible). The declaration stays for other callers.
+
+class Inliner(Transformer):
+    def __init__(self, max_size=INLINE_SIZE):
+        super().__init__()
+        self.max_size = max_size
+        self.inlinable = {}       # name -> FunctionDecl
+        self.inlined = []         # (line, call text, function name)
+
+    def transform(self, program):
+        self.find_inlinable(program.statements)
+        return super().transform(program)
+
+    # -------- Candidates --------
+    def find_inlinable(self, statements):
+        calls = {}                # function name -> names it calls
+        for node in walk_statements(statements):
+            if isinstance(node, FunctionDecl):
+                calls[node.name] = {
+                    sub.name
+                    for stmt in walk_statements([node.body])
+                    for expr in statement_expressions(stmt)
+                    for sub in walk_expression(expr)
+                    if type(sub) is FunctionCall
+                }
+
+        for node in statements:
+            if not isinstance(node, FunctionDecl):
+                continue
+            body = node.body.statements
+            if len(body) != 1 or not isinstance(body[0], Return) or body[0].expr is None:
+                continue
+
+            expr = body[0].expr
+            params = {pname for _, pname in node.params}
+            nodes = list(walk_expression(expr))
+            if len(nodes) > self.max_size:
+                continue
+            if any(type(sub) is Var and sub.name not in params for sub in nodes):
+                continue
+            if reaches(node.name, calls):
+                continue
+            self.inlinable[node.name] = node
+
+        # A call left in the body would run in the caller and, with
+        # dynamic scoping, see the caller's variables: only calls to
+        # functions that are inlinable themselves may stay
+        changed = True
+        while changed:
+            changed = False
+            for name in list(self.inlinable):
+                if not calls[name] <= self.inlinable.keys():
+                    del self.inlinable[name]
+                    changed = True
+
+    # -------- Call sites --------
+    def expr(self, node):
+        node = super().expr(node)
+        if type(node) is not FunctionCall or node.name not in self.inlinable:
+            return node
+
+        decl = self.inlinable[node.name]
+        body = decl.body.statements[0].expr
+        uses = {}
+        for sub in walk_expression(body):
+            if type(sub) is Var:
+                uses[sub.name] = uses.get(sub.name, 0) + 1
+
+        bindings = {}
+        for (_, pname), arg in zip(decl.params, node.args):
+            if type(arg) not in (Literal, Var):
+                if uses.get(pname, 0) != 1 or not self.cannot_raise(arg):
+                    return node
+            bindings[pname] = arg
+
+        inlined = substitute(body, bindings, node.line)
+        self.inlined.append((node.line, expression_source(node), decl.name))
+        self.note(node.line, f"inlined {expression_source(node)} -> {expression_source(inlined)}")
+
+        # the body may call other inlinable functions
+        return self.expr(inlined)
+
+
+def reaches(name, calls):
+    # Can `name` call itself, directly or through other functions?
+    seen = set()
+    stack = list(calls.get(name, ()))
+    while stack:
+        callee = stack.pop()
+        if callee == name:
+            return True
+        if callee not in seen:
+            seen.add(callee)
+            stack.extend(calls.get(callee, ()))
+    return False
+
+
+def substitute(node, bindings, line):
+    # Copy of an expression with parameters replaced by argument copies;
+    # every node gets the line of the call site.
+    kind = type(node)
+    if kind is Var:
+        return substitute(bindings[node.name], {}, line) if node.name in bindings else Var(node.name, line)
+    if kind is Literal:
+        return Literal(node.value, line)
+    if kind is BinOp:
+        return BinOp(substitute(node.left, bindings, line), node.op,
+                     substitute(node.right, bindings, line), line)
+    if kind is UnaryOp:
+        return UnaryOp(node.op, substitute(node.expr, bindings, line), line)
+    if kind is FunctionCall:
+        return FunctionCall(node.name, [substitute(arg, bindings, line) for arg in node.args], line)
+    return node
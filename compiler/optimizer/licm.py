@@ -0,0 +1,233 @@
+# compiler/optimizer/licm.py
+
+from compiler.parser.ast_nodes import *
+from compiler.optimizer.transformer import (
+    Transformer, walk_statements, walk_expression, statement_expressions,
+)
+from compiler.optimizer.source import expression_source
+
+
+TEMP_PREFIX = "licm$"     # "$" cannot appear in a source identifier
+
+
+# =========================
+# Side effects of functions
+# =========================
+# For every FunctionDecl in a program: the variables it may assign
+# (directly or through calls) and whether it is pure, i.e. does not
+# print and neither reads nor writes anything but its own parameters
+# and locals. Functions see their caller's variables (dynamic scoping),
+# so any assignment to a name that is not local may hit a loop variable.
+
+class FunctionEffects:
+    def __init__(self, program):
+        self.decls = {}
+        self.writes = {}          # name -> set of names it may assign
+        self.calls = {}           # name -> set of functions it calls
+        self.impure = set()
+
+        self.collect(program.statements)
+        for name, decl in self.decls.items():
+            self.scan(name, decl)
+        self.propagate()
+
+    def collect(self, statements):
+        for node in walk_statements(statements):
+            if isinstance(node, FunctionDecl):
+                self.decls[node.name] = node
+
+    def scan(self, name, decl):
+        writes = self.writes[name] = set()
+        calls = self.calls[name] = set()
+        scopes = [{pname for _, pname in decl.params}]
+        impure = False
+
+        def local(var):
+            return any(var in scope for scope in scopes)
+
+        def expression(node):
+            nonlocal impure
+            for sub in walk_expression(node):
+                if type(sub) is Var and not local(sub.name):
+                    impure = True
+                elif type(sub) is FunctionCall:
+                    calls.add(sub.name)
+
+        def statements(nodes):
+            nonlocal impure
+            for node in nodes:
+                if isinstance(node, Block):
+                    scopes.append(set())
+                    statements(node.statements)
+                    scopes.pop()
+                elif isinstance(node, VarDecl):
+                    expression(node.expr)
+                    scopes[-1].add(node.name)
+                elif isinstance(node, Assign):
+                    expression(node.expr)
+                    writes.add(node.name)
+                    if not local(node.name):
+                        impure = True
+                elif isinstance(node, Print):
+                    expression(node.expr)
+                    impure = True
+                elif isinstance(node, If):
+                    expression(node.condition)
+                    statements([node.then_block])
+                    if node.else_block:
+                        statements([node.else_block])
+                elif isinstance(node, While):
+                    expression(node.condition)
+                    statements([node.body])
+                elif isinstance(node, Return):
+                    if node.expr:
+                        expression(node.expr)
+                elif isinstance(node, FunctionDecl):
+                    impure = True         # defines a function at run time
+                elif not isinstance(node, (Break, Continue)):
+                    expression(node)
+
+        statements([decl.body])
+        if impure:
+            self.impure.add(name)
+
+    def propagate(self):
+        # Fixpoint over the call graph (recursion keeps a function pure)
+        changed = True
+        while changed:
+            changed = False
+            for name, callees in self.calls.items():
+                for callee in callees:
+                    if callee not in self.decls:
+                        continue
+                    if not self.writes[callee] <= self.writes[name]:
+                        self.writes[name] |= self.writes[callee]
+                        changed = True
+                    if callee in self.impure and name not in self.impure:
+                        self.impure.add(name)
+                        changed = True
+
+    def is_pure(self, name):
+        return name in self.decls and name not in self.impure
+
+
+# =========================
+# Loop-invariant code motion
+# =========================
+# Moves expressions that give the same value on every iteration of a
+# while loop into temporaries declared just before it:
+#
+#     while (i < n * 2) { ... }   ->   int licm$0 = n * 2;
+#                                      while (i < licm$0) { ... }
+#
+# An expression is invariant when none of its variables is declared or
+# assigned in the loop (also not by any function the loop calls) and
+# its calls are to pure functions. The condition runs at least once,
+# so any invariant part of it moves, unless it can raise and an impure
+# call comes before it (the call's effects must happen first). The
+# body may run zero times, so from there only expressions that cannot
+# raise move: no calls, no / or %, and arithmetic or ordering only on
+# int / float operands that hold a value (see MissingValues).
+# Inner loops are handled first; their temporaries can move further out.
+
+class LoopInvariantMotion(Transformer):
+    def __init__(self):
+        super().__init__()
+        self.effects = None
+        self.temps = 0
+
+    def transform(self, program):
+        self.effects = FunctionEffects(program)
+        return super().transform(program)
+
+    def visit_While(self, node):
+        condition = self.expr(node.condition)
+        body = self.block(node.body)       # fresh copy: rewritten in place
+
+        changed = set()
+        for stmt in walk_statements(body.statements):
+            if isinstance(stmt, (VarDecl, Assign)):
+                changed.add(stmt.name)
+            elif isinstance(stmt, FunctionDecl):
+                changed.update(name for _, name in stmt.params)
+            for expr in statement_expressions(stmt):
+                self.add_call_writes(expr, changed)
+        self.add_call_writes(condition, changed)
+
+        hoisted = {}                       # expression text -> temporary
+        decls = []
+        effects_before = False             # an impure call ran earlier in the condition
+
+        def hoist(expr, in_condition):
+            nonlocal effects_before
+            if type(expr) in (Literal, Var):
+                return expr
+            if (self.is_invariant(expr, changed, in_condition)
+                    and ((in_condition and not effects_before) or self.cannot_raise(expr))):
+                var_type = self.expression_type(expr)
+                if var_type is not None:
+                    text = expression_source(expr)
+                    temp = hoisted.get(text)
+                    if temp is None:
+                        temp = hoisted[text] = f"{TEMP_PREFIX}{self.temps}"
+                        self.temps += 1
+                        self.types[-1][temp] = var_type
+                        if self.values.may_miss(expr):
+                            self.values.vars.add(temp)
+                        decls.append(VarDecl(var_type, temp, expr, node.line))
+                        self.note(expr.line, f"hoisted {text} out of the loop at "
+                                             f"line {node.line} as {temp}")
+                    return Var(temp, expr.line)
+
+            kind = type(expr)
+            if kind is BinOp:
+                expr.left = hoist(expr.left, in_condition)
+                expr.right = hoist(expr.right, in_condition)
+            elif kind is UnaryOp:
+                expr.expr = hoist(expr.expr, in_condition)
+            elif kind is FunctionCall:
+                expr.args = [hoist(arg, in_condition) for arg in expr.args]
+                if not self.effects.is_pure(expr.name):
+                    effects_before = True
+            return expr
+
+        condition = hoist(condition, True)
+        self.hoist_statements(body.statements, lambda expr: hoist(expr, False))
+
+        loop = While(condition, body, node.line)
+        return decls + [loop] if decls else loop
+
+    def hoist_statements(self, statements, hoist):
+        for i, stmt in enumerate(statements):
+            if isinstance(stmt, (VarDecl, Assign, Print)):
+                stmt.expr = hoist(stmt.expr)
+            elif isinstance(stmt, If):
+                stmt.condition = hoist(stmt.condition)
+                self.hoist_statements(stmt.then_block.statements, hoist)
+                if stmt.else_block:
+                    self.hoist_statements(stmt.else_block.statements, hoist)
+            elif isinstance(stmt, While):
+                stmt.condition = hoist(stmt.condition)
+                self.hoist_statements(stmt.body.statements, hoist)
+            elif isinstance(stmt, Block):
+                self.hoist_statements(stmt.statements, hoist)
+            elif isinstance(stmt, Return):
+                if stmt.expr:
+                    stmt.expr = hoist(stmt.expr)
+            elif not isinstance(stmt, (Break, Continue, FunctionDecl)):
+                statements[i] = hoist(stmt)
+
+    # -------- Analysis --------
+    def add_call_writes(self, expr, changed):
+        for sub in walk_expression(expr):
+            if type(sub) is FunctionCall:
+                changed.update(self.effects.writes.get(sub.name, ()))
+
+    def is_invariant(self, expr, changed, allow_calls):
+        for sub in walk_expression(expr):
+            kind = type(sub)
+            if kind is Var and sub.name in changed:
+                return False
+            if kind is FunctionCall and not (allow_calls and self.effects.is_pure(sub.name)):
+                return False
+        return True
@@ -0,0 +1,190 @@
+# compiler/optimizer/optimizer.py
+
+from functools import partial
+
+from compiler.parser.ast_nodes import *
+from compiler.interpreter.closure_compiler import BINARY_OPERATORS, UNARY_OPERATORS
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.optimizer.source import expression_source, literal_source
+from compiler.optimizer.transformer import Transformer
+from compiler.optimizer.licm import LoopInvariantMotion
+from compiler.optimizer.inliner import Inliner, INLINE_SIZE
+
+
+# Longest string a fold may produce ("x" * 100000 stays a run-time job)
+MAX_FOLDED_STRING = 1024
+
+TERMINATORS = (Return, Break, Continue)
+
+
+def contains_function(node):
+    # Does a subtree declare a function? Such code is kept even when
+    # unreachable: the analyzer's function table is global.
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, FunctionDecl):
+            return True
+        if isinstance(node, (Program, Block)):
+            stack.extend(node.statements)
+        elif isinstance(node, If):
+            stack.append(node.then_block)
+            if node.else_block:
+                stack.append(node.else_block)
+        elif isinstance(node, While):
+            stack.append(node.body)
+    return False
+
+
+# =========================
+# Optimizer
+# =========================
+# Rewrites an analysed Program into a new, simpler one:
+#   - folds BinOp / UnaryOp nodes whose operands are literals
+#   - simplifies x * 1, 1 * x and x - 0 for int / float x holding a value
+#   - drops if / while branches with a constant condition, and
+#     statements after return / break / continue
+# Every change is recorded in `changes`.
+#
+# Nothing that can fail at run time is folded away: division by zero,
+# type errors and operands with calls all stay in the tree. Both sides
+# of && and || are always evaluated, so only literal pairs fold.
+
+class Optimizer(Transformer):
+    # -------- Statements --------
+    def statements(self, statements):
+        result = []
+        for i, stmt in enumerate(statements):
+            new = self.statement(stmt)
+            if new is None:
+                continue
+            if type(new) is list:
+                result.extend(new)
+            else:
+                result.append(new)
+
+            if isinstance(stmt, TERMINATORS):
+                dead = statements[i + 1:]
+                if dead:
+                    kept = [s for s in dead if contains_function(s)]
+                    if len(kept) < len(dead):
+                        self.note(dead[0].line, "removed unreachable code after "
+                                                f"{type(stmt).__name__.lower()}")
+                    result.extend(self.statements(kept))
+                break
+        return result
+
+    def inline_block(self, node):
+        # Statements of a block that replaces its parent statement;
+        # only spliced when it declares nothing that needs a scope.
+        if any(isinstance(s, (VarDecl, FunctionDecl)) for s in node.statements):
+            return node
+        return node.statements
+
+    def visit_If(self, node):
+        condition = self.expr(node.condition)
+
+        if type(condition) is Literal and not contains_function(node):
+            if condition.value:
+                self.note(node.line, "condition is always true, kept only the then branch")
+                return self.inline_block(self.block(node.then_block))
+            if node.else_block:
+                self.note(node.line, "condition is always false, kept only the else branch")
+                return self.inline_block(self.block(node.else_block))
+            self.note(node.line, "condition is always false, removed the if statement")
+            return None
+
+        then_block = self.block(node.then_block)
+        else_block = self.block(node.else_block) if node.else_block else None
+        return If(condition, then_block, else_block, node.line)
+
+    def visit_While(self, node):
+        condition = self.expr(node.condition)
+
+        if type(condition) is Literal and not condition.value and not contains_function(node):
+            self.note(node.line, "condition is always false, removed the loop")
+            return None
+
+        return While(condition, self.block(node.body), node.line)
+
+    # -------- Expressions --------
+    def expr(self, node):
+        kind = type(node)
+
+        if kind is BinOp:
+            left = self.expr(node.left)
+            right = self.expr(node.right)
+            folded = self.fold_binary(node, left, right)
+            if folded is not None:
+                return folded
+            return BinOp(left, node.op, right, node.line)
+
+        if kind is UnaryOp:
+            expr = self.expr(node.expr)
+            if type(expr) is Literal:
+                try:
+                    value = UNARY_OPERATORS[node.op](expr.value)
+                except Exception:
+                    pass
+                else:
+                    # a plain negative literal is not worth a report line
+                    if node.op == "NOT" or type(expr.value) is bool:
+                        self.note(node.line, f"folded {expression_source(UnaryOp(node.op, expr, node.line))}"
+                                             f" -> {literal_source(value)}")
+                    return Literal(value, node.line)
+            return UnaryOp(node.op, expr, node.line)
+
+        return super().expr(node)
+
+    def fold_binary(self, node, left, right):
+        before = BinOp(left, node.op, right, node.line)
+
+        if type(left) is Literal and type(right) is Literal:
+            try:
+                value = BINARY_OPERATORS[node.op](left.value, right.value)
+            except Exception:
+                # e.g. division by zero: keep it for the run-time error
+                return None
+            if isinstance(value, str) and len(value) > MAX_FOLDED_STRING:
+                return None
+            self.note(node.line, f"folded {expression_source(before)} -> {literal_source(value)}")
+            return Literal(value, node.line)
+
+        # Identities, only for int / float operands sure to hold a value
+        # (see MissingValues). x + 0 is left alone: an int variable may
+        # hold -0.0, and -0.0 + 0 is 0.0.
+        identity = None
+        if node.op == "MUL":
+            if is_int(right, 1) and self.holds_number(left):
+                identity = left
+            elif is_int(left, 1) and self.holds_number(right):
+                identity = right
+        elif node.op == "MINUS":
+            if is_int(right, 0) and self.holds_number(left):
+                identity = left
+
+        if identity is not None:
+            self.note(node.line, f"simplified {expression_source(before)} -> "
+                                 f"{expression_source(identity)}")
+        return identity
+
+
+def is_int(node, value):
+    return type(node) is Literal and type(node.value) is int and node.value == value
+
+
+def default_passes(inline_size=INLINE_SIZE):
+    # Passes run by optimize_program, in order
+    return [partial(Inliner, max_size=inline_size), Optimizer, LoopInvariantMotion]
+
+
+def optimize_program(program, passes=None):
+    # Optimized copy of an analysed Program, re-analysed so that slot
+    # annotations match the new tree, and the list of changes.
+    changes = []
+    for make_pass in passes or default_passes():
+        optimizer = make_pass()
+        program = optimizer.transform(program)
+        changes.extend(optimizer.changes)
+    SemanticAnalyzer().analyze(program)
+    return program, changes
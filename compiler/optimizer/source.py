@@ -0,0 +1,31 @@
+# compiler/optimizer/source.py
+
+from compiler.parser.ast_nodes import *
+from compiler.lexer.tokens import OPERATOR_TEXT
+
+
+def literal_source(value):
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, str):
+        return f"'{value}'" if len(value) == 1 else f'"{value}"'
+    return repr(value)
+
+
+def expression_source(node):
+    # Short CogniCode text of an expression (fully parenthesised)
+    kind = type(node)
+    if kind is Literal:
+        return literal_source(node.value)
+    if kind is Var:
+        return node.name
+    if kind is BinOp:
+        return (f"({expression_source(node.left)} {OPERATOR_TEXT[node.op]} "
+                f"{expression_source(node.right)})")
+    if kind is UnaryOp:
+        return f"{OPERATOR_TEXT[node.op]}{expression_source(node.expr)}"
+    if kind is FunctionCall:
+        return f"{node.name}({', '.join(expression_source(a) for a in node.args)})"
+    return type(node).__name__
@@ -0,0 +1,295 @@
+# compiler/optimizer/transformer.py
+
+from compiler.parser.ast_nodes import *
+from compiler.lexer.tokens import INT, FLOAT, BOOL, CHAR, STRING
+
+
+ARITHMETIC = ("PLUS", "MINUS", "MUL", "DIV", "MOD")
+ORDERING = ("LT", "GT", "LE", "GE")
+COMPARISONS = ORDERING + ("EQ", "NEQ")
+
+
+def walk_statements(statements):
+    # Every statement node below a statement list (not into expressions)
+    stack = list(statements)
+    while stack:
+        node = stack.pop()
+        yield node
+        if isinstance(node, Block):
+            stack.extend(node.statements)
+        elif isinstance(node, If):
+            stack.append(node.then_block)
+            if node.else_block:
+                stack.append(node.else_block)
+        elif isinstance(node, While):
+            stack.append(node.body)
+        elif isinstance(node, FunctionDecl):
+            stack.append(node.body)
+
+
+def walk_expression(node):
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        kind = type(node)
+        if kind is BinOp:
+            stack.append(node.left)
+            stack.append(node.right)
+        elif kind is UnaryOp:
+            stack.append(node.expr)
+        elif kind is FunctionCall:
+            stack.extend(node.args)
+
+
+def statement_expressions(node):
+    # Expressions evaluated directly by a statement
+    if isinstance(node, (VarDecl, Assign, Print)):
+        return [node.expr]
+    if isinstance(node, (If, While)):
+        return [node.condition]
+    if isinstance(node, Return):
+        return [node.expr] if node.expr else []
+    if isinstance(node, (Block, Break, Continue, FunctionDecl)):
+        return []
+    return [node]
+
+
+def always_returns(statements):
+    # Does every path through a statement list end in `return <expr>`?
+    for stmt in statements:
+        if isinstance(stmt, Return):
+            return stmt.expr is not None
+        if isinstance(stmt, Block) and always_returns(stmt.statements):
+            return True
+        if (isinstance(stmt, If) and stmt.else_block
+                and always_returns([stmt.then_block]) and always_returns([stmt.else_block])):
+            return True
+    return False
+
+
+# =========================
+# Missing values
+# =========================
+# Declared types do not promise a value: a function that can end
+# without `return <expr>` gives None whatever its return type, and the
+# None travels through assignments and arguments. Tracked by name over
+# the whole program (functions see their caller's variables).
+
+class MissingValues:
+    def __init__(self, program):
+        self.vars = set()         # variables that may hold no value
+        self.functions = set()    # functions that may return none
+        self.known = set()        # all declared functions
+
+        decls = []
+        flows = []                # (variable, expression stored in it)
+        calls = []
+        for node in walk_statements(program.statements):
+            if isinstance(node, FunctionDecl):
+                decls.append(node)
+                self.known.add(node.name)
+                if not always_returns(node.body.statements):
+                    self.functions.add(node.name)
+            elif isinstance(node, (VarDecl, Assign)):
+                flows.append((node.name, node.expr))
+            for expr in statement_expressions(node):
+                calls.extend(sub for sub in walk_expression(expr) if type(sub) is FunctionCall)
+
+        returns = []              # (function, returned expression)
+        for decl in decls:
+            returns.extend((decl.name, stmt.expr) for stmt in walk_statements([decl.body])
+                           if isinstance(stmt, Return) and stmt.expr)
+            for call in calls:
+                if call.name == decl.name:
+                    flows.extend((pname, arg) for (_, pname), arg in zip(decl.params, call.args))
+
+        changed = True
+        while changed:
+            changed = False
+            for names, pairs in ((self.vars, flows), (self.functions, returns)):
+                for name, expr in pairs:
+                    if name not in names and self.may_miss(expr):
+                        names.add(name)
+                        changed = True
+
+    def may_miss(self, expr):
+        for sub in walk_expression(expr):
+            kind = type(sub)
+            if kind is Var and sub.name in self.vars:
+                return True
+            if kind is FunctionCall and (sub.name in self.functions or sub.name not in self.known):
+                return True
+        return False
+
+
+# =========================
+# Transformer
+# =========================
+# Base class of the optimizer passes: copies a tree node by node,
+# tracking the declared type of every visible variable. Passes
+# override the visitors they care about. The input tree is never
+# modified (it may be shared through the ProgramCache).
+#
+# A statement visitor returns a new node, a list of statements to
+# splice in its place, or None to drop the statement.
+
+class Transformer:
+    def __init__(self):
+        self.changes = []
+        self.types = [{}]         # declared variable types, per scope
+        self.functions = {}       # name -> FunctionDecl seen so far
+        self.values = None
+
+    def transform(self, program):
+        self.values = MissingValues(program)
+        return Program(self.statements(program.statements))
+
+    def note(self, line, message):
+        self.changes.append(f"line {line}: {message}")
+
+    # -------- Types --------
+    def declared_type(self, name):
+        for scope in reversed(self.types):
+            if name in scope:
+                return scope[name]
+        return None
+
+    def is_numeric(self, node):
+        return self.expression_type(node) in (INT, FLOAT)
+
+    def holds_number(self, node):
+        # Declared int / float, and sure to hold a value when it runs
+        return self.is_numeric(node) and not self.values.may_miss(node)
+
+    def expression_type(self, node):
+        # Type the declarations promise (values are not checked at run time)
+        kind = type(node)
+        if kind is Literal:
+            value = node.value
+            if type(value) is bool:
+                return BOOL
+            if type(value) is int:
+                return INT
+            if type(value) is float:
+                return FLOAT
+            return CHAR if len(value) == 1 else STRING
+        if kind is Var:
+            return self.declared_type(node.name)
+        if kind is BinOp:
+            if node.op not in ARITHMETIC:
+                return BOOL
+            left = self.expression_type(node.left)
+            right = self.expression_type(node.right)
+            if left not in (INT, FLOAT) or right not in (INT, FLOAT):
+                return STRING if STRING in (left, right) else None
+            if node.op == "DIV" or FLOAT in (left, right):
+                return FLOAT
+            return INT
+        if kind is UnaryOp:
+            if node.op == "NOT":
+                return BOOL
+            operand = self.expression_type(node.expr)
+            return operand if operand in (INT, FLOAT) else None
+        if kind is FunctionCall:
+            func = self.functions.get(node.name)
+            return func.return_type if func else None
+        return None
+
+    def cannot_raise(self, expr):
+        # No calls, no / or %, arithmetic and ordering only on int /
+        # float operands that hold a value
+        kind = type(expr)
+        if kind in (Literal, Var):
+            return True
+        if kind is UnaryOp:
+            if expr.op == "MINUS" and not self.holds_number(expr.expr):
+                return False
+            return self.cannot_raise(expr.expr)
+        if kind is BinOp:
+            if expr.op in ("DIV", "MOD"):
+                return False
+            if expr.op in ARITHMETIC or expr.op in ORDERING:
+                if not (self.holds_number(expr.left) and self.holds_number(expr.right)):
+                    return False
+            return self.cannot_raise(expr.left) and self.cannot_raise(expr.right)
+        return False
+
+    # -------- Statements --------
+    def statements(self, statements):
+        result = []
+        for stmt in statements:
+            new = self.statement(stmt)
+            if new is None:
+                continue
+            if type(new) is list:
+                result.extend(new)
+            else:
+                result.append(new)
+        return result
+
+    def statement(self, node):
+        method = getattr(self, f"visit_{type(node).__name__}", None)
+        if method is None:
+            return self.expr(node)
+        return method(node)
+
+    def block(self, node):
+        self.types.append({})
+        statements = self.statements(node.statements)
+        self.types.pop()
+        return Block(statements, node.line)
+
+    def visit_Block(self, node):
+        return self.block(node)
+
+    def visit_VarDecl(self, node):
+        expr = self.expr(node.expr)
+        self.types[-1][node.name] = node.var_type
+        return VarDecl(node.var_type, node.name, expr, node.line)
+
+    def visit_Assign(self, node):
+        return Assign(node.name, self.expr(node.expr), node.line)
+
+    def visit_Print(self, node):
+        return Print(self.expr(node.expr), node.line)
+
+    def visit_If(self, node):
+        condition = self.expr(node.condition)
+        then_block = self.block(node.then_block)
+        else_block = self.block(node.else_block) if node.else_block else None
+        return If(condition, then_block, else_block, node.line)
+
+    def visit_While(self, node):
+        return While(self.expr(node.condition), self.block(node.body), node.line)
+
+    def visit_Break(self, node):
+        return Break(node.line)
+
+    def visit_Continue(self, node):
+        return Continue(node.line)
+
+    def visit_FunctionDecl(self, node):
+        self.functions[node.name] = node
+        self.types.append({pname: ptype for ptype, pname in node.params})
+        body = self.block(node.body)
+        self.types.pop()
+        return FunctionDecl(node.return_type, node.name, list(node.params), body, node.line)
+
+    def visit_Return(self, node):
+        return Return(self.expr(node.expr) if node.expr else None, node.line)
+
+    # -------- Expressions --------
+    def expr(self, node):
+        kind = type(node)
+        if kind is BinOp:
+            return BinOp(self.expr(node.left), node.op, self.expr(node.right), node.line)
+        if kind is UnaryOp:
+            return UnaryOp(node.op, self.expr(node.expr), node.line)
+        if kind is Literal:
+            return Literal(node.value, node.line)
+        if kind is Var:
+            return Var(node.name, node.line)
+        if kind is FunctionCall:
+            return FunctionCall(node.name, [self.expr(arg) for arg in node.args], node.line)
+        return node
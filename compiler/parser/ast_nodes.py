@@ -5,6 +5,8 @@
 # =========================
 
 class ASTNode:
+    __slots__ = ("line",)
+
     def __init__(self, line):
         self.line = line
 
@@ -14,15 +16,21 @@ class ASTNode:
 # =========================
 
 class Program(ASTNode):
+    __slots__ = ("statements", "dynamic_scoping")
+
     def __init__(self, statements):
         super().__init__(line=1)
         self.statements = statements
+        self.dynamic_scoping = None      # why lexical engines would differ (analyzer)
 
 
 class Block(ASTNode):
+    __slots__ = ("statements", "nslots")
+
     def __init__(self, statements, line):
         super().__init__(line)
         self.statements = statements
+        self.nslots = None               # variables declared here (resolver)
 
 
 # =========================
@@ -30,27 +38,38 @@ class Block(ASTNode):
 # =========================
 
 class VarDecl(ASTNode):
+    __slots__ = ("var_type", "name", "expr", "slot")
+
     def __init__(self, var_type, name, expr, line):
         super().__init__(line)
         self.var_type = var_type
         self.name = name
         self.expr = expr
+        self.slot = None                 # index in the current scope (resolver)
 
 
 class Assign(ASTNode):
+    __slots__ = ("name", "expr", "depth", "slot")
+
     def __init__(self, name, expr, line):
         super().__init__(line)
         self.name = name
         self.expr = expr
+        self.depth = None                # scopes to walk up (resolver)
+        self.slot = None
 
 
 class Print(ASTNode):
+    __slots__ = ("expr",)
+
     def __init__(self, expr, line):
         super().__init__(line)
         self.expr = expr
 
 
 class If(ASTNode):
+    __slots__ = ("condition", "then_block", "else_block")
+
     def __init__(self, condition, then_block, else_block, line):
         super().__init__(line)
         self.condition = condition
@@ -59,6 +78,8 @@ class If(ASTNode):
 
 
 class While(ASTNode):
+    __slots__ = ("condition", "body")
+
     def __init__(self, condition, body, line):
         super().__init__(line)
         self.condition = condition
@@ -66,11 +87,15 @@ class While(ASTNode):
 
 
 class Break(ASTNode):
+    __slots__ = ()
+
     def __init__(self, line):
         super().__init__(line)
 
 
 class Continue(ASTNode):
+    __slots__ = ()
+
     def __init__(self, line):
         super().__init__(line)
 
@@ -80,51 +105,76 @@ class Continue(ASTNode):
 # =========================
 
 class BinOp(ASTNode):
+    __slots__ = ("left", "op", "right", "static_type")
+
     def __init__(self, left, op, right, line):
         super().__init__(line)
         self.left = left
         self.op = op
         self.right = right
+        self.static_type = None          # INT / FLOAT / ... (type checker)
 
 
 class UnaryOp(ASTNode):
+    __slots__ = ("op", "expr", "static_type")
+
     def __init__(self, op, expr, line):
         super().__init__(line)
         self.op = op
         self.expr = expr
+        self.static_type = None
 
 
 class Literal(ASTNode):
+    __slots__ = ("value", "static_type")
+
     def __init__(self, value, line):
         super().__init__(line)
         self.value = value
+        self.static_type = None
 
 
 class Var(ASTNode):
+    __slots__ = ("name", "depth", "slot", "static_type")
+
     def __init__(self, name, line):
         super().__init__(line)
         self.name = name
+        self.depth = None                # scopes to walk up (resolver)
+        self.slot = None
+        self.static_type = None
+
+
 # =========================
 # FUNCTIONS (Stage 13)
 # =========================
 
 class FunctionDecl(ASTNode):
+    __slots__ = ("return_type", "name", "params", "body", "pure")
+
     def __init__(self, return_type, name, params, body, line):
         super().__init__(line)
         self.return_type = return_type   # INT / FLOAT / etc.
         self.name = name                 # function name
         self.params = params             # list of (type, name)
         self.body = body                 # Block
+        self.pure = None                 # set by the SemanticAnalyzer
 
 
 class Return(ASTNode):
+    __slots__ = ("expr",)
+
     def __init__(self, expr, line):
         super().__init__(line)
         self.expr = expr
 
 
 class FunctionCall(ASTNode):
+    __slots__ = ("name", "args", "static_type", "target")
+
     def __init__(self, name, args, line):
         super().__init__(line)
         self.name = name                 # function name
         self.args = args                 # list of expressions
+        self.static_type = None          # return type (type checker)
+        self.target = None               # FunctionDecl it always reaches (resolver)
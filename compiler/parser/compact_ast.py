@@ -0,0 +1,204 @@
+# compiler/parser/compact_ast.py
+
+import marshal
+import struct
+import sys
+import zlib
+from array import array
+
+from compiler.parser.ast_nodes import *
+
+
+# =========================
+# Node kinds
+# =========================
+# Small-int kind per node class. Append new classes at the end so
+# existing kind numbers keep their meaning.
+
+NODE_TYPES = [
+    Program, Block, VarDecl, Assign, Print, If, While, Break, Continue,
+    BinOp, UnaryOp, Literal, Var, FunctionDecl, Return, FunctionCall,
+]
+
+KIND_OF = {cls: kind for kind, cls in enumerate(NODE_TYPES)}
+
+
+def node_fields(cls):
+    # Every slot except `line`, base classes first
+    fields = []
+    for klass in reversed(cls.__mro__):
+        for name in getattr(klass, "__slots__", ()):
+            if name != "line":
+                fields.append(name)
+    return tuple(fields)
+
+
+FIELDS = [node_fields(cls) for cls in NODE_TYPES]
+
+
+# =========================
+# Field encoding
+# =========================
+# Each field is one int: the low two bits are a tag, the rest a payload.
+#   NODE  -> index of another node in the store
+#   CONST -> index into the constant pool (names, types, literal values)
+#   LIST  -> offset into `lists`, where [length, item, item, ...] live
+#   NONE  -> no payload
+
+TAG_NODE, TAG_CONST, TAG_LIST, TAG_NONE = range(4)
+
+
+# =========================
+# Binary format
+# =========================
+# MAGIC, format version and a fingerprint of the node layout, then the
+# five arrays (little-endian, length-prefixed) and the marshalled
+# constant pool. Any change to NODE_TYPES or a node's __slots__ changes
+# the fingerprint, so stale files are rejected instead of misread.
+
+MAGIC = b"CGAST"
+FORMAT_VERSION = 1
+LAYOUT_FINGERPRINT = zlib.crc32(repr(
+    [(cls.__name__, FIELDS[kind]) for kind, cls in enumerate(NODE_TYPES)]
+).encode())
+
+HEADER = struct.Struct("<5sHI")
+LENGTH = struct.Struct("<I")
+
+
+# =========================
+# Node Store
+# =========================
+# Struct-of-arrays copy of an AST: node i is kinds[i] / lines[i] plus
+# the fields starting at fields[offsets[i]]. Shared nodes and cycles
+# (e.g. a call site pointing at its FunctionDecl) are stored once.
+#
+# This is a serialization format, not a run-time representation: the
+# ProgramCache writes it to disk (to_bytes) and reads it back, and
+# nothing walks it directly. to_ast() rebuilds ordinary nodes for the
+# analyzer and the engines, so a program in memory is always the node
+# tree; what saves memory there is the nodes' __slots__.
+
+class NodeStore:
+    __slots__ = ("kinds", "lines", "offsets", "fields", "lists", "consts")
+
+    def __init__(self):
+        self.kinds = array("B")
+        self.lines = array("i")
+        self.offsets = array("i")
+        self.fields = array("i")
+        self.lists = array("i")
+        self.consts = []
+
+    def __len__(self):
+        return len(self.kinds)
+
+    @classmethod
+    def from_ast(cls, root):
+        store = cls()
+        index = {}            # id(node) -> node index
+        const_index = {}      # (type, value) -> const index
+        queue = []
+
+        def ref(node):
+            i = index.get(id(node))
+            if i is None:
+                i = index[id(node)] = len(store.kinds)
+                store.kinds.append(KIND_OF[type(node)])
+                store.lines.append(node.line)
+                queue.append(node)
+            return i
+
+        def encode(value):
+            if isinstance(value, ASTNode):
+                return ref(value) << 2 | TAG_NODE
+            if value is None:
+                return TAG_NONE
+            if type(value) is list:
+                items = [encode(item) for item in value]
+                at = len(store.lists)
+                store.lists.append(len(items))
+                store.lists.extend(items)
+                return at << 2 | TAG_LIST
+            key = (type(value), value)
+            i = const_index.get(key)
+            if i is None:
+                i = const_index[key] = len(store.consts)
+                store.consts.append(value)
+            return i << 2 | TAG_CONST
+
+        ref(root)
+
+        # Breadth-first, so offsets grow with the node index
+        position = 0
+        while position < len(queue):
+            node = queue[position]
+            position += 1
+            store.offsets.append(len(store.fields))
+            for name in FIELDS[KIND_OF[type(node)]]:
+                store.fields.append(encode(getattr(node, name, None)))
+
+        return store
+
+    def to_ast(self):
+        nodes = [NODE_TYPES[kind].__new__(NODE_TYPES[kind]) for kind in self.kinds]
+        fields = self.fields
+        lists = self.lists
+        consts = self.consts
+
+        def decode(code):
+            tag = code & 3
+            payload = code >> 2
+            if tag == TAG_NODE:
+                return nodes[payload]
+            if tag == TAG_CONST:
+                return consts[payload]
+            if tag == TAG_LIST:
+                length = lists[payload]
+                return [decode(item) for item in lists[payload + 1:payload + 1 + length]]
+            return None
+
+        for i, node in enumerate(nodes):
+            node.line = self.lines[i]
+            start = self.offsets[i]
+            for j, name in enumerate(FIELDS[self.kinds[i]]):
+                setattr(node, name, decode(fields[start + j]))
+
+        return nodes[0] if nodes else None
+
+    def to_bytes(self):
+        parts = [HEADER.pack(MAGIC, FORMAT_VERSION, LAYOUT_FINGERPRINT)]
+        for a in (self.kinds, self.lines, self.offsets, self.fields, self.lists):
+            if sys.byteorder != "little":
+                a = array(a.typecode, a)
+                a.byteswap()
+            data = a.tobytes()
+            parts.append(LENGTH.pack(len(data)))
+            parts.append(data)
+        parts.append(marshal.dumps(tuple(self.consts)))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, fingerprint = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a CogniCode AST file")
+        if version != FORMAT_VERSION or fingerprint != LAYOUT_FINGERPRINT:
+            raise ValueError("Incompatible CogniCode AST format")
+
+        store = cls()
+        pos = HEADER.size
+        for a in (store.kinds, store.lines, store.offsets, store.fields, store.lists):
+            (size,) = LENGTH.unpack_from(data, pos)
+            pos += LENGTH.size
+            a.frombytes(data[pos:pos + size])
+            if sys.byteorder != "little":
+                a.byteswap()
+            pos += size
+        store.consts = list(marshal.loads(data[pos:]))
+        return store
+
+    def nbytes(self):
+        # Bytes held by the arrays (the constant pool is shared Python objects)
+        return sum(a.itemsize * len(a) for a in
+                   (self.kinds, self.lines, self.offsets, self.fields, self.lists))
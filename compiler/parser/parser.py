@@ -4,45 +4,81 @@ from compiler.lexer.tokens import *
 from compiler.parser.ast_nodes import *
 
 
+# Tokens pulled from the lexer per refill of the token buffer
+TOKEN_CHUNK = 1024
+
+# Binding power of each binary operator (higher binds tighter).
+# All binary operators are left-associative; prefix operators bind
+# tighter than any of them. Adding an operator is one entry here.
+BINARY_POWER = {
+    OR: 1,
+    AND: 2,
+    EQ: 3, NEQ: 3,
+    LT: 4, GT: 4, LE: 4, GE: 4,
+    PLUS: 5, MINUS: 5,
+    MUL: 6, DIV: 6, MOD: 6,
+}
+
+PREFIX_OPERATORS = (NOT, MINUS)
+PREFIX_POWER = 7
+
+
 class Parser:
-    def __init__(self, lexer):
+    def __init__(self, lexer, pratt=True):
         self.lexer = lexer
-        self.current_token = self.lexer.get_next_token()
+        self.pratt = pratt        # table-driven expressions (False: recursive descent)
+        self.tokens = []          # token buffer, lexed in chunks
+        self.pos = 0              # index of current_token in the buffer
+        self.fill(0)
+        self.current_token = self.tokens[0]
 
     # --------------------
     # Utilities
     # --------------------
+    def fill(self, index):
+        # Lex until the buffer holds `index` (or ends with EOF).
+        # Tokens already consumed are dropped, so the buffer stays small.
+        tokens = self.tokens
+        if self.pos:
+            del tokens[:self.pos]
+            index -= self.pos
+            self.pos = 0
+
+        while len(tokens) <= index:
+            if tokens and tokens[-1].type == EOF:
+                break
+            tokens.extend(self.lexer.scan(TOKEN_CHUNK))
+
+        return min(index, len(tokens) - 1)
+
     def eat(self, token_type):
         if self.current_token.type == token_type:
-            self.current_token = self.lexer.get_next_token()
+            self.pos += 1
+            if self.pos >= len(self.tokens):
+                self.pos = self.fill(self.pos)
+            self.current_token = self.tokens[self.pos]
         else:
             raise Exception(
                 f"Expected {token_type}, got {self.current_token.type}"
             )
 
-    def peek_token(self):
-        # Save state
-        pos = self.lexer.pos
-        char = self.lexer.current_char
-        tok = self.current_token
-
-        next_tok = self.lexer.get_next_token()
-
-        # Restore state
-        self.lexer.pos = pos
-        self.lexer.current_char = char
-        self.current_token = tok
-
-        return next_tok
+    def peek_token(self, k=1):
+        # k-th token after current_token; EOF repeats past the end
+        index = self.pos + k
+        if index >= len(self.tokens):
+            index = self.fill(index)
+        return self.tokens[index]
 
     # --------------------
     # Program
     # --------------------
     def parse(self):
-        statements = []
+        return Program(list(self.statements()))
+
+    def statements(self):
+        # Top-level statements, one at a time, as soon as each is parsed
         while self.current_token.type != EOF:
-            statements.append(self.statement())
-        return Program(statements)
+            yield self.statement()
 
     # --------------------
     # Statements
@@ -226,8 +262,74 @@ class Parser:
     # Expressions
     # --------------------
     def expression(self):
+        if self.pratt:
+            return self.pratt_expression()
         return self.logical_or()
 
+    # --------------------
+    # Expressions (table-driven)
+    # --------------------
+    # Operator precedence over BINARY_POWER with explicit operand and
+    # operator stacks: nesting of parentheses and prefix operators costs
+    # no Python recursion. Builds the same BinOp/UnaryOp trees (and line
+    # numbers) as the recursive-descent chain below.
+
+    def pratt_expression(self):
+        operands = []
+        operators = []            # (op, power, line, is_prefix); "(" has power 0
+        open_parens = 0
+
+        while True:
+            # ---- operand position: prefix operators and "(" ----
+            tok = self.current_token
+            while tok.type in PREFIX_OPERATORS or tok.type == LPAREN:
+                if tok.type == LPAREN:
+                    operators.append((LPAREN, 0, tok.line, False))
+                    open_parens += 1
+                else:
+                    operators.append((tok.type, PREFIX_POWER, tok.line, True))
+                self.eat(tok.type)
+                tok = self.current_token
+
+            operands.append(self.primary())
+
+            # ---- operator position: ")" or a binary operator ----
+            while True:
+                tok = self.current_token
+
+                if tok.type == RPAREN and open_parens:
+                    self.reduce(operands, operators, 1)
+                    operators.pop()
+                    open_parens -= 1
+                    self.eat(RPAREN)
+                    continue
+
+                power = BINARY_POWER.get(tok.type)
+                if power is None:
+                    if open_parens:
+                        self.eat(RPAREN)      # raises "Expected RPAREN"
+                    self.reduce(operands, operators, 0)
+                    return operands[0]
+
+                self.reduce(operands, operators, power)
+                operators.append((tok.type, power, tok.line, False))
+                self.eat(tok.type)
+                break
+
+    def reduce(self, operands, operators, power):
+        # Pop operators binding at least as tight as `power`;
+        # an open "(" (power 0) stops any reduction with power >= 1
+        while operators and operators[-1][1] >= power:
+            op, _, line, is_prefix = operators.pop()
+            if is_prefix:
+                operands.append(UnaryOp(op, operands.pop(), line))
+            else:
+                right = operands.pop()
+                operands.append(BinOp(operands.pop(), op, right, line))
+
+    # --------------------
+    # Expressions (recursive descent)
+    # --------------------
     def logical_or(self):
         node = self.logical_and()
         while self.current_token.type == OR:
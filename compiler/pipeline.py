@@ -0,0 +1,109 @@
+# compiler/pipeline.py
+
+import sys
+
+from compiler.lexer.stream_lexer import StreamLexer
+from compiler.parser.parser import Parser
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.interpreter.interpreter import Interpreter
+from compiler.interpreter.slot_interpreter import SlotInterpreter
+from compiler.interpreter.closure_compiler import ClosureCompiler
+from compiler.bytecode.vm import VirtualMachine
+from compiler.transpiler.python_engine import PythonEngine
+from compiler.errors import CompilerError, RecursionLimitError, recursion_limit_error
+from compiler.limits import PYTHON_RECURSION_LIMIT
+
+
+# =========================
+# Execution engines
+# =========================
+# Every engine has the Interpreter interface: interpret(program).
+
+ENGINES = {
+    "tree": Interpreter,
+    "slots": SlotInterpreter,
+    "closure": ClosureCompiler,
+    "vm": VirtualMachine,
+    "python": PythonEngine,
+}
+
+
+def create_interpreter(engine="tree", **options):
+    # options: max_depth (see compiler.limits), memoize, output (see
+    # compiler.interpreter.output), budget (compiler.interpreter.budget);
+    # for the python engine also compiled (a CodeCache entry)
+    if engine not in ENGINES:
+        raise Exception(
+            f"Unknown engine '{engine}' (expected one of: {', '.join(ENGINES)})"
+        )
+    return ENGINES[engine](**options)
+
+
+# Since Python 3.11 a call between Python functions does not use the C
+# stack, so the recursion limit can be raised without risking a crash.
+DEEP_PYTHON_STACK = sys.version_info >= (3, 11)
+
+
+def execute(interpreter, node):
+    # interpret(), with Python's own stack running out (the tree-walking
+    # engines and the python engine recurse in Python) reported like the
+    # other engines' depth limit
+    if DEEP_PYTHON_STACK and sys.getrecursionlimit() < PYTHON_RECURSION_LIMIT:
+        sys.setrecursionlimit(PYTHON_RECURSION_LIMIT)
+    try:
+        return interpreter.interpret(node)
+    except RecursionError as e:
+        raise python_stack_error(interpreter, e.__traceback__) from None
+
+
+def python_stack_error(interpreter, traceback):
+    # RecursionLimitError with the depth reached and the innermost user
+    # call (name and line). The tree-walking engines keep both (`depth`,
+    # `call`), also when another engine handed them the program
+    # (`fallback`); the python engine's code is found on the Python
+    # stack ("<cognicode>", function depth_3 for depth).
+    engine = getattr(interpreter, "fallback", None) or interpreter
+    if getattr(engine, "call", None) is not None:
+        return recursion_limit_error(engine.depth, engine.call.name, engine.call.line)
+
+    depth = 0
+    call = None
+    while traceback is not None:
+        code = traceback.tb_frame.f_code
+        if code.co_filename == "<cognicode>" and code.co_name != "<module>":
+            depth += 1
+            call = code.co_name.rsplit("_", 1)[0], traceback.tb_lineno
+        traceback = traceback.tb_next
+
+    if call is None:
+        return RecursionLimitError("Recursion too deep for this engine", depth or None)
+    return recursion_limit_error(depth, *call)
+
+
+# =========================
+# Streaming execution
+# =========================
+# Each top-level statement is checked and executed as soon as it has
+# been parsed, so output starts before the whole source has been read.
+# Unlike the batch pipeline, statements before a syntax error still run.
+# Engines that resolve names lexically cannot hand a half-run program to
+# the tree-walker, so they stop before the first statement where that
+# would give another result than dynamic scoping.
+
+def run_stream(stream, interpreter=None):
+    parser = Parser(StreamLexer(stream))
+    semantic = SemanticAnalyzer()
+    interpreter = interpreter or Interpreter()
+    lexical = isinstance(interpreter, (SlotInterpreter, VirtualMachine))
+
+    for stmt in parser.statements():
+        semantic.analyze(stmt)
+        if lexical and semantic.dynamic_scoping:
+            raise CompilerError(
+                f"Cannot stream this program on a lexically scoped engine "
+                f"({semantic.dynamic_scoping}); use the tree engine",
+                stmt.line
+            )
+        execute(interpreter, stmt)
+
+    return interpreter
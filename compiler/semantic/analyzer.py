@@ -2,13 +2,22 @@
 
 from compiler.parser.ast_nodes import *
 from compiler.errors import CompilerError
+from compiler.semantic.types import (
+    assignable, binary_type, unary_type, literal_type, type_name, operator_text,
+)
 
 
 class SemanticAnalyzer:
     def __init__(self):
         self.variables = [{}]     # stack of scopes
+        self.slots = [{}]         # name -> slot, parallel to variables
         self.functions = {}       # function table
         self.current_function = None
+        self.effects = []         # per function being analysed (purity)
+        self.loops = 0            # loops around the current statement, in its function
+        self.declared = {}        # name -> declarations so far (variables and parameters)
+        self.outer_reads = {}     # name -> (line, function) of its first use as an outer variable
+        self.dynamic_scoping = None   # see note_dynamic
 
     # --------------------
     # Dispatcher
@@ -30,12 +39,84 @@ class SemanticAnalyzer:
     def visit_Program(self, node):
         for stmt in node.statements:
             self.analyze(stmt)
+        node.dynamic_scoping = self.dynamic_scoping
 
     def visit_Block(self, node):
-        self.variables.append({})
+        self.push_scope()
         for stmt in node.statements:
             self.analyze(stmt)
+        node.nslots = len(self.slots[-1])
+        self.pop_scope()
+
+    # --------------------
+    # Scopes / slot resolution
+    # --------------------
+    # Every declaration gets the next slot of its scope. Uses are
+    # annotated with (depth, slot): how many scopes to walk up from the
+    # innermost one, and the index there. Function scopes sit on top
+    # of the scopes where the function is declared, so the depth is
+    # lexical.
+    def push_scope(self):
+        self.variables.append({})
+        self.slots.append({})
+
+    def pop_scope(self):
         self.variables.pop()
+        self.slots.pop()
+
+    def declare(self, name, var_type):
+        slot = len(self.slots[-1])
+        self.variables[-1][name] = var_type
+        self.slots[-1][name] = slot
+        self.declared[name] = self.declared.get(name, 0) + 1
+        if self.declared[name] > 1 and name in self.outer_reads:
+            self.note_dynamic(name, *self.outer_reads[name])
+        return slot
+
+    def resolve(self, node):
+        # Annotates a Var / Assign and returns the declared type
+        last = len(self.variables) - 1
+        for i in range(last, -1, -1):
+            if node.name in self.variables[i]:
+                node.depth = last - i
+                node.slot = self.slots[i][node.name]
+                if self.effects and i < self.effects[-1]["scope"]:
+                    self.effects[-1]["impure"] = True     # outer variable
+                    self.outer_use(node.name, node.line, i)
+                return self.variables[i][node.name]
+
+        raise CompilerError(
+            f"Variable '{node.name}' not declared",
+            node.line
+        )
+
+    # --------------------
+    # Dynamic scoping
+    # --------------------
+    # At run time a function sees the variables of its caller, not of
+    # the place it is declared in: the tree-walking engines look names
+    # up through the callers' environments. The slots and vm engines
+    # use the lexical (depth, slot) resolution above instead, which
+    # finds the same variable unless another declaration of the name can
+    # sit between the function and the lexical one: the name is declared
+    # more than once, or it is a local of an enclosing function (whose
+    # calls may be running several times). The first such use is kept
+    # in `dynamic_scoping` (and on the Program) so those engines can
+    # leave the program to the tree-walker.
+    def outer_use(self, name, line, scope):
+        if scope >= self.effects[0]["scope"]:
+            self.note_dynamic(name, line, self.current_function.name)
+            return
+        self.outer_reads.setdefault(name, (line, self.current_function.name))
+        if self.declared.get(name, 0) > 1:
+            self.note_dynamic(name, line, self.current_function.name)
+
+    def note_dynamic(self, name, line, function):
+        if self.dynamic_scoping is None:
+            self.dynamic_scoping = (
+                f"line {line}: '{name}' in function '{function}' "
+                f"depends on the caller (dynamic scoping)"
+            )
 
     # --------------------
     # Variables
@@ -49,34 +130,31 @@ class SemanticAnalyzer:
                 node.line
             )
 
-        self.analyze(node.expr)
-        scope[node.name] = node.var_type
+        self.check_assignable(node.var_type, self.analyze(node.expr), node)
+        node.slot = self.declare(node.name, node.var_type)
 
     def visit_Assign(self, node):
-        for scope in reversed(self.variables):
-            if node.name in scope:
-                self.analyze(node.expr)
-                return
-
-        raise CompilerError(
-            f"Variable '{node.name}' not declared",
-            node.line
-        )
+        var_type = self.resolve(node)
+        self.check_assignable(var_type, self.analyze(node.expr), node)
 
     def visit_Var(self, node):
-        for scope in reversed(self.variables):
-            if node.name in scope:
-                return
+        node.static_type = self.resolve(node)
+        return node.static_type
 
-        raise CompilerError(
-            f"Variable '{node.name}' not declared",
-            node.line
-        )
+    def check_assignable(self, var_type, value_type, node):
+        if not assignable(var_type, value_type):
+            raise CompilerError(
+                f"Cannot assign {type_name(value_type)} to "
+                f"{type_name(var_type)} variable '{node.name}'",
+                node.line
+            )
 
     # --------------------
     # Print
     # --------------------
     def visit_Print(self, node):
+        if self.effects:
+            self.effects[-1]["impure"] = True
         self.analyze(node.expr)
 
     # --------------------
@@ -90,7 +168,9 @@ class SemanticAnalyzer:
 
     def visit_While(self, node):
         self.analyze(node.condition)
+        self.loops += 1
         self.analyze(node.body)
+        self.loops -= 1
 
     # --------------------
     # 🔥 Function Declaration
@@ -105,26 +185,53 @@ class SemanticAnalyzer:
         # store function signature
         self.functions[node.name] = {
             "return_type": node.return_type,
-            "params": node.params
+            "params": node.params,
+            "pure": True,
+            "decl": node,
+            "scope": self.variables[-1],      # where it is declared
         }
 
-        # enter function scope
-        self.variables.append({})
-        self.current_function = node
+        if self.effects:
+            # defining a function is a side effect of the enclosing one
+            self.effects[-1]["impure"] = True
 
-        # register parameters as variables
+        # enter function scope; loops around the declaration do not
+        # reach into the body (break cannot leave a function)
+        self.push_scope()
+        enclosing = self.current_function
+        enclosing_loops = self.loops
+        self.current_function = node
+        self.loops = 0
+        self.effects.append({
+            "scope": len(self.variables) - 1,
+            "impure": False,
+            "calls": set(),
+        })
+
+        # register parameters as variables (slots 0..n-1)
         for ptype, pname in node.params:
             if pname in self.variables[-1]:
                 raise CompilerError(
                     f"Duplicate parameter '{pname}'",
                     node.line
                 )
-            self.variables[-1][pname] = ptype
+            self.declare(pname, ptype)
 
         self.analyze(node.body)
 
-        self.variables.pop()
-        self.current_function = None
+        self.pop_scope()
+        self.current_function = enclosing
+        self.loops = enclosing_loops
+
+        # Pure: no print, no outer variables, calls only pure functions.
+        # Callees are declared earlier, so their purity is already known
+        # (a function calling itself does not make it impure).
+        effects = self.effects.pop()
+        node.pure = not effects["impure"] and all(
+            self.functions[name]["pure"]
+            for name in effects["calls"] if name != node.name
+        )
+        self.functions[node.name]["pure"] = node.pure
 
     # --------------------
     # 🔥 Function Call
@@ -136,7 +243,25 @@ class SemanticAnalyzer:
                 node.line
             )
 
-        expected = self.functions[node.name]["params"]
+        if self.effects:
+            self.effects[-1]["calls"].add(node.name)
+
+        # Static resolution: function names are unique, so a call made
+        # inside the scope that declares the function always reaches that
+        # declaration. Elsewhere the engines look the name up at run time
+        # (and fail if the declaring block is not active).
+        func = self.functions[node.name]
+        if any(scope is func["scope"] for scope in self.variables):
+            node.target = func["decl"]
+        elif self.dynamic_scoping is None:
+            # the slots and vm engines keep one table of all functions
+            # and would find it
+            self.dynamic_scoping = (
+                f"line {node.line}: '{node.name}' is called outside the block "
+                f"that declares it"
+            )
+
+        expected = func["params"]
 
         if len(node.args) != len(expected):
             raise CompilerError(
@@ -144,8 +269,17 @@ class SemanticAnalyzer:
                 node.line
             )
 
-        for arg in node.args:
-            self.analyze(arg)
+        for i, (arg, (ptype, pname)) in enumerate(zip(node.args, expected), 1):
+            arg_type = self.analyze(arg)
+            if not assignable(ptype, arg_type):
+                raise CompilerError(
+                    f"Argument {i} of '{node.name}' must be {type_name(ptype)}, "
+                    f"got {type_name(arg_type)}",
+                    node.line
+                )
+
+        node.static_type = self.functions[node.name]["return_type"]
+        return node.static_type
 
     # --------------------
     # 🔥 Return
@@ -156,23 +290,50 @@ class SemanticAnalyzer:
                 "Return outside function",
                 node.line
             )
-        self.analyze(node.expr)
+        value_type = self.analyze(node.expr)
+        return_type = self.current_function.return_type
+        if not assignable(return_type, value_type):
+            raise CompilerError(
+                f"Function '{self.current_function.name}' returns "
+                f"{type_name(return_type)}, got {type_name(value_type)}",
+                node.line
+            )
 
     # --------------------
     # Expressions
     # --------------------
+    # Every expression node gets its static_type; the visitor returns it.
     def visit_BinOp(self, node):
-        self.analyze(node.left)
-        self.analyze(node.right)
+        left = self.analyze(node.left)
+        right = self.analyze(node.right)
+        node.static_type = binary_type(node.op, left, right)
+        if node.static_type is None:
+            raise CompilerError(
+                f"Operator '{operator_text(node.op)}' cannot be applied to "
+                f"{type_name(left)} and {type_name(right)}",
+                node.line
+            )
+        return node.static_type
 
     def visit_UnaryOp(self, node):
-        self.analyze(node.expr)
+        operand = self.analyze(node.expr)
+        node.static_type = unary_type(node.op, operand)
+        if node.static_type is None:
+            raise CompilerError(
+                f"Operator '{operator_text(node.op)}' cannot be applied to "
+                f"{type_name(operand)}",
+                node.line
+            )
+        return node.static_type
 
     def visit_Literal(self, node):
-        pass
+        node.static_type = literal_type(node.value)
+        return node.static_type
 
     def visit_Break(self, node):
-        pass
+        if not self.loops:
+            raise CompilerError("'break' outside loop", node.line)
 
     def visit_Continue(self, node):
-        pass
+        if not self.loops:
+            raise CompilerError("'continue' outside loop", node.line)
@@ -0,0 +1,74 @@
+# compiler/semantic/types.py
+
+from compiler.lexer.tokens import INT, FLOAT, BOOL, CHAR, STRING, OPERATOR_TEXT
+
+
+NUMERIC = (INT, FLOAT)
+TEXT = (CHAR, STRING)
+
+ORDERING = ("LT", "GT", "LE", "GE")
+
+
+# =========================
+# Typing rules
+# =========================
+# int and float mix freely (a float stored in an int variable stays a
+# float, as it always has); so do char and string. Conditions, == / !=
+# and the logical operators accept any type.
+
+def type_name(var_type):
+    return var_type.lower()
+
+
+def literal_type(value):
+    if type(value) is bool:
+        return BOOL
+    if type(value) is int:
+        return INT
+    if type(value) is float:
+        return FLOAT
+    return CHAR if len(value) == 1 else STRING
+
+
+def assignable(target, value):
+    # Can a value of type `value` be stored where `target` is declared?
+    if target == value:
+        return True
+    if target in NUMERIC:
+        return value in NUMERIC
+    if target in TEXT:
+        return value in TEXT
+    return False
+
+
+def binary_type(op, left, right):
+    # Result type of `left op right`, or None when the operation is invalid
+    if op in ("EQ", "NEQ", "AND", "OR"):
+        return BOOL
+
+    if op in ORDERING:
+        if (left in NUMERIC and right in NUMERIC) or (left in TEXT and right in TEXT):
+            return BOOL
+        return BOOL if left == right == BOOL else None
+
+    if left in NUMERIC and right in NUMERIC:
+        if op == "DIV" or FLOAT in (left, right):
+            return FLOAT
+        return INT
+    if op == "PLUS" and left in TEXT and right in TEXT:
+        return STRING
+    if op == "MUL" and (left in TEXT and right == INT or left == INT and right in TEXT):
+        return STRING           # "ab" * 3, repetition
+    return None
+
+
+def unary_type(op, operand):
+    if op == "NOT":
+        return BOOL
+    if operand in NUMERIC:
+        return operand
+    return None
+
+
+def operator_text(op):
+    return OPERATOR_TEXT.get(op, op)
@@ -0,0 +1,276 @@
+# compiler/transpiler/lowering.py
+
+import ast
+
+from compiler.lexer.tokens import STRING
+from compiler.parser.ast_nodes import *
+
+
+class Unsupported(Exception):
+    # The program relies on something Python code cannot express
+    pass
+
+
+BINARY = {
+    "PLUS": ast.Add,
+    "MINUS": ast.Sub,
+    "MUL": ast.Mult,
+    "DIV": ast.Div,          # CogniCode / is true division in every engine
+    "MOD": ast.Mod,
+}
+
+COMPARE = {
+    "LT": ast.Lt,
+    "GT": ast.Gt,
+    "LE": ast.LtE,
+    "GE": ast.GtE,
+    "EQ": ast.Eq,
+    "NEQ": ast.NotEq,
+}
+
+# + and * that may build text call the size-checked versions (the
+# `checked_add` / `checked_mul` globals) with the source line
+CHECKED = {
+    "PLUS": "checked_add",
+    "MUL": "checked_mul",
+}
+
+# both sides are always evaluated: bool(a) & bool(b), bool(a) | bool(b)
+LOGICAL = {
+    "AND": ast.BitAnd,
+    "OR": ast.BitOr,
+}
+
+
+def declarations(statements):
+    # How often each variable name is declared (VarDecl or parameter)
+    counts = {}
+    stack = list(statements)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, VarDecl):
+            counts[node.name] = counts.get(node.name, 0) + 1
+        elif isinstance(node, Block):
+            stack.extend(node.statements)
+        elif isinstance(node, If):
+            stack.append(node.then_block)
+            if node.else_block:
+                stack.append(node.else_block)
+        elif isinstance(node, While):
+            stack.append(node.body)
+        elif isinstance(node, FunctionDecl):
+            for _, pname in node.params:
+                counts[pname] = counts.get(pname, 0) + 1
+            stack.append(node.body)
+    return counts
+
+
+# =========================
+# Lowering to Python
+# =========================
+# Turns an analysed Program into a Python ast.Module with the same
+# behaviour, for compile() and exec(). Every declaration gets its own
+# Python name (x -> x_3), so block scoping needs nothing at run time;
+# top-level code runs at module level and functions become defs.
+#
+# CogniCode functions see their callers' variables (dynamic scoping),
+# Python functions see where they are defined. The two agree when
+# functions are declared at the top level and every outer variable a
+# function uses is a global declared nowhere else; anything else
+# raises Unsupported. (break / continue outside a loop, which the
+# analyzer rejects, would fail in compile().)
+#
+# With budgeted=True every loop iteration and function call first
+# counts down the run's Budget (the `budget` global), as the other
+# engines do at back-edges and calls (a call is charged on the line of
+# the function declaration rather than the call site).
+
+class Lowering:
+    def __init__(self, budgeted=False):
+        self.budgeted = budgeted
+        self.scopes = [{}]          # name -> Python name
+        self.count = 0
+        self.functions = {}         # function name -> Python name
+        self.function = None        # FunctionDecl being lowered
+        self.function_scope = 0     # index of its outermost scope
+        self.assigned_globals = None
+        self.declared = {}
+
+    def lower(self, program):
+        self.declared = declarations(program.statements)
+        body = self.statements(program.statements)
+        return ast.fix_missing_locations(ast.Module(body=body, type_ignores=[]))
+
+    # -------- Names --------
+    def fresh(self, name):
+        self.count += 1
+        return f"{name.replace('$', '_')}_{self.count}"
+
+    def declare(self, name):
+        py_name = self.scopes[-1][name] = self.fresh(name)
+        return py_name
+
+    def lookup(self, name, line, store=False):
+        for i in range(len(self.scopes) - 1, -1, -1):
+            if name in self.scopes[i]:
+                if self.function is not None and i < self.function_scope:
+                    # an outer variable read or assigned by a function
+                    if self.declared.get(name, 0) > 1:
+                        raise Unsupported(
+                            f"line {line}: '{name}' in function '{self.function.name}' "
+                            f"depends on the caller (dynamic scoping)"
+                        )
+                    if store:
+                        self.assigned_globals.add(self.scopes[i][name])
+                return self.scopes[i][name]
+        raise Unsupported(f"line {line}: unknown variable '{name}'")
+
+    # -------- Statements --------
+    def statements(self, statements):
+        body = []
+        for stmt in statements:
+            lowered = self.statement(stmt)
+            if type(lowered) is list:
+                body.extend(lowered)
+            else:
+                body.append(lowered)
+        return body or [ast.Pass()]
+
+    def block(self, node):
+        self.scopes.append({})
+        body = self.statements(node.statements)
+        self.scopes.pop()
+        return body
+
+    def statement(self, node):
+        if isinstance(node, Block):
+            return self.block(node)
+        method = getattr(self, f"lower_{type(node).__name__}", None)
+        if method is not None:
+            return located(method(node), node)
+        return located(ast.Expr(value=self.expr(node)), node)
+
+    def lower_VarDecl(self, node):
+        value = self.expr(node.expr)        # before the name is in scope
+        target = ast.Name(id=self.declare(node.name), ctx=ast.Store())
+        return ast.Assign(targets=[target], value=value)
+
+    def lower_Assign(self, node):
+        target = ast.Name(id=self.lookup(node.name, node.line, store=True), ctx=ast.Store())
+        return ast.Assign(targets=[target], value=self.expr(node.expr))
+
+    def lower_Print(self, node):
+        return ast.Expr(value=call("print", [self.expr(node.expr)]))
+
+    def lower_If(self, node):
+        orelse = self.block(node.else_block) if node.else_block else []
+        return ast.If(test=self.expr(node.condition),
+                      body=self.block(node.then_block), orelse=orelse)
+
+    def lower_While(self, node):
+        body = self.block(node.body)
+        if self.budgeted:
+            body[:0] = budget_check(node.line)
+        return ast.While(test=self.expr(node.condition), body=body, orelse=[])
+
+    def lower_Break(self, node):
+        return ast.Break()
+
+    def lower_Continue(self, node):
+        return ast.Continue()
+
+    def lower_Return(self, node):
+        return ast.Return(value=self.expr(node.expr) if node.expr else None)
+
+    def lower_FunctionDecl(self, node):
+        if self.function is not None or len(self.scopes) > 1:
+            raise Unsupported(f"line {node.line}: function '{node.name}' is not "
+                              f"declared at the top level")
+
+        py_name = self.functions[node.name] = self.fresh(node.name)
+        self.function = node
+        self.function_scope = len(self.scopes)
+        self.assigned_globals = set()
+
+        self.scopes.append({})
+        params = [ast.arg(arg=self.declare(pname)) for _, pname in node.params]
+        body = self.block(node.body)
+        self.scopes.pop()
+
+        if self.budgeted:
+            body[:0] = budget_check(node.line)
+        if self.assigned_globals:
+            body.insert(0, ast.Global(names=sorted(self.assigned_globals)))
+        self.function = None
+        self.assigned_globals = None
+
+        function = ast.FunctionDef(
+            name=py_name,
+            args=ast.arguments(posonlyargs=[], args=params, vararg=None, kwonlyargs=[],
+                               kw_defaults=[], kwarg=None, defaults=[]),
+            body=body, decorator_list=[], returns=None,
+        )
+        if "type_params" in ast.FunctionDef._fields:     # Python 3.12+
+            function.type_params = []
+        return function
+
+    # -------- Expressions --------
+    def expr(self, node):
+        kind = type(node)
+        if kind is Literal:
+            result = ast.Constant(value=node.value)
+        elif kind is Var:
+            result = ast.Name(id=self.lookup(node.name, node.line), ctx=ast.Load())
+        elif kind is BinOp:
+            left = self.expr(node.left)
+            right = self.expr(node.right)
+            if node.op in CHECKED and node.static_type in (STRING, None):
+                result = call(CHECKED[node.op], [left, right, ast.Constant(value=node.line)])
+            elif node.op in BINARY:
+                result = ast.BinOp(left=left, op=BINARY[node.op](), right=right)
+            elif node.op in COMPARE:
+                result = ast.Compare(left=left, ops=[COMPARE[node.op]()], comparators=[right])
+            elif node.op in LOGICAL:
+                result = ast.BinOp(left=call("bool", [left]), op=LOGICAL[node.op](),
+                                   right=call("bool", [right]))
+            else:
+                raise Unsupported(f"line {node.line}: operator {node.op}")
+        elif kind is UnaryOp:
+            op = ast.Not() if node.op == "NOT" else ast.USub()
+            result = ast.UnaryOp(op=op, operand=self.expr(node.expr))
+        elif kind is FunctionCall:
+            if node.name not in self.functions:
+                raise Unsupported(f"line {node.line}: unknown function '{node.name}'")
+            result = ast.Call(func=ast.Name(id=self.functions[node.name], ctx=ast.Load()),
+                              args=[self.expr(arg) for arg in node.args], keywords=[])
+        else:
+            raise Unsupported(f"line {node.line}: {kind.__name__}")
+        return located(result, node)
+
+
+def call(name, args):
+    return ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=args, keywords=[])
+
+
+def located(lowered, node):
+    # Source line of the CogniCode node, for tracebacks and profilers
+    lowered.lineno = lowered.end_lineno = node.line
+    lowered.col_offset = lowered.end_col_offset = 0
+    return lowered
+
+
+def budget_check(line):
+    statements = ast.parse(
+        "budget.remaining -= 1\n"
+        "if budget.remaining <= 0:\n"
+        f"    budget.charge({line})\n"
+    ).body
+    for stmt in statements:
+        for node in ast.walk(stmt):
+            if "lineno" in node._attributes:
+                node.lineno = node.end_lineno = line
+    return statements
+
+
+def lower_program(program, budgeted=False):
+    return Lowering(budgeted).lower(program)
@@ -0,0 +1,105 @@
+# compiler/transpiler/python_engine.py
+
+import threading
+from collections import OrderedDict
+
+from compiler.parser.ast_nodes import Program
+from compiler.interpreter.interpreter import Interpreter
+from compiler.interpreter.budget import checked_add, checked_mul
+from compiler.transpiler.lowering import lower_program, Unsupported
+from compiler.limits import MAX_CALL_DEPTH
+
+
+def compile_program(program, budgeted=False):
+    # (code object, None), or (None, reason) when it cannot be lowered
+    try:
+        return compile(lower_program(program, budgeted), "<cognicode>", "exec"), None
+    except Unsupported as e:
+        return None, str(e)
+    except SyntaxError as e:
+        # e.g. break outside a loop in a tree the analyzer has not checked
+        return None, f"line {e.lineno}: {e.msg}"
+    except RecursionError:
+        return None, "program is nested too deeply"
+
+
+# =========================
+# Code Cache
+# =========================
+# Compiled Python code per program, keyed like the ProgramCache (source
+# hash, plus anything that changes the tree, such as optimizer options)
+# and by whether the code counts down a Budget. Programs that cannot be
+# lowered are remembered too, with the reason.
+
+class CodeCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, key, program, budgeted=False):
+        key = (key, budgeted)
+        with self.lock:
+            compiled = self.entries.get(key)
+            if compiled is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return compiled
+
+        compiled = compile_program(program, budgeted)
+
+        with self.lock:
+            self.misses += 1
+            self.entries[key] = compiled
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return compiled
+
+    def stats(self):
+        with self.lock:
+            return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+
+# =========================
+# Python Engine
+# =========================
+# Runs a whole Program as Python code, so CPython's own eval loop does
+# the work. Anything the lowering rejects, and runs that need per-call
+# bookkeeping (memoization, a non-default max_depth), go to the
+# tree-walking Interpreter instead; `fallback_reason` says why. So do
+# single statements (streaming), which share the Interpreter's state.
+# `compiled` must have been built with budgeted=(budget is not None).
+
+class PythonEngine:
+    def __init__(self, max_depth=MAX_CALL_DEPTH, memoize=False, output=None, budget=None,
+                 compiled=None):
+        self.compiled = compiled            # (code, reason) from a CodeCache
+        self.fallback = Interpreter(max_depth=max_depth, memoize=memoize, output=output,
+                                    budget=budget)
+        self.memo = self.fallback.memo
+        self.output = self.fallback.output
+        self.budget = budget
+        self.fallback_reason = None
+
+        if memoize:
+            self.fallback_reason = "memoization needs the tree-walker"
+        elif max_depth != MAX_CALL_DEPTH:
+            self.fallback_reason = "max_depth needs the tree-walker"
+
+    def interpret(self, node):
+        if type(node) is Program and self.fallback_reason is None:
+            code, reason = self.compiled or compile_program(node, self.budget is not None)
+            if code is not None:
+                write = self.output.write
+
+                def print_value(value):
+                    write(f"{value}\n")
+
+                exec(code, {"__builtins__": {}, "print": print_value, "bool": bool,
+                            "budget": self.budget, "checked_add": checked_add,
+                            "checked_mul": checked_mul})
+                return None
+            self.fallback_reason = reason
+        return self.fallback.interpret(node)
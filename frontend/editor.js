@@ -20,25 +20,84 @@ codeArea.addEventListener("scroll", () => {
 
 updateLineNumbers();
 
-runBtn.addEventListener("click", async () => {
+// Runs stream their output as Server-Sent Events (see /run/stream in
+// backend/main.py); while a run is going the button stops it.
+const server = "http://127.0.0.1:8000";
+let runId = null;
+let running = false;
+
+function showResult(result, printed) {
+    // printed output always ends with a newline
+    if (!printed) outputArea.textContent = "";
+    if (result.error !== undefined) {
+        outputArea.textContent += "Error:\n" + result.error;
+    } else if (!printed) {
+        outputArea.textContent = "(no output)";
+    }
+}
+
+async function runStreaming() {
+    running = true;
+    runBtn.textContent = "Stop";
     outputArea.textContent = "Running...\n";
+    let printed = false;
 
     try {
-        const response = await fetch("http://127.0.0.1:8000/run", {
+        const response = await fetch(server + "/run/stream", {
             method: "POST",
             headers: { "Content-Type": "application/json" },
             body: JSON.stringify({ code: codeArea.value })
         });
+        if (!response.ok) {
+            const result = await response.json();
+            outputArea.textContent = "Error:\n" + result.error;
+            return;
+        }
 
-        const result = await response.json();
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffered = "";
 
-        if (result.output !== undefined) {
-            outputArea.textContent = result.output || "(no output)";
-        } else {
-            outputArea.textContent = "Error:\n" + result.error;
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffered += decoder.decode(value, { stream: true });
+
+            // events are separated by a blank line
+            let end;
+            while ((end = buffered.indexOf("\n\n")) !== -1) {
+                const lines = buffered.slice(0, end).split("\n");
+                buffered = buffered.slice(end + 2);
+
+                const event = lines.find(l => l.startsWith("event: ")).slice(7);
+                const data = JSON.parse(lines.find(l => l.startsWith("data: ")).slice(6));
+
+                if (event === "start") {
+                    runId = data.id;
+                } else if (event === "output") {
+                    if (!printed) outputArea.textContent = "";
+                    printed = true;
+                    outputArea.textContent += data.text;
+                    outputArea.scrollTop = outputArea.scrollHeight;
+                } else if (event === "done") {
+                    showResult(data, printed);
+                }
+            }
         }
 
     } catch (err) {
-        outputArea.textContent = "Connection error:\n" + err;
+        outputArea.textContent += "\nConnection error:\n" + err;
+    } finally {
+        running = false;
+        runId = null;
+        runBtn.textContent = "Run Code";
+    }
+}
+
+runBtn.addEventListener("click", () => {
+    if (!running) {
+        runStreaming();
+    } else if (runId) {
+        fetch(server + "/run/cancel/" + runId, { method: "POST" });
     }
 });
@@ -0,0 +1,314 @@
+# Sample CogniCode programs shared by the engine tests.
+# Each execution engine must print exactly what the tree-walking
+# Interpreter prints for every program here.
+
+import contextlib
+import io
+
+from compiler.lexer.lexer import Lexer
+from compiler.parser.parser import Parser
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.interpreter.interpreter import Interpreter
+
+
+SAMPLES = {
+    # ---- programs from the original test_*.py scripts ----
+    "break_continue": """
+int i = 0;
+
+while (i < 5) {
+    i = i + 1;
+
+    if (i == 2) {
+        continue;
+    }
+
+    if (i == 4) {
+        break;
+    }
+
+    print(i);
+}
+""",
+    "function": """
+int add(int a, int b) {
+    return a + b;
+}
+
+int x = add(3, 4);
+print(x);
+""",
+    "if": """
+int a = 10;
+
+if (a) {
+    print(1);
+} else {
+    print(0);
+}
+""",
+    "if_compare": """
+int a = 10;
+
+if (a > 5) {
+    print(1);
+} else {
+    print(0);
+}
+""",
+    "precedence": """
+int a = 10;
+int b = a + 6 % 4 * 2;
+print(b);
+""",
+
+    # ---- broader coverage ----
+    "arithmetic": """
+int a = 17;
+int b = 5;
+float f = 2.5;
+print(a + b);
+print(a - b);
+print(a * b);
+print(a / b);
+print(a % b);
+print(-a % b);
+print(f * 2);
+print(f / 2);
+print(-f);
+print(1 + 2 * 3 - 4 / 2);
+""",
+    "logic": """
+bool t = true;
+bool f = false;
+print(t && f);
+print(t || f);
+print(!t);
+print(!f && (1 < 2));
+print(3 >= 3);
+print(2 != 2);
+print(1 == 1.0);
+print(0 || 0);
+print(5 && 7);
+""",
+    "strings": """
+string s = "hello";
+char c = 'w';
+string t = s + " " + c;
+print(t);
+print(s == "hello");
+print(s < "world");
+print(s * 2);
+""",
+    "scopes": """
+int x = 1;
+if (true) {
+    int x = 2;
+    print(x);
+    x = 3;
+    print(x);
+}
+print(x);
+int y = 0;
+while (y < 3) {
+    int z = y * 10;
+    y = y + 1;
+    print(z);
+}
+""",
+    "nested_loops": """
+int i = 0;
+int total = 0;
+while (i < 10) {
+    int j = 0;
+    while (j < 10) {
+        if (j == i) {
+            j = j + 1;
+            continue;
+        }
+        if (j > 7) {
+            break;
+        }
+        total = total + i * j;
+        j = j + 1;
+    }
+    i = i + 1;
+}
+print(total);
+""",
+    "recursion": """
+int fib(int n) {
+    if (n < 2) {
+        return n;
+    }
+    return fib(n - 1) + fib(n - 2);
+}
+
+int fact(int n) {
+    if (n <= 1) {
+        return 1;
+    }
+    return n * fact(n - 1);
+}
+
+print(fib(15));
+print(fact(10));
+""",
+    "functions": """
+int counter = 0;
+
+int bump(int by) {
+    counter = counter + by;
+    return counter;
+}
+
+int nothing(int x) {
+    x = x + 1;
+}
+
+int sign(int x) {
+    if (x < 0) {
+        return -1;
+    }
+    if (x == 0) {
+        return 0;
+    }
+    return 1;
+}
+
+int first_even(int limit) {
+    int i = 1;
+    while (i < limit) {
+        if (i % 2 == 0) {
+            return i;
+        }
+        i = i + 1;
+    }
+    return -1;
+}
+
+float half(float x) {
+    return x / 2;
+}
+
+bump(3);
+bump(4);
+print(counter);
+print(sign(-5));
+print(sign(0));
+print(sign(9));
+print(first_even(10));
+print(half(7));
+print(bump(1));
+print(nothing(1));
+""",
+    "loops_in_functions": """
+int sum_to(int n) {
+    int total = 0;
+    int i = 1;
+    while (true) {
+        if (i > n) {
+            break;
+        }
+        total = total + i;
+        i = i + 1;
+    }
+    return total;
+}
+
+int k = 0;
+while (k < 4) {
+    print(sum_to(k * 10));
+    k = k + 1;
+}
+""",
+    "argument_order": """
+int a = 10;
+int b = 20;
+
+int sub(int a, int b) {
+    return a - b;
+}
+
+print(sub(b, a));
+print(sub(a, sub(b, a)));
+""",
+    "dynamic_scoping": """
+int x = 1;
+int f() {
+    return x;
+}
+int g() {
+    int x = 2;
+    return f();
+}
+int set() {
+    x = 3;
+    return x;
+}
+int h() {
+    int x = 4;
+    print(set());
+    return x;
+}
+print(g());
+print(h());
+print(x);
+""",
+    "nested_functions": """
+int outer(int n) {
+    int inner() {
+        return n;
+    }
+    if (n > 0) {
+        return outer(n - 1) + inner();
+    }
+    return inner();
+}
+print(outer(3));
+""",
+    "block_function": """
+if (true) {
+    int g() {
+        return 1;
+    }
+    print(g());
+}
+print(g());
+""",
+    "runtime_error": """
+int a = 4;
+print(a);
+print(a / 0);
+print(a);
+""",
+}
+
+
+def run_capture(make_interpreter, code, analyze=True):
+    # Output of a run (plus the error message, if any)
+    ast = Parser(Lexer(code)).parse()
+    if analyze:
+        SemanticAnalyzer().analyze(ast)
+    return run_ast_capture(make_interpreter, ast)
+
+
+def run_ast_capture(make_interpreter, ast):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        try:
+            make_interpreter().interpret(ast)
+        except Exception as e:
+            print(f"<error: {e}>")
+    return out.getvalue()
+
+
+def check_engine(make_interpreter, samples=SAMPLES):
+    # Assert an engine matches the tree-walker on every sample
+    for name, code in samples.items():
+        expected = run_capture(Interpreter, code)
+        actual = run_capture(make_interpreter, code)
+        assert actual == expected, (
+            f"{name}: expected\n{expected}\ngot\n{actual}"
+        )
+    return len(samples)
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import threading
+
+from fastapi.testclient import TestClient
+
+import backend.main as main
+from backend.scheduler import QueueFull, Scheduler
+
+
+client = TestClient(main.app)
+
+# duplicates run once; every program still gets its line
+programs = [
+    {"code": "print(1 + 1);"},
+    {"code": "int i = 0; while (i < 5000) { i = i + 1; } print(i);", "engine": "vm"},
+    {"code": "print(1 + 1);"},
+    {"code": "print(y);"},
+    {"code": "print(1 + 1);", "engine": "vm"},
+    {"code": "while (true) { }", "max_steps": 10},
+]
+response = client.post("/run/batch", json={"programs": programs})
+print(response.status_code, response.headers["content-type"],
+      response.headers["x-batch-size"], response.headers["x-batch-unique"])
+lines = sorted((json.loads(line) for line in response.text.splitlines()), key=lambda r: r["index"])
+for line in lines:
+    print(line)
+
+print(client.post("/run/async", json={"code": "print(6 * 7);"}).json())
+
+# more than MAX_BATCH programs is refused outright
+too_many = {"programs": [{"code": "print(1);"}] * (main.MAX_BATCH + 1)}
+print(client.post("/run/batch", json=too_many).status_code)
+
+
+# a full queue answers 503 and queues nothing
+release = threading.Event()
+
+
+def blocked(data):
+    release.wait()
+    return {"output": data.code}
+
+
+saved = main.scheduler
+main.scheduler = Scheduler(blocked, workers=1, max_queue=2)
+try:
+    main.scheduler.submit([main.CodeInput(code="a"), main.CodeInput(code="b")])
+    response = client.post("/run/batch", json={"programs": [{"code": "c"}, {"code": "d"}]})
+    print(response.status_code, response.headers["retry-after"], response.json())
+    response = client.post("/run/async", json={"code": "c"})
+    print(response.status_code, response.json())
+    print(main.scheduler.stats())
+    release.set()
+finally:
+    main.scheduler.close()
+    main.scheduler = saved
+
+
+# cancelling programs that have not started frees their queue slots
+async def cancel_queued():
+    gate = threading.Event()
+    scheduler = Scheduler(lambda data: gate.wait() and {"output": data.code}, workers=1, max_queue=4)
+    futures = scheduler.submit([main.CodeInput(code=str(i)) for i in range(4)])
+    try:
+        scheduler.submit([main.CodeInput(code="late")])
+    except QueueFull as e:
+        print(e)
+    await asyncio.sleep(0.05)
+    for future in futures[1:]:
+        future.cancel()
+    await asyncio.sleep(0)   # the cancellation reaches the executor on the next loop pass
+    gate.set()
+    print(await futures[0])
+    await asyncio.sleep(0.05)
+    print(scheduler.stats())
+    scheduler.close()
+
+
+asyncio.run(cancel_queued())
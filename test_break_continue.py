@@ -22,3 +22,25 @@ while (i < 5) {
 
 ast = Parser(Lexer(code)).parse()
 Interpreter().interpret(ast)
+
+# break / continue outside a loop of their own function are errors, the
+# same on every engine
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.bytecode.codegen import BytecodeCompiler
+from compiler.errors import CompilerError
+
+outside = {
+    "top level": "print(1);\nbreak;\nprint(2);",
+    "in an if": "if (true) {\n    continue;\n}",
+    "in a function": "int f() {\n    break;\n    return 1;\n}\nwhile (true) {\n    f();\n}",
+    "after a loop": "while (false) {\n}\ncontinue;",
+}
+for title, source in outside.items():
+    errors = []
+    for check in (SemanticAnalyzer().analyze,
+                  lambda tree: BytecodeCompiler().compile_main(tree.statements)):
+        try:
+            check(Parser(Lexer(source)).parse())
+        except CompilerError as e:
+            errors.append((e.message, e.line))
+    print(title, errors)
@@ -0,0 +1,86 @@
+from compiler.lexer.lexer import Lexer
+from compiler.parser.parser import Parser
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.interpreter.budget import Budget
+from compiler.interpreter.output import OutputBuffer
+from compiler.errors import LimitExceeded
+from compiler.pipeline import ENGINES, create_interpreter, execute
+
+
+def analysed(code):
+    ast = Parser(Lexer(code)).parse()
+    SemanticAnalyzer().analyze(ast)
+    return ast
+
+
+def limit_hit(engine, ast, output=None, **options):
+    output = output or OutputBuffer()
+    try:
+        execute(create_interpreter(engine, output=output, **options), ast)
+    except LimitExceeded as e:
+        return e.limit, e.maximum, e.line, output.getvalue().split()
+    return None, output.getvalue().split()
+
+
+endless = analysed("""
+int i = 0;
+while (true) {
+    i = i + 1;
+}
+""")
+
+# ten iterations plus two calls: exactly 12 steps (the python engine
+# charges a call on the line of the function, the others at the call)
+counted = analysed("""
+int twice(int x) {
+    return x * 2;
+}
+int i = 0;
+while (i < 10) {
+    i = i + 1;
+}
+print(twice(i));
+print(twice(1));
+""")
+
+spin = analysed("""
+int spin(int n) {
+    return spin(n + 1);
+}
+print(spin(0));
+""")
+
+for engine in ENGINES:
+    print(engine, limit_hit(engine, endless, budget=Budget(max_steps=5000)))
+    print(engine, limit_hit(engine, endless, budget=Budget(max_seconds=0.05)))
+    print(engine, limit_hit(engine, counted, budget=Budget(max_steps=12)))
+    print(engine, limit_hit(engine, counted, budget=Budget(max_steps=11)))
+    print(engine, limit_hit(engine, counted, budget=Budget(max_steps=12, interval=3)))
+
+# the vm runs spin() as a tail call forever without a budget
+print(limit_hit("vm", spin, budget=Budget(max_steps=100000)))
+
+# the other run limits are LimitExceeded too
+print(limit_hit("tree", spin, max_depth=50))
+print(limit_hit("closure", counted, output=OutputBuffer(max_bytes=3)))
+
+# text stops growing at MAX_STRING_LENGTH characters, budget or not
+doubling = analysed("""
+string s = "x";
+int i = 0;
+while (i < 40) {
+    s = s + s;
+    i = i + 1;
+}
+print(i);
+""")
+repeated = analysed("""
+print("ab" * 3);
+string s = "ab" * 20000000;
+""")
+for engine in ENGINES:
+    print(engine, limit_hit(engine, doubling), limit_hit(engine, repeated))
+
+budget = Budget(max_steps=1000)
+execute(create_interpreter("closure", output=OutputBuffer(), budget=budget), counted)
+print("steps used:", budget.used())
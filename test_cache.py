@@ -0,0 +1,47 @@
+import tempfile
+
+from compiler.cache import ProgramCache, source_hash
+from compiler.parser.compact_ast import NodeStore
+from compiler.interpreter.interpreter import Interpreter
+
+code = """
+int square(int x) {
+    return x * x;
+}
+
+int i = 1;
+while (i <= 3) {
+    print(square(i));
+    i = i + 1;
+}
+print("ok");
+"""
+
+with tempfile.TemporaryDirectory() as directory:
+    first = ProgramCache(directory=directory)
+    program = first.load(code)
+    assert first.load(code) is program
+    print(first.stats())
+
+    # A fresh cache (e.g. after a restart) loads the binary AST from disk
+    second = ProgramCache(directory=directory)
+    restored = second.load(code)
+    print(second.stats())
+    assert second.disk_hits == 1 and second.misses == 0
+    Interpreter().interpret(restored)
+
+    # Corrupt files are treated as a miss
+    with open(second.path(source_hash(code)), "wb") as f:
+        f.write(b"CGAST\x00")
+    third = ProgramCache(directory=directory)
+    third.load(code)
+    assert third.misses == 1
+
+# Only max_entries programs stay in memory
+small = ProgramCache(max_entries=2)
+for n in range(4):
+    small.load(f"print({n});")
+assert small.stats()["entries"] == 2
+
+data = NodeStore.from_ast(program).to_bytes()
+assert NodeStore.from_bytes(data).to_bytes() == data
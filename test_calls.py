@@ -0,0 +1,71 @@
+from compiler.lexer.lexer import Lexer
+from compiler.parser.parser import Parser
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.interpreter.interpreter import Interpreter
+from compiler.interpreter.closure_compiler import ClosureCompiler
+from compiler.interpreter.environment import Environment
+from sample_programs import run_ast_capture
+
+code = """
+int inc(int x) {
+    return x + 1;
+}
+
+int down(int n) {
+    if (n == 0) {
+        return 0;
+    }
+    return inc(down(n - 1));
+}
+
+if (true) {
+    if (true) {
+        int outer(int x) {
+            int inner(int y) {
+                return y * 2;
+            }
+            return inner(x) + inc(x);
+        }
+        print(outer(5));
+    }
+}
+print(down(20));
+"""
+
+ast = Parser(Lexer(code)).parse()
+SemanticAnalyzer().analyze(ast)
+
+# every call here is resolved to its declaration
+inc, down = ast.statements[0], ast.statements[1]
+ret = down.body.statements[1]
+print(ret.expr.target is inc, ret.expr.args[0].target is down)
+
+# resolved calls never search the environments
+def no_lookup(self, name):
+    raise AssertionError(f"get_function('{name}') called")
+
+lookup = Environment.get_function
+Environment.get_function = no_lookup
+try:
+    for make in (Interpreter, ClosureCompiler):
+        print(make.__name__, run_ast_capture(make, ast).split())
+finally:
+    Environment.get_function = lookup
+
+# a call outside the block that declares the function is looked up at
+# run time, and still fails once that block has ended
+code = """
+if (true) {
+    int g() {
+        return 1;
+    }
+    print(g());
+}
+print(g());
+"""
+
+ast = Parser(Lexer(code)).parse()
+SemanticAnalyzer().analyze(ast)
+print(ast.statements[1].expr.target)
+for make in (Interpreter, ClosureCompiler):
+    print(make.__name__, run_ast_capture(make, ast).splitlines())
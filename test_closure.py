@@ -0,0 +1,16 @@
+from compiler.interpreter.closure_compiler import ClosureCompiler
+from sample_programs import check_engine, run_capture
+
+count = check_engine(ClosureCompiler)
+print(f"ClosureCompiler matches Interpreter on {count} programs")
+
+print(run_capture(ClosureCompiler, """
+int square(int x) {
+    return x * x;
+}
+int i = 0;
+while (i < 4) {
+    print(square(i));
+    i = i + 1;
+}
+"""), end="")
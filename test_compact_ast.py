@@ -0,0 +1,41 @@
+from compiler.lexer.lexer import Lexer
+from compiler.parser.parser import Parser
+from compiler.parser.compact_ast import NodeStore
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.interpreter.interpreter import Interpreter
+
+code = """
+int fact(int n) {
+    if (n <= 1) {
+        return 1;
+    }
+    return n * fact(n - 1);
+}
+
+float f = 2.5;
+string s = "done";
+int i = 0;
+while (i < 3) {
+    i = i + 1;
+    if (i == 2) { continue; }
+    print(fact(i + 2));
+}
+print(-f);
+print(s);
+"""
+
+ast = Parser(Lexer(code)).parse()
+
+# Nodes carry no per-instance __dict__
+assert not hasattr(ast, "__dict__")
+assert not hasattr(ast.statements[0], "__dict__")
+
+store = NodeStore.from_ast(ast)
+print("nodes:", len(store), "array bytes:", store.nbytes())
+
+# The store is only a storage format: it rebuilds a tree the visitors can walk
+rebuilt = store.to_ast()
+assert NodeStore.from_ast(rebuilt).fields == store.fields
+
+SemanticAnalyzer().analyze(rebuilt)
+Interpreter().interpret(rebuilt)
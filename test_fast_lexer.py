@@ -0,0 +1,55 @@
+from compiler.lexer.lexer import Lexer
+from compiler.lexer.fast_lexer import FastLexer
+from compiler.lexer.tokens import EOF
+
+
+def bulk(code):
+    try:
+        return [(t.type, t.value, t.line) for t in FastLexer(code).tokenize()]
+    except Exception as e:
+        return ("ERROR", str(e))
+
+
+def lex(lexer_cls, code):
+    lexer = lexer_cls(code)
+    tokens = []
+    try:
+        while True:
+            tok = lexer.get_next_token()
+            tokens.append((tok.type, tok.value, tok.line))
+            if tok.type == EOF:
+                return tokens
+    except Exception as e:
+        tokens.append(("ERROR", str(e)))
+        return tokens
+
+
+samples = [
+    """
+int a = 10;
+float f = 3.25 + 1. * 2;
+string s = "multi
+line";
+char c = 'x';
+bool ok = (a >= 5) && !(f != 2.0) || a <= 1 == false;
+while (a > 0) { a = a - 1; }
+""",
+    "int x1_y = 1.2.3;",
+    "\tprint('\n');\n\n   ",
+    "int café = 1; print(café);",
+    "",
+    "string s = \"unterminated",
+    "int a = 1 @ 2;",
+    "char c = 'ab';",
+    "int a = 1;\r\n",
+]
+
+for code in samples:
+    expected = lex(Lexer, code)
+    assert lex(FastLexer, code) == expected, code
+    if expected[-1][0] == "ERROR":
+        assert bulk(code) == expected[-1], code
+    else:
+        assert bulk(code) == expected, code
+
+print("FastLexer matches Lexer on", len(samples), "samples")
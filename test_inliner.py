@@ -0,0 +1,83 @@
+from compiler.lexer.lexer import Lexer
+from compiler.parser.parser import Parser
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.interpreter.interpreter import Interpreter
+from compiler.optimizer.optimizer import optimize_program
+from compiler.optimizer.inliner import Inliner
+from sample_programs import SAMPLES, run_capture, run_ast_capture
+
+
+def analyzed(code):
+    ast = Parser(Lexer(code)).parse()
+    SemanticAnalyzer().analyze(ast)
+    return ast
+
+
+code = """
+int g = 5;
+
+int sq(int x) {
+    return x * x;
+}
+
+int add3(int a, int b, int c) {
+    return a + sq(b) + c;
+}
+
+int fact(int n) {
+    if (n <= 1) {
+        return 1;
+    }
+    return n * fact(n - 1);
+}
+
+int uses_global(int x) {
+    return x + g;
+}
+
+int noisy(int x) {
+    print(x);
+    return x;
+}
+
+int i = 0;
+while (i < 3) {
+    print(sq(i));
+    print(sq(i + 1));
+    print(add3(i, 2, i * 10));
+    print(uses_global(i));
+    print(sq(noisy(i)));
+    i = i + 1;
+}
+print(fact(5));
+"""
+
+ast = analyzed(code)
+inliner = Inliner()
+inliner.transform(ast)
+for line, call, name in inliner.inlined:
+    print(f"line {line}: {call}")
+print("inlinable:", sorted(inliner.inlinable))
+
+optimized, _ = optimize_program(ast)
+assert run_ast_capture(Interpreter, optimized) == run_capture(Interpreter, code)
+
+# a small threshold keeps add3 out
+small = Inliner(max_size=3)
+small.transform(ast)
+print("inlinable at size 3:", sorted(small.inlinable))
+
+for name, source in SAMPLES.items():
+    optimized, _ = optimize_program(analyzed(source))
+    assert run_ast_capture(Interpreter, optimized) == run_capture(Interpreter, source), name
+print(f"inlined programs match on {len(SAMPLES)} programs")
+
+# a call moved into the caller would see the caller's variables (h
+# reads x), or assign a variable passed by name (h sets x): neither
+# g is inlined
+for source in ("int x = 100; int h() { return x; } int g(int x) { return h(); } print(g(5));",
+               "int x = 1; int h() { x = 10; return 0; } int g(int a) { return h() + a; } print(g(x));"):
+    optimized, changes = optimize_program(analyzed(source))
+    assert not changes, changes
+    assert run_ast_capture(Interpreter, optimized) == run_capture(Interpreter, source)
+print("calls that would change meaning are not inlined")
@@ -0,0 +1,93 @@
+from compiler.lexer.lexer import Lexer
+from compiler.parser.parser import Parser
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.interpreter.interpreter import Interpreter
+from compiler.optimizer.optimizer import optimize_program
+from sample_programs import SAMPLES, run_capture, run_ast_capture
+
+code = """
+int n = 4;
+int limit = 50;
+int offset = 3;
+int counter = 0;
+
+int sq(int x) {
+    return x * x;
+}
+
+int bump() {
+    counter = counter + 1;
+    return counter;
+}
+
+int i = 0;
+while (i < n * 2 && sq(n) > 0) {
+    int j = 0;
+    while (j < n + 1) {
+        print(limit - offset + j);
+        j = j + 1 + limit / 100;
+    }
+    print(limit * 2 - counter);
+    print(10 / offset);
+    bump();
+    i = i + 5;
+}
+"""
+
+ast = Parser(Lexer(code)).parse()
+SemanticAnalyzer().analyze(ast)
+optimized, changes = optimize_program(ast)
+for change in changes:
+    print(change)
+
+# division may raise, and counter is assigned by bump(): neither moves
+assert not any("/" in change or "counter" in change for change in changes)
+assert run_ast_capture(Interpreter, optimized) == run_capture(Interpreter, code)
+
+for name, source in SAMPLES.items():
+    ast = Parser(Lexer(source)).parse()
+    SemanticAnalyzer().analyze(ast)
+    optimized, _ = optimize_program(ast)
+    assert run_ast_capture(Interpreter, optimized) == run_capture(Interpreter, source), name
+print(f"hoisted programs match on {len(SAMPLES)} programs")
+
+# an impure call runs before a later part of the condition that can
+# raise: 10 / n stays in the loop, so "tick" is printed before the error
+code = """
+int n = 0;
+int i = 0;
+int tick() {
+    print(1);
+    return 0;
+}
+while (tick() < 10 / n && i < n * 2) {
+    i = i + 1;
+}
+"""
+ast = Parser(Lexer(code)).parse()
+SemanticAnalyzer().analyze(ast)
+optimized, changes = optimize_program(ast)
+assert changes == ["line 8: hoisted (n * 2) out of the loop at line 8 as licm$0"], changes
+assert run_ast_capture(Interpreter, optimized) == run_capture(Interpreter, code) == \
+    "1\n<error: division by zero>\n"
+
+# x is declared int but holds no value (f returns nothing): x + 1 would
+# raise, and the loop never runs, so it stays in the body
+code = """
+int f() {
+    print(0);
+}
+int x = f();
+int i = 0;
+while (i < 0) {
+    print(x + 1);
+    i = i + 1;
+}
+print(5);
+"""
+ast = Parser(Lexer(code)).parse()
+SemanticAnalyzer().analyze(ast)
+optimized, changes = optimize_program(ast)
+assert not changes, changes
+assert run_ast_capture(Interpreter, optimized) == run_capture(Interpreter, code) == "0\n5\n"
+print("raising loop parts stay in place")
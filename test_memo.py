@@ -0,0 +1,68 @@
+from compiler.lexer.lexer import Lexer
+from compiler.parser.parser import Parser
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.interpreter.interpreter import Interpreter
+from compiler.interpreter.slot_interpreter import SlotInterpreter
+from compiler.interpreter.closure_compiler import ClosureCompiler
+from sample_programs import SAMPLES, check_engine, run_ast_capture
+
+code = """
+int total = 0;
+
+int fib(int n) {
+    if (n < 2) {
+        return n;
+    }
+    return fib(n - 1) + fib(n - 2);
+}
+
+int binom(int n, int k) {
+    if (k == 0 || k == n) {
+        return 1;
+    }
+    return binom(n - 1, k - 1) + binom(n - 1, k);
+}
+
+int twice(int x) {
+    return fib(x) * 2;
+}
+
+int loud(int x) {
+    print(x);
+    return x;
+}
+
+int add_total(int x) {
+    return x + total;
+}
+
+int calls_loud(int x) {
+    return loud(x);
+}
+
+print(fib(60));
+print(binom(40, 20));
+print(twice(30));
+"""
+
+ast = Parser(Lexer(code)).parse()
+SemanticAnalyzer().analyze(ast)
+
+# purity
+for stmt in ast.statements:
+    if hasattr(stmt, "pure"):
+        print(stmt.name, "pure" if stmt.pure else "impure")
+
+for make in (Interpreter, SlotInterpreter, ClosureCompiler):
+    engine = make(memoize=True)
+    print(run_ast_capture(lambda: engine, ast), end="")
+    print(make.__name__, engine.memo.stats())
+
+# bounded: the memo never holds more than max_entries results
+small = Interpreter(memoize=8)
+print(run_ast_capture(lambda: small, ast).split()[0], small.memo.stats()["entries"])
+
+# memoized runs print what the plain tree-walker prints
+for make in (Interpreter, SlotInterpreter, ClosureCompiler):
+    check_engine(lambda: make(memoize=True))
+print(f"memoized engines match Interpreter on {len(SAMPLES)} programs")
@@ -0,0 +1,86 @@
+from compiler.lexer.lexer import Lexer
+from compiler.parser.parser import Parser
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.parser.compact_ast import NodeStore
+from compiler.interpreter.interpreter import Interpreter
+from compiler.optimizer.optimizer import optimize_program
+from sample_programs import SAMPLES, run_capture, run_ast_capture
+
+
+def parse(code):
+    ast = Parser(Lexer(code)).parse()
+    SemanticAnalyzer().analyze(ast)
+    return ast
+
+
+def snapshot(ast):
+    store = NodeStore.from_ast(ast)
+    return [list(a) for a in (store.kinds, store.lines, store.fields, store.lists)], store.consts
+
+
+# Optimized programs print exactly what the originals print
+for name, code in SAMPLES.items():
+    ast = parse(code)
+    before = snapshot(ast)
+    optimized, _ = optimize_program(ast)
+    assert snapshot(ast) == before, f"{name}: input tree modified"
+
+    expected = run_capture(Interpreter, code)
+    actual = run_ast_capture(Interpreter, optimized)
+    assert actual == expected, f"{name}: expected\n{expected}\ngot\n{actual}"
+print(f"optimized programs match on {len(SAMPLES)} programs")
+
+optimized, changes = optimize_program(parse("""
+int x = 7;
+string s = "ab";
+print(x * 1 + (2 * 3));
+print(s * 1);
+print(1 / 0);
+print(true && false);
+print(!true);
+if (1 < 2) {
+    print(1);
+} else {
+    print(2);
+}
+while (false) {
+    print(3);
+}
+int f(int n) {
+    if (n > 0) {
+        return n;
+        print(n);
+    }
+    return 0;
+}
+print(f(-4));
+"""))
+for change in changes:
+    print(change)
+print(len(optimized.statements), "top-level statements left")
+print(run_ast_capture(Interpreter, optimized), end="")
+
+# identities keep -0.0 and the error of a function that returns nothing
+code = """
+float z = -0.0;
+int k = -0.0;
+int f() {
+    print(1);
+}
+print(z + 0);
+print(0 + k);
+print(z - 0);
+print(z * 1);
+print(f() * 1);
+"""
+optimized, changes = optimize_program(parse(code))
+print(changes)
+assert run_ast_capture(Interpreter, optimized) == run_capture(Interpreter, code)
+print(run_capture(Interpreter, code), end="")
+
+# nor for a variable holding that missing value
+code = "int f() {\n print(7);\n}\nint x = f();\nprint(x * 1);\nprint(x - 0);"
+optimized, changes = optimize_program(parse(code))
+assert not changes, changes
+assert run_ast_capture(Interpreter, optimized) == run_capture(Interpreter, code)
+print(run_capture(Interpreter, code), end="")
@@ -0,0 +1,70 @@
+import contextlib
+import io
+import threading
+
+from compiler.lexer.lexer import Lexer
+from compiler.parser.parser import Parser
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.interpreter.output import OutputBuffer, OutputLimitError
+from compiler.pipeline import ENGINES, create_interpreter
+
+
+def analysed(code):
+    ast = Parser(Lexer(code)).parse()
+    SemanticAnalyzer().analyze(ast)
+    return ast
+
+
+def counting(tag, n):
+    return analysed(f"""
+int i = 0;
+while (i < {n}) {{
+    print({tag} * 1000 + i);
+    i = i + 1;
+}}
+""")
+
+
+# every engine writes to its own sink, never to sys.stdout
+for engine in ENGINES:
+    output = OutputBuffer()
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout):
+        create_interpreter(engine, output=output).interpret(counting(1, 3))
+    print(engine, output.getvalue().split(), repr(stdout.getvalue()))
+
+# concurrent runs keep their output apart
+programs = [(tag, engine, counting(tag, 200)) for tag in range(1, 9) for engine in ENGINES]
+results = {}
+
+
+def run(tag, engine, ast):
+    output = OutputBuffer()
+    create_interpreter(engine, output=output).interpret(ast)
+    results[tag, engine] = output.getvalue()
+
+
+threads = [threading.Thread(target=run, args=program) for program in programs]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+assert all(
+    results[tag, engine] == "".join(f"{tag * 1000 + i}\n" for i in range(200))
+    for tag, engine, _ in programs
+)
+print("concurrent runs:", len(results))
+
+# the size cap keeps what fits and stops the run
+for engine in ENGINES:
+    output = OutputBuffer(max_bytes=10)
+    try:
+        create_interpreter(engine, output=output).interpret(counting(1, 100))
+    except OutputLimitError as e:
+        print(engine, repr(output.getvalue()), e.message)
+
+output = OutputBuffer(max_bytes=5)
+try:
+    output.write("ééé\n")
+except OutputLimitError:
+    print(repr(output.getvalue()), output.size)
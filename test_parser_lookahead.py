@@ -0,0 +1,29 @@
+from compiler.lexer.lexer import Lexer
+from compiler.lexer.fast_lexer import FastLexer
+from compiler.lexer.tokens import IDENTIFIER, ASSIGN, INT_LIT, SEMICOLON, EOF
+from compiler.parser.parser import Parser
+
+code = """
+int a = 1;
+a
+  =
+    2;
+print(a);
+"""
+
+for lexer_cls in (Lexer, FastLexer):
+    parser = Parser(lexer_cls("a = 5; print(a);"))
+
+    # k-token lookahead without consuming anything
+    assert parser.current_token.type == IDENTIFIER
+    assert parser.peek_token().type == ASSIGN
+    assert parser.peek_token(2).type == INT_LIT
+    assert parser.peek_token(3).type == SEMICOLON
+    assert parser.peek_token(50).type == EOF
+    assert parser.current_token.type == IDENTIFIER
+
+    # peeking across newlines no longer shifts line numbers
+    ast = Parser(lexer_cls(code)).parse()
+    lines = [stmt.line for stmt in ast.statements]
+    print(lexer_cls.__name__, lines)
+    assert lines == [2, 3, 6]
@@ -0,0 +1,46 @@
+from compiler.lexer.lexer import Lexer
+from compiler.parser.parser import Parser
+from compiler.parser.compact_ast import NodeStore
+
+
+def shape(code, pratt):
+    try:
+        ast = Parser(Lexer(code), pratt=pratt).parse()
+    except Exception as e:
+        return str(e)
+    store = NodeStore.from_ast(ast)
+    return list(store.kinds), list(store.lines), list(store.fields), store.consts
+
+
+samples = [
+    "int a = 1 + 2 * 3 - 4 / 5 % 6;",
+    "bool b = 1 < 2 == 3 >= 4 != 5 <= 6 > 7;",
+    "bool c = !x && y || -z * -(-w) == !(p || q) && r;",
+    "print(((1 + 2)) * (3 - (4 - 5)));",
+    "int d = f(1, g(2 + 3) * -4, (5)) - - 6;",
+    "int e = a\n  +\n  b\n  * c;",
+    "int bad = (1 + 2;",
+    "int bad = 1 + ;",
+    "int bad = ();",
+    "print((1 + 2)));",
+    "int bad = 1 2;",
+]
+
+for code in samples:
+    assert shape(code, True) == shape(code, False), code
+
+# Parser nesting depth is no longer limited by the Python stack
+depth = 5000
+deep = "print(" + "(" * depth + "1" + " + 1)" * depth + ");"
+node = Parser(Lexer(deep)).parse().statements[0].expr
+levels = 0
+while type(node).__name__ == "BinOp":
+    node, levels = node.left, levels + 1
+print("nested parentheses:", levels)
+
+unary = "print(" + "-" * depth + "2);"
+node = Parser(Lexer(unary)).parse().statements[0].expr
+levels = 0
+while type(node).__name__ == "UnaryOp":
+    node, levels = node.expr, levels + 1
+print("nested unary operators:", levels)
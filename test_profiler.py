@@ -0,0 +1,80 @@
+from fastapi.testclient import TestClient
+
+import backend.main as main
+from compiler.lexer.lexer import Lexer
+from compiler.parser.parser import Parser
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.interpreter.interpreter import Interpreter
+from compiler.interpreter.profiler import ProfilingInterpreter
+from compiler.interpreter.output import OutputBuffer
+from compiler.interpreter.budget import Budget
+from compiler.errors import LimitExceeded
+
+
+code = """int fib(int n) {
+    if (n < 2) {
+        return n;
+    }
+    return fib(n - 1) + fib(n - 2);
+}
+int square(int x) {
+    return x * x;
+}
+int i = 0;
+int total = 0;
+while (i < 10) {
+    total = total + square(i);
+    i = i + 1;
+}
+print(total);
+print(fib(10));"""
+
+
+def analysed(code):
+    ast = Parser(Lexer(code)).parse()
+    SemanticAnalyzer().analyze(ast)
+    return ast
+
+
+# same output as the plain tree walker
+plain = OutputBuffer()
+Interpreter(output=plain).interpret(analysed(code))
+output = OutputBuffer()
+interpreter = ProfilingInterpreter(output=output)
+interpreter.interpret(analysed(code))
+print(output.getvalue() == plain.getvalue(), output.getvalue().split())
+
+report = interpreter.profile.report(code)
+lines = {line["line"]: line for line in report["lines"]}
+print([(n, lines[n]["hits"]) for n in (2, 3, 5, 8, 12, 13, 17)])
+print([(f["name"], f["calls"]) for f in report["functions"]])
+
+# inclusive >= exclusive everywhere; recursion is not counted twice
+assert all(line["inclusive_ms"] >= line["exclusive_ms"] for line in report["lines"])
+assert all(f["inclusive_ms"] <= report["total_ms"] for f in report["functions"])
+assert all(node["inclusive_ms"] <= report["total_ms"] for node in report["nodes"])
+fib = report["functions"][0]
+print(fib["name"], abs(fib["inclusive_ms"] - fib["exclusive_ms"]) < 0.01)   # fib only calls fib
+
+stacks = [line.rsplit(" ", 1)[0] for line in report["collapsed"]]
+print(stacks[:3], "<main>;square" in stacks, max(stack.count("fib") for stack in stacks))
+listing = report["listing"].splitlines()
+print(listing[0])
+print(repr(listing[4][:31]), listing[4][31:])
+print(listing[5][:9], listing[5][31:])
+
+# a run stopped midway keeps what was measured until then
+interpreter = ProfilingInterpreter(output=OutputBuffer(), budget=Budget(max_steps=50))
+try:
+    interpreter.interpret(analysed("int i = 0; while (true) { i = i + 1; }"))
+except LimitExceeded as e:
+    print(e.limit, interpreter.profile.lines[1][0], len(interpreter.profile.nodes))
+
+
+# the endpoint
+client = TestClient(main.app)
+result = client.post("/profile", json={"code": code, "engine": "vm"}).json()
+print(result["output"], sorted(result["profile"]))
+print(client.post("/profile", json={"code": "print(y);"}).json())
+result = client.post("/profile", json={"code": "int i = 0; while (true) { i = i + 1; }", "max_steps": 100}).json()
+print(result["error"], result["profile"]["lines"][0]["hits"])
@@ -0,0 +1,97 @@
+from compiler.lexer.lexer import Lexer
+from compiler.parser.parser import Parser
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.bytecode.codegen import BytecodeCompiler
+from compiler.bytecode.opcodes import TAIL_CALL, CALL
+from compiler.pipeline import ENGINES, create_interpreter, execute
+from compiler.errors import RecursionLimitError
+from compiler.interpreter.output import OutputBuffer
+from compiler.limits import MAX_CALL_DEPTH
+from sample_programs import run_ast_capture
+
+code = """
+int count_down(int n, int acc) {
+    if (n == 0) {
+        return acc;
+    }
+    return count_down(n - 1, acc + 1);
+}
+
+int depth(int n) {
+    if (n == 0) {
+        return 0;
+    }
+    return 1 + depth(n - 1);
+}
+
+print(count_down(%d, 0));
+print(depth(%d));
+"""
+
+
+def analyzed(source):
+    ast = Parser(Lexer(source)).parse()
+    SemanticAnalyzer().analyze(ast)
+    return ast
+
+
+# `return f(...)` compiles to TAIL_CALL, other calls stay CALL
+compiler = BytecodeCompiler()
+compiler.compile_main(analyzed(code % (1, 1)).statements)
+for func in compiler.program.functions:
+    ops = func.code[::2]
+    print(func.name, "TAIL_CALL" if TAIL_CALL in ops else "CALL" if CALL in ops else "-")
+
+# The VM recurses as deep as its budget allows
+ast = analyzed(code % (200000, 50000))
+print(run_ast_capture(lambda: create_interpreter("vm"), ast), end="")
+
+# ... and reports running past the budget with the call's line
+try:
+    execute(create_interpreter("vm", max_depth=1000), analyzed("print(1);" + code % (10, 5000)))
+except RecursionLimitError as e:
+    print(f"line {e.line}: {e.message}")
+
+# Every engine honours the budget
+for engine in ENGINES:
+    output = run_ast_capture(lambda: create_interpreter(engine, max_depth=50), analyzed(code % (10, 100)))
+    assert "Maximum recursion depth exceeded (50 nested calls) in function 'depth'" in output, engine
+
+# The engines that recurse in Python go PYTHON_CALL_DEPTH deep, then
+# stop like the others, with the depth and the call's line
+for engine in ENGINES:
+    try:
+        output = OutputBuffer()
+        execute(create_interpreter(engine, output=output), analyzed(code % (10, 4000)))
+        execute(create_interpreter(engine, output=output), analyzed(code % (10, 50000)))
+    except RecursionLimitError as e:
+        print(engine, output.getvalue().split(), e.limit, e.maximum, e.line)
+    else:
+        print(engine, output.getvalue().split())
+
+# the python engine runs until Python's stack ends, near MAX_CALL_DEPTH
+try:
+    execute(create_interpreter("python", output=OutputBuffer()), analyzed(code % (10, 150000)))
+except RecursionLimitError as e:
+    print(e.message.split("(")[0], abs(e.maximum - MAX_CALL_DEPTH) < 1000, e.line)
+
+# Without the deep stack (Python before 3.11) Python's own limit stops
+# the recursing engines first; the error still names the call, also
+# when slots / vm handed the program to the tree-walker
+import sys
+import compiler.pipeline as pipeline
+
+fallback = "int x = 1; int f() { return x; } int g() { int x = 2; return f(); }\n"
+limit = sys.getrecursionlimit()
+pipeline.DEEP_PYTHON_STACK = False
+sys.setrecursionlimit(2000)
+try:
+    for engine, source in [(engine, code) for engine in ("tree", "slots", "closure")] + \
+                          [("slots", fallback + code), ("vm", fallback + code)]:
+        try:
+            execute(create_interpreter(engine, output=OutputBuffer()), analyzed(source % (10, 4000)))
+        except RecursionLimitError as e:
+            print(engine, e.message.split(") ")[-1], e.maximum < 4000, e.line)
+finally:
+    sys.setrecursionlimit(limit)
+    pipeline.DEEP_PYTHON_STACK = True
@@ -0,0 +1,83 @@
+import time
+
+from fastapi.testclient import TestClient
+
+import backend.main as main
+from backend.runner import CodeInput
+from backend.result_cache import ResultCache, normalized_source
+
+
+def request(code, **options):
+    return CodeInput(code=code, **options)
+
+
+cache = ResultCache(max_entries=3)
+cache.put(request("print(1);"), {"output": "1\n"})
+cache.put(request("print(y);"), {"error": "Variable 'y' not declared"})
+
+# trailing whitespace does not matter; options and line endings do
+print(cache.get(request("print(1);  \t")))
+print(cache.get(request("print(y);")))
+print(cache.get(request("print(1);", engine="vm")))
+print(cache.get(request("print(1);\r\n")))
+print(repr(normalized_source("int x = 1;   \nprint(x); \n\n")))
+
+# whitespace inside string and char literals is part of the program
+print(repr(normalized_source('string s = "a   \nb";  \nchar c = \' \';  ')))
+cache.put(request('string s = "a   \nb"; print(s + "|");'), {"output": "a   \nb|\n"})
+print(cache.get(request('string s = "a\nb"; print(s + "|");')))
+
+# timed-out and crashed runs are not kept
+cache.put(request("while (true) { }"), {"error": "Time limit exceeded (5 s)", "output": "",
+                                         "limit_exceeded": {"limit": "time", "maximum": 5, "line": 1}})
+cache.put(request("print(2);"), {"error": "crashed", "crashed": True})
+print(cache.get(request("while (true) { }")), cache.get(request("print(2);")))
+
+# bypass: neither read nor written
+cache.put(request("print(3);", cache=False), {"output": "3\n"})
+print(cache.get(request("print(1);", cache=False)), cache.get(request("print(3);")))
+
+# least recently used entries go first
+for n in range(4, 7):
+    cache.put(request(f"print({n});"), {"output": f"{n}\n"})
+print([cache.get(request(f"print({n});")) is not None for n in (1, 4, 5, 6)])
+
+# so do entries past max_bytes
+small = ResultCache(max_bytes=300)
+for n in range(5):
+    small.put(request(f"print({n});"), {"output": "x" * 100})
+print(small.stats()["entries"], small.stats()["bytes"] <= 300)
+
+# and expired ones
+short = ResultCache(ttl=0.05)
+short.put(request("print(1);"), {"output": "1\n"})
+print(short.get(request("print(1);")) is not None)
+time.sleep(0.1)
+print(short.get(request("print(1);")), short.stats()["expired"])
+
+print(cache.stats())
+
+
+# through the server
+main.result_cache = ResultCache()
+client = TestClient(main.app)
+program = {"code": "int i = 0; while (i < 1000) { i = i + 1; } print(i);"}
+print(client.post("/run", json=program).json())
+print(client.post("/run", json=program).json())
+print(client.post("/run/async", json=program).json())
+print(client.post("/run", json={**program, "cache": False}).json())
+
+response = client.post("/run/batch", json={"programs": [program, {"code": "print(5);"}, program]})
+print(response.headers["x-batch-unique"], response.headers["x-batch-cached"], len(response.text.splitlines()))
+
+spaced = {"code": 'string s = "a   \nb"; print(s + "|");'}
+plain = {"code": 'string s = "a\nb"; print(s + "|");'}
+print(client.post("/run", json=spaced).json(), client.post("/run", json=plain).json())
+response = client.post("/run/batch", json={"programs": [spaced, plain, {"code": spaced["code"] + "   "}]})
+print(response.headers["x-batch-unique"], sorted(response.text.splitlines()))
+
+# an error quotes the line without its trailing blanks, so the cached
+# answer fits both spellings
+print(client.post("/run", json={"code": "print(y);   "}).json())
+print(client.post("/run", json={"code": "print(y);"}).json())
+print(client.get("/run/stats").json()["results"])
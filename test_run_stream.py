@@ -0,0 +1,132 @@
+import asyncio
+import json
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+import backend.main as main
+from backend.runner import CodeInput, run_program
+from backend.worker_pool import WorkerPool
+from compiler.errors import RunCancelled
+from compiler.interpreter.budget import Budget
+from compiler.interpreter.output import StreamOutput
+from compiler.lexer.lexer import Lexer
+from compiler.parser.parser import Parser
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.pipeline import ENGINES, create_interpreter, execute
+
+
+ENDLESS = "int i = 0; print(1); while (true) { i = i + 1; }"
+
+
+def analysed(code):
+    ast = Parser(Lexer(code)).parse()
+    SemanticAnalyzer().analyze(ast)
+    return ast
+
+
+def cancel_soon(cancel, delay=0.2):
+    timer = threading.Timer(delay, cancel.set)
+    timer.start()
+    return timer
+
+
+def events(text):
+    # (event, data) pairs of a text/event-stream body
+    pairs = []
+    for block in text.strip().split("\n\n"):
+        event, data = block.split("\n")
+        pairs.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return pairs
+
+
+async def disconnect_early(code):
+    body = json.dumps({"code": code}).encode()
+    scope = {"type": "http", "asgi": {"version": "3.0", "spec_version": "2.4"},
+             "http_version": "1.1", "method": "POST", "scheme": "http", "path": "/run/stream",
+             "raw_path": b"/run/stream", "root_path": "", "query_string": b"",
+             "headers": [(b"content-type", b"application/json")],
+             "client": ("test", 1), "server": ("test", 80)}
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        raise OSError("connection closed")
+
+    try:
+        await main.app(scope, receive, send)
+    except Exception as e:
+        print(type(e).__name__)
+    start = time.perf_counter()
+    while main.scheduler.stats()["pending"] and time.perf_counter() - start < 3:
+        await asyncio.sleep(0.05)
+    return main.streams, time.perf_counter() - start < 1
+
+
+def main_test():
+    # take() hands on what was printed since the last take()
+    output = StreamOutput(max_bytes=8)
+    output.write("1\n")
+    output.write("22\n")
+    print(repr(output.take()), repr(output.take()))
+    try:
+        output.write("333\n")
+    except Exception as e:
+        print(type(e).__name__, repr(output.take()), output.size)
+
+    # every engine stops soon after the cancel event is set
+    for engine in ENGINES:
+        cancel = threading.Event()
+        output = StreamOutput()
+        cancel_soon(cancel)
+        start = time.perf_counter()
+        try:
+            execute(create_interpreter(engine, output=output, budget=Budget(cancel=cancel)), analysed(ENDLESS))
+        except RunCancelled as e:
+            print(engine, e.message, repr(output.take()), time.perf_counter() - start < 1)
+
+    # a streamed run leaves its output out of the response
+    output = StreamOutput()
+    print(run_program(CodeInput(code="print(1); print(2);"), output), repr(output.take()))
+    cancel = threading.Event()
+    cancel_soon(cancel)
+    print(run_program(CodeInput(code=ENDLESS), StreamOutput(), cancel))
+
+    # in a worker the output arrives while the program runs, and
+    # cancelling kills the worker
+    pool = WorkerPool(1)
+    try:
+        chunks = []
+        code = "int i = 0; while (i < 3) { print(i); int j = 0; while (j < 30000) { j = j + 1; } i = i + 1; }"
+        print(pool.run({"code": code}, chunks.append, threading.Event()), repr("".join(chunks)))
+        cancel = threading.Event()
+        cancel_soon(cancel)
+        chunks = []
+        print(pool.run({"code": ENDLESS}, chunks.append, cancel), chunks)
+        print(pool.run({"code": "print(3);"}))
+        print(pool.stats()["cancelled"])
+    finally:
+        pool.close()
+
+    # the endpoint (the test client hands over the body when it is complete)
+    main.result_cache.clear()
+    client = TestClient(main.app)
+    body = client.post("/run/stream", json={"code": "print(1); print(y);"}).text
+    print([(event, data) for event, data in events(body) if event != "start"])
+    body = client.post("/run/stream", json={"code": "print(1); print(2);"}).text
+    print([event for event, _ in events(body)], events(body)[0][1]["id"] is not None)
+
+    # a cached response is replayed as one chunk
+    client.post("/run", json={"code": "print(4);"})
+    print(events(client.post("/run/stream", json={"code": "print(4);"}).text))
+    print(client.post("/run/cancel/nope").status_code, main.streams)
+
+    # a client that is gone before the first event still cancels the run
+    print(asyncio.run(disconnect_early(ENDLESS)))
+
+
+# the pool starts processes: keep the script importable
+if __name__ == "__main__":
+    main_test()
@@ -0,0 +1,55 @@
+from compiler.lexer.lexer import Lexer
+from compiler.parser.parser import Parser
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.interpreter.slot_interpreter import SlotInterpreter
+from sample_programs import SAMPLES, check_engine, run_capture
+
+count = check_engine(SlotInterpreter)
+print(f"SlotInterpreter matches Interpreter on {count} programs")
+
+# (depth, slot) annotations
+code = """
+int a = 1;
+int b = 2;
+int f(int x) {
+    int y = x + b;
+    return y;
+}
+while (a < 3) {
+    int c = a;
+    if (c > 1) {
+        b = c;
+    }
+    a = a + 1;
+}
+"""
+ast = Parser(Lexer(code)).parse()
+SemanticAnalyzer().analyze(ast)
+
+decl_b = ast.statements[1]
+func = ast.statements[2]
+loop = ast.statements[3]
+y_decl = func.body.statements[0]
+x_plus_b = y_decl.expr
+assign_b = loop.body.statements[1].then_block.statements[0]
+
+print("b slot:", decl_b.slot)
+print("y slot:", y_decl.slot, "body slots:", func.body.nslots)
+print("x:", (x_plus_b.left.depth, x_plus_b.left.slot))
+print("b in f:", (x_plus_b.right.depth, x_plus_b.right.slot))
+print("b = c:", (assign_b.depth, assign_b.slot))
+print("c:", (assign_b.expr.depth, assign_b.expr.slot))
+
+print(run_capture(SlotInterpreter, code + "print(f(10));\nprint(b);"), end="")
+
+# functions that would see another variable through lexical slots than
+# through dynamic scoping run on the tree-walker
+slots = SlotInterpreter()
+print(run_capture(lambda: slots, SAMPLES["dynamic_scoping"]).split(), slots.fallback_reason)
+slots = SlotInterpreter()
+print(run_capture(lambda: slots, code + "print(f(10));").split(), slots.fallback_reason)
+
+# so do programs that call a function outside the block declaring it:
+# the slot engine's function table would still find it
+slots = SlotInterpreter()
+print(run_capture(lambda: slots, SAMPLES["block_function"]).split("\n"), slots.fallback_reason)
@@ -0,0 +1,75 @@
+import io
+
+from compiler.lexer.lexer import Lexer
+from compiler.lexer.stream_lexer import StreamLexer
+from compiler.lexer.tokens import EOF
+from compiler.parser.parser import Parser
+from compiler.pipeline import run_stream
+
+code = """
+int add(int a, int b) {
+    return a + b;
+}
+
+string s = "spans
+two lines";
+char c = 'é';
+int total = 0;
+int i = 0;
+while (i < 5) {
+    total = add(total, i);
+    i = i + 1;
+}
+print(total);
+print(s);
+print(c);
+"""
+
+
+def token_list(lexer):
+    tokens = []
+    while True:
+        tok = lexer.get_next_token()
+        tokens.append((tok.type, tok.value, tok.line))
+        if tok.type == EOF:
+            return tokens
+
+
+def chunks(text, size):
+    for i in range(0, len(text), size):
+        yield text[i:i + size]
+
+
+expected = token_list(Lexer(code))
+
+# Tokens must not depend on where the chunks are cut
+for size in (1, 2, 3, 7, 64):
+    assert token_list(StreamLexer(chunks(code, size))) == expected, size
+    data = code.encode("utf-8")
+    byte_chunks = (data[i:i + size] for i in range(0, len(data), size))
+    assert token_list(StreamLexer(byte_chunks)) == expected, size
+
+assert token_list(StreamLexer(io.StringIO(code), chunk_size=5)) == expected
+
+# Statements are produced one at a time
+parser = Parser(StreamLexer(io.BytesIO(code.encode("utf-8")), chunk_size=16))
+print([type(stmt).__name__ for stmt in parser.statements()])
+
+run_stream(io.StringIO(code))
+
+# An invalid char literal fails on its line, without reading the rest
+def counted(lines, seen):
+    for line in lines:
+        seen.append(line)
+        yield line
+
+
+for bad in ("char c = 'ab';\n", "char c = 'a\n", "char c = '"):
+    seen = []
+    try:
+        token_list(StreamLexer(counted([bad] + ["print(1);\n"] * 1000, seen)))
+    except Exception as e:
+        print(e, len(seen))
+
+newline = token_list(StreamLexer(chunks("char c = '\n';", 1)))
+print(newline == token_list(Lexer("char c = '\n';")), newline[3])
@@ -0,0 +1,82 @@
+from compiler.lexer.lexer import Lexer
+from compiler.parser.parser import Parser
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.interpreter.interpreter import Interpreter
+from compiler.transpiler.python_engine import PythonEngine, CodeCache, compile_program
+from sample_programs import check_engine, run_ast_capture
+
+
+def analysed(code):
+    ast = Parser(Lexer(code)).parse()
+    SemanticAnalyzer().analyze(ast)
+    return ast
+
+
+print("samples:", check_engine(PythonEngine))
+
+# block scoping, shadowing and division lowered to Python
+code = """
+int x = 1;
+int total = 0;
+if (true) {
+    print(x);
+    int x = 7;
+    print(x / 2);
+}
+int i = 0;
+while (i < 4) {
+    int x = i * 10;
+    i = i + 1;
+    if (x == 10) {
+        continue;
+    }
+    if (x > 20) {
+        break;
+    }
+    total = total + x;
+}
+print(x);
+print(total);
+print(true && 0);
+print(1 || 0);
+"""
+ast = analysed(code)
+code_object, reason = compile_program(ast)
+print(code_object is not None, reason)
+print(run_ast_capture(PythonEngine, ast) == run_ast_capture(Interpreter, ast))
+
+# programs the lowering rejects still run, on the tree-walker
+fallbacks = {
+    "nested function": """
+if (true) {
+    int g() { return 1; }
+    print(g());
+}
+""",
+    "dynamic scoping": """
+int x = 1;
+int show() { return x; }
+if (true) {
+    int x = 2;
+    print(show());
+}
+""",
+}
+for title, source in fallbacks.items():
+    ast = analysed(source)
+    engine = PythonEngine()
+    output = run_ast_capture(lambda: engine, ast)
+    assert output == run_ast_capture(Interpreter, ast), title
+    print(title, "->", engine.fallback_reason, output.split())
+
+engine = PythonEngine(memoize=True)
+run_ast_capture(lambda: engine, analysed("print(1);"))
+print(engine.fallback_reason, engine.memo.stats())
+
+# one compile per key
+cache = CodeCache()
+ast = analysed("int i = 0; while (i < 3) { i = i + 1; } print(i);")
+for _ in range(3):
+    compiled = cache.load("key", ast)
+    print(run_ast_capture(lambda: PythonEngine(compiled=compiled), ast), end="")
+print(cache.stats())
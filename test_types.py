@@ -0,0 +1,82 @@
+from compiler.lexer.lexer import Lexer
+from compiler.parser.parser import Parser
+from compiler.parser.ast_nodes import BinOp
+from compiler.semantic.analyzer import SemanticAnalyzer
+from compiler.interpreter.closure_compiler import ClosureCompiler
+from compiler.errors import CompilerError
+from sample_programs import SAMPLES, check_engine, run_capture
+
+code = """
+int a = 7;
+float f = 1.5;
+string s = "ab";
+char c = 'x';
+
+float scale(float x, int k) {
+    return x * k;
+}
+
+print(a + 1);
+print(a / 2);
+print(a * f);
+print(s + c);
+print(s * 3);
+print(a < f);
+print(s == c);
+print(-f);
+print(!a);
+print(scale(a, 2));
+"""
+
+ast = Parser(Lexer(code)).parse()
+SemanticAnalyzer().analyze(ast)
+
+# static types of the printed expressions
+for stmt in ast.statements:
+    if type(stmt).__name__ == "Print":
+        print(stmt.expr.static_type)
+
+# nested operands are annotated too
+expr = ast.statements[-1].expr
+print(expr.args[0].static_type, expr.args[1].static_type)
+
+# type errors are reported before anything runs
+errors = {
+    "int x = \"text\";": "Cannot assign string to int variable 'x'",
+    "string s = 1; ": "Cannot assign int to string variable 's'",
+    "bool b = 1;": "Cannot assign int to bool variable 'b'",
+    "int x = 1; x = 'c';": "Cannot assign char to int variable 'x'",
+    "print(1 + true);": "Operator '+' cannot be applied to int and bool",
+    "print(\"a\" - 1);": "Operator '-' cannot be applied to char and int",
+    "print(1 < \"two\");": "Operator '<' cannot be applied to int and string",
+    "print(-\"a\");": "Operator '-' cannot be applied to char",
+    "int f(int x) { return x; } print(f(\"no\"));": "Argument 1 of 'f' must be int, got string",
+    "int f(int x) { return \"no\"; }": "Function 'f' returns int, got string",
+    "int f(int x) { bool g(bool y) { return y; } return true; }": "Function 'f' returns int, got bool",
+}
+for source, message in errors.items():
+    try:
+        SemanticAnalyzer().analyze(Parser(Lexer(source)).parse())
+    except CompilerError as e:
+        assert message in str(e), (source, str(e))
+    else:
+        raise AssertionError(f"no type error for {source!r}")
+print("type errors:", len(errors))
+
+# breaking change: these ran before types were checked (an unanalysed
+# tree still runs them) and are rejected now
+for source in ("bool b = 1; print(b);", "int x = \"hello\"; print(x);", "print(1 + true);"):
+    try:
+        SemanticAnalyzer().analyze(Parser(Lexer(source)).parse())
+    except CompilerError as e:
+        print(run_capture(ClosureCompiler, source, analyze=False).split(), e.message)
+
+# the typed closures print exactly what the generic ones print
+for name, source in SAMPLES.items():
+    assert (run_capture(ClosureCompiler, source)
+            == run_capture(ClosureCompiler, source, analyze=False)), name
+print("closure samples:", check_engine(ClosureCompiler))
+
+# an unanalysed tree has no static types (generic handlers)
+plain = Parser(Lexer("print(1 + 2);")).parse()
+print(type(plain.statements[0].expr) is BinOp, plain.statements[0].expr.static_type)
@@ -0,0 +1,39 @@
+from compiler.lexer.lexer import Lexer
+from compiler.parser.parser import Parser
+from compiler.bytecode.codegen import BytecodeCompiler
+from compiler.bytecode.disassembler import disassemble
+from compiler.bytecode.vm import VirtualMachine
+from sample_programs import SAMPLES, check_engine, run_capture
+
+count = check_engine(VirtualMachine)
+print(f"VirtualMachine matches Interpreter on {count} programs")
+
+code = """
+int square(int x) {
+    return x * x;
+}
+
+int i = 0;
+while (i < 3) {
+    if (i == 1) {
+        i = i + 1;
+        continue;
+    }
+    print(square(i));
+    i = i + 1;
+}
+"""
+
+compiler = BytecodeCompiler()
+main = compiler.compile_main(Parser(Lexer(code)).parse().statements)
+print(disassemble(main, compiler.program))
+
+# programs where lexical names would differ, or that the bytecode
+# cannot express, run on the tree-walker and say why
+for name in ("dynamic_scoping", "nested_functions", "block_function"):
+    vm = VirtualMachine()
+    run_capture(lambda: vm, SAMPLES[name])
+    print(name, "->", vm.fallback_reason)
+vm = VirtualMachine()
+print(run_capture(lambda: vm, "int f(int n) { int twice(int k) { return k * 2; } return twice(n); } print(f(3));"),
+      vm.fallback_reason)
@@ -0,0 +1,80 @@
+import threading
+import time
+
+from backend.worker_pool import WorkerPool
+from sample_programs import SAMPLES
+
+
+def main():
+    pool = WorkerPool(2, grace=0)
+    try:
+        print(pool.run({"code": SAMPLES["recursion"]}))
+        print(pool.run({"code": SAMPLES["function"], "engine": "vm"}))
+        print(pool.run({"code": "print(y);"}))
+        print(pool.run({"code": "while (true) { }", "max_steps": 100}))
+
+        # requests run side by side on both workers
+        results = {}
+
+        def run(i):
+            results[i] = pool.run({"code": f"int i = 0; while (i < 20000) {{ i = i + 1; }} print(i + {i});"})
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        print([results[i]["output"] for i in range(6)])
+
+        # a run that overshoots its deadline (here: parsing a huge program,
+        # which the step budget does not cover) is killed; the pool recovers
+        huge = "int x = 1;\n" + "x = x + 1;\n" * 200000 + "print(x);"
+        start = time.perf_counter()
+        print(pool.run({"code": huge, "timeout": 0.2}))
+        print("killed in time:", time.perf_counter() - start < 2)
+        print(pool.run({"code": "print(1 + 1);"}))
+
+        # /profile runs use the pool too
+        result = pool.run({"code": SAMPLES["recursion"], "mode": "profile"})
+        print(result["output"], [f["name"] for f in result["profile"]["functions"]])
+
+        stats = pool.stats()
+        print(stats["workers"], stats["killed"], stats["crashed"], stats["runs"])
+    finally:
+        pool.close()
+
+    # time spent waiting for a free worker does not count against a run:
+    # five runs of ~0.3 s queue on one worker, each with a 1 s budget
+    pool = WorkerPool(1, grace=0.2)
+    try:
+        slow = "int i = 0; while (i < 100000) { i = i + 1; } print(i);"
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(pool.run({"code": slow, "timeout": 1})))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        print([result.get("output") for result in results], pool.stats()["killed"])
+    finally:
+        pool.close()
+
+    # a run that needs more memory than a worker has fails on its own
+    pool = WorkerPool(1, memory=100 << 20)
+    try:
+        hog = """
+string s = "x";
+int i = 0;
+while (i < 20) { s = s + s; i = i + 1; }
+int keep(int n, string t) { if (n == 0) { return 0; } return keep(n - 1, t + "x"); }
+print(keep(200, s));
+"""
+        print(pool.run({"code": hog}))
+        print(pool.run({"code": "print(1);"}), pool.stats()["crashed"])
+    finally:
+        pool.close()
+
+
+# the workers are started processes: keep the script importable
+if __name__ == "__main__":
+    main()